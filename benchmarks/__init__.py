@@ -0,0 +1 @@
+"""Benchmarks of the BADKit build pipeline on synthetic addons, runnable without Blender with `python -m benchmarks`."""
@@ -0,0 +1,182 @@
+import os
+import platform
+import sys
+import tempfile
+from typing import Optional
+
+import click
+
+from . import runner, synthetic
+
+DEFAULT_BASELINE = os.path.join(runner.ROOT, "benchmarks", "baseline.json")
+
+
+@click.command()
+@click.option(
+    "--scenario",
+    "-s",
+    "scenario_names",
+    type=click.Choice(sorted(synthetic.SCENARIOS)),
+    multiple=True,
+    help="A predefined addon shape to benchmark. Can be given more than once. Defaults to every predefined scenario.",
+)
+@click.option(
+    "--operators",
+    type=click.IntRange(min=0),
+    help="Benchmark a custom addon with this many operators instead of the predefined scenarios.",
+)
+@click.option(
+    "--properties",
+    type=click.IntRange(min=1),
+    default=8,
+    help="The number of properties of each operator of a custom addon.",
+    show_default=True,
+)
+@click.option(
+    "--blend-assets",
+    type=click.IntRange(min=0),
+    default=10,
+    help="The number of .blend files in a custom addon.",
+    show_default=True,
+)
+@click.option(
+    "--blend-size",
+    type=click.IntRange(min=1),
+    default=1024,
+    help="The size of each .blend file of a custom addon in KiB.",
+    show_default=True,
+)
+@click.option(
+    "--vendored-files",
+    type=click.IntRange(min=0),
+    default=200,
+    help="The number of vendored modules in a custom addon.",
+    show_default=True,
+)
+@click.option(
+    "--repeat",
+    "-r",
+    type=click.IntRange(min=1),
+    default=3,
+    help="The number of times to time each build. The median of each timing is reported.",
+    show_default=True,
+)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False),
+    default=DEFAULT_BASELINE,
+    help="The results to compare against.",
+    show_default=True,
+)
+@click.option(
+    "--save-baseline",
+    is_flag=True,
+    help="Save the results as the new baseline, instead of comparing against the old one.",
+)
+@click.option(
+    "--tolerance",
+    type=click.FloatRange(min=0),
+    default=0.1,
+    help="The fraction a timing may grow by, compared to the baseline, before it is flagged as a regression.",
+    show_default=True,
+)
+@click.option(
+    "--workdir",
+    type=click.Path(file_okay=False),
+    help="The directory to generate addons in, which is kept after the run. Defaults to a temporary directory.",
+)
+@click.argument("build_args", nargs=-1, type=click.UNPROCESSED)
+def main(
+    scenario_names: tuple[str, ...],
+    operators: Optional[int],
+    properties: int,
+    blend_assets: int,
+    blend_size: int,
+    vendored_files: int,
+    repeat: int,
+    baseline: str,
+    save_baseline: bool,
+    tolerance: float,
+    workdir: Optional[str],
+    build_args: tuple[str, ...],
+) -> None:
+    """
+    Benchmark `badkit build` on synthetic addons, without Blender. Any BUILD_ARGS are passed to `badkit build`, e.g. `-- --lazy -j 1`.
+    Exits with status 1 if any timing regressed compared to the baseline.
+    """
+
+    if operators is not None:
+        scenarios = [
+            synthetic.Scenario(
+                "custom",
+                operators=operators,
+                properties=properties,
+                blend_assets=blend_assets,
+                blend_size=blend_size,
+                vendored_files=vendored_files,
+            )
+        ]
+    else:
+        scenarios = [
+            synthetic.SCENARIOS[name] for name in scenario_names or synthetic.SCENARIOS
+        ]
+
+    with tempfile.TemporaryDirectory(prefix="badkit-bench-") as temp_dir:
+        results: runner.Timings = {}
+        for scenario in scenarios:
+            click.secho(f"Benchmarking {scenario}", bold=True)
+            results[scenario.name] = runner.run_scenario(
+                scenario, workdir or temp_dir, repeat, build_args
+            )
+
+    previous = runner.load_results(baseline)
+    previous_results: runner.Timings = previous["results"] if previous else {}
+    width = max(
+        len(phase)
+        for steps in results.values()
+        for timings in steps.values()
+        for phase in timings
+    )
+    for name, steps in results.items():
+        for step, timings in steps.items():
+            click.secho(f"\n{name} / {step}", bold=True)
+            for phase, seconds in timings.items():
+                before = previous_results.get(name, {}).get(step, {}).get(phase)
+                change = (
+                    f"{(seconds - before) / before:>+8.1%}" if before else f"{'':>8}"
+                )
+                click.echo(f"{phase:<{width}}{seconds * 1000:>10.1f}ms {change}")
+
+    if save_baseline:
+        runner.save_results(
+            baseline,
+            {
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "build_args": list(build_args),
+                "results": results,
+            },
+        )
+        click.secho(f'\nSaved baseline to "{baseline}"', bold=True)
+        return
+    if not previous:
+        click.secho(
+            f'\nNo baseline at "{baseline}" to compare against. Run with --save-baseline to save one.',
+            fg="yellow",
+        )
+        return
+
+    regressions = runner.find_regressions(previous_results, results, tolerance)
+    if regressions:
+        click.secho(f"\n{len(regressions)} regressions:", fg="red", bold=True)
+        for name, step, phase, before, seconds in regressions:
+            click.secho(
+                f"{name} / {step} / {phase}: {before * 1000:.1f}ms -> {seconds * 1000:.1f}ms",
+                fg="red",
+            )
+        sys.exit(1)
+    click.secho("\nNo regressions", fg="green", bold=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Iterable, Optional
+
+from . import synthetic
+
+# The repository root, containing the BADKit package as src
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUBS_DIR = os.path.join(ROOT, "benchmarks", "stubs")
+# The builds timed for each scenario, in the order they run
+STEPS = ("cold", "no-op", "incremental")
+# Changes smaller than this many seconds are never reported as regressions, since they are within noise
+MIN_REGRESSION = 0.005
+# Benchmark timings in seconds, by scenario name, step and phase
+Timings = dict[str, dict[str, dict[str, float]]]
+
+
+def get_environment(workdir: str) -> dict[str, str]:
+    """
+    Get the environment to run BADKit with, importing it as `badkit` and importing the in-tree Blender stubs as `bpy`, `bpy_types` and `cycles`.
+
+    :param workdir: A directory the benchmark can write to, where the `badkit` package is linked.
+    """
+
+    packages_dir = os.path.join(workdir, "packages")
+    badkit_dir = os.path.join(packages_dir, "badkit")
+    if not os.path.exists(badkit_dir):
+        os.makedirs(packages_dir, exist_ok=True)
+        try:
+            os.symlink(os.path.join(ROOT, "src"), badkit_dir, target_is_directory=True)
+        except OSError:
+            shutil.copytree(
+                os.path.join(ROOT, "src"),
+                badkit_dir,
+                ignore=shutil.ignore_patterns("__pycache__"),
+            )
+    return {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join((STUBS_DIR, packages_dir)),
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+
+
+def run_build(
+    project: str, env: dict[str, str], args: Iterable[str] = ()
+) -> dict[str, float]:
+    """
+    Run `badkit build` in a fresh interpreter, timing it end to end and per phase.
+
+    :param project: The root directory of the project to build.
+    :param env: The environment to run BADKit with.
+    :param args: Extra arguments to pass to `badkit build`.
+    :returns: the seconds taken by the whole build, as `"total"`, and by each phase of it.
+    :raises RuntimeError: if the build fails.
+    """
+
+    trace_path = os.path.join(project, "trace.json")
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-m", "badkit", "build", "--trace", trace_path, *args],
+        cwd=project,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    total = time.perf_counter() - start
+    if process.returncode:
+        raise RuntimeError(
+            f"Build of {project} failed:\n{process.stdout}{process.stderr}"
+        )
+
+    with open(trace_path) as file:
+        events = json.load(file)["traceEvents"]
+    timings = {"total": total}
+    for event in events:
+        timings[event["cat"]] = timings.get(event["cat"], 0.0) + event["dur"] / 1e6
+    return timings
+
+
+def run_scenario(
+    scenario: synthetic.Scenario,
+    workdir: str,
+    repeat: int = 3,
+    args: Iterable[str] = (),
+) -> dict[str, dict[str, float]]:
+    """
+    Benchmark building a synthetic addon from scratch, again without changes, and again after changing one operator.
+
+    :param scenario: The shape of the addon to generate.
+    :param workdir: A directory the benchmark can write to.
+    :param repeat: The number of times to time each step. The median of each timing is kept.
+    :param args: Extra arguments to pass to `badkit build`.
+    :returns: the median timings of each step, by step name.
+    """
+
+    env = get_environment(workdir)
+    project = os.path.join(workdir, scenario.name)
+    if os.path.exists(project):
+        shutil.rmtree(project)
+    synthetic.generate_addon(project, scenario)
+
+    samples: dict[str, list[dict[str, float]]] = {step: [] for step in STEPS}
+    for _ in range(repeat):
+        shutil.rmtree(os.path.join(project, "build"), ignore_errors=True)
+        samples["cold"].append(run_build(project, env, args))
+        samples["no-op"].append(run_build(project, env, args))
+        if scenario.operators:
+            synthetic.touch_operator(project)
+            samples["incremental"].append(run_build(project, env, args))
+
+    return {
+        step: {
+            name: statistics.median(timings.get(name, 0.0) for timings in runs)
+            for name in runs[0]
+        }
+        for step, runs in samples.items()
+        if runs
+    }
+
+
+def load_results(path: str) -> Optional[dict[str, Any]]:
+    """
+    Load saved benchmark results, e.g. a baseline.
+
+    :param path: The path to the results.
+    :returns: the results, or `None` if there aren't any saved at `path`.
+    """
+
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_results(path: str, results: dict[str, object]) -> None:
+    """
+    Save benchmark results, e.g. as a baseline.
+
+    :param path: The path to save the results to.
+    :param results: The results to save.
+    """
+
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+def find_regressions(
+    baseline: Timings,
+    current: Timings,
+    tolerance: float,
+) -> list[tuple[str, str, str, float, float]]:
+    """
+    Compare benchmark results against a baseline.
+
+    :param baseline: The baseline timings, by scenario, step and phase.
+    :param current: The current timings, by scenario, step and phase.
+    :param tolerance: The fraction a timing may grow by before it is a regression, e.g. `0.1` for 10%.
+    :returns: the scenario, step, phase, baseline seconds and current seconds of each regression.
+    """
+
+    regressions = []
+    for scenario, steps in current.items():
+        for step, timings in steps.items():
+            for phase, seconds in timings.items():
+                before = baseline.get(scenario, {}).get(step, {}).get(phase)
+                if (
+                    before is not None
+                    and seconds > before * (1 + tolerance)
+                    and seconds - before > MIN_REGRESSION
+                ):
+                    regressions.append((scenario, step, phase, before, seconds))
+    return regressions
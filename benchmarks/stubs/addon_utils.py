@@ -0,0 +1,33 @@
+"""Stub of Blender's `addon_utils` module, which imports and registers addons from `sys.path`."""
+
+import importlib
+import sys
+from types import ModuleType
+
+# Every enabled addon module, by name
+ENABLED: dict[str, ModuleType] = {}
+
+
+def paths() -> list[str]:
+    return []
+
+
+def modules(*, refresh: bool = True) -> list[ModuleType]:
+    return list(ENABLED.values())
+
+
+def check(module_name: str) -> tuple[bool, bool]:
+    return module_name in ENABLED, module_name in ENABLED
+
+
+def enable(module_name: str, *, default_set: bool = False, **_) -> ModuleType:
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
+    module.register()
+    ENABLED[module_name] = module
+    return module
+
+
+def disable(module_name: str, *, default_set: bool = False, **_) -> None:
+    module = ENABLED.pop(module_name, None)
+    if module is not None:
+        module.unregister()
@@ -0,0 +1,4 @@
+"""Stub of Blender's `bpy` module. See the README in the parent directory."""
+
+from . import app, data, ops, path, props, types, utils
+from .context import CONTEXT as context
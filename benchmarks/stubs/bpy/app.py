@@ -0,0 +1,6 @@
+"""Stub of `bpy.app`."""
+
+version = (3, 3, 0)
+version_string = "3.3.0"
+binary_path = ""
+background = True
@@ -0,0 +1,61 @@
+"""Stub of `bpy.context`, with the scene, render and Cycles settings BADKit reads and writes."""
+
+import os
+import re
+from types import SimpleNamespace
+
+from cycles.properties import CyclesPreferences, CyclesRenderSettings
+
+from .path import abspath
+
+
+class _Addons(dict):
+    def __missing__(self, name: str) -> SimpleNamespace:
+        addon = SimpleNamespace(module=name, preferences=SimpleNamespace())
+        self[name] = addon
+        return addon
+
+
+class _RenderSettings:
+    def __init__(self) -> None:
+        self.engine = "BLENDER_EEVEE"
+        self.filepath = "//"
+        self.fps = 24
+        self.resolution_x = 1920
+        self.resolution_y = 1080
+        self.resolution_percentage = 100
+        self.use_border = False
+        self.use_crop_to_border = False
+        self.border_min_x = 0.0
+        self.border_max_x = 1.0
+        self.border_min_y = 0.0
+        self.border_max_y = 1.0
+        self.threads_mode = "AUTO"
+        self.threads = os.cpu_count() or 1
+
+    def frame_path(self, frame: int = 0) -> str:
+        path = abspath(self.filepath)
+        if "#" not in os.path.basename(path):
+            path += "####"
+        path = re.sub("#+", lambda match: f"{frame:0{len(match[0])}d}", path)
+        return path + ".png"
+
+
+class _Scene:
+    def __init__(self) -> None:
+        self.render = _RenderSettings()
+        self.cycles = CyclesRenderSettings()
+        self.frame_start = 1
+        self.frame_end = 250
+        self.frame_current = 1
+
+    def frame_set(self, frame: int) -> None:
+        self.frame_current = frame
+
+
+CONTEXT = SimpleNamespace(
+    scene=_Scene(),
+    view_layer=SimpleNamespace(objects=SimpleNamespace(active=None)),
+    preferences=SimpleNamespace(addons=_Addons()),
+)
+CONTEXT.preferences.addons["cycles"].preferences = CyclesPreferences()
@@ -0,0 +1,22 @@
+"""Stub of `bpy.data`, holding empty collections of data-blocks."""
+
+
+class _Collection(dict):
+    def new(self, name: str, **keywords):
+        block = type(name, (), keywords)()
+        block.name = name
+        self[name] = block
+        return block
+
+    def __iter__(self):
+        return iter(self.values())
+
+
+collections = _Collection()
+images = _Collection()
+meshes = _Collection()
+node_groups = _Collection()
+objects = _Collection()
+shape_keys = _Collection()
+textures = _Collection()
+filepath = ""
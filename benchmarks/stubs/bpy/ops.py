@@ -0,0 +1,67 @@
+"""
+Stub of `bpy.ops`, which records the operators called instead of running them.
+A few operators have stand-in implementations: `wm.open_mainfile` sets `bpy.data.filepath`, and `render.render` is a stub renderer that writes a placeholder image to the scene's output path after sleeping for `BADKIT_STUB_RENDER_SECONDS` seconds.
+"""
+
+import os
+import time
+from typing import Callable
+
+# Every operator called, as (idname, keyword arguments) pairs
+CALLS: list[tuple[str, dict]] = []
+
+
+def _open_mainfile(filepath: str = "", **keywords) -> None:
+    from . import data
+
+    data.filepath = filepath
+
+
+def _render(write_still: bool = False, **keywords) -> None:
+    # `bpy.context` is the stub context itself rather than its module
+    from . import context
+
+    time.sleep(float(os.environ.get("BADKIT_STUB_RENDER_SECONDS", 0)))
+    if write_still:
+        scene = context.scene
+        path = scene.render.frame_path(frame=scene.frame_current)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as image_file:
+            image_file.write(b"\x89PNG\r\n\x1a\n")
+
+
+# Stand-in implementations of operators, by idname
+IMPLEMENTATIONS: dict[str, Callable[..., None]] = {
+    "wm.open_mainfile": _open_mainfile,
+    "render.render": _render,
+}
+
+
+class _Operator:
+    def __init__(self, idname: str) -> None:
+        self.idname = idname
+
+    def __call__(self, *args, **keywords) -> set[str]:
+        CALLS.append((self.idname, keywords))
+        if self.idname in IMPLEMENTATIONS:
+            IMPLEMENTATIONS[self.idname](**keywords)
+        return {"FINISHED"}
+
+    def poll(self) -> bool:
+        return True
+
+
+class _Module:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __getattr__(self, name: str) -> _Operator:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _Operator(f"{self.name}.{name}")
+
+
+def __getattr__(name: str) -> _Module:
+    if name.startswith("__"):
+        raise AttributeError(name)
+    return _Module(name)
@@ -0,0 +1,11 @@
+"""Stub of `bpy.path`."""
+
+import os
+
+from . import data
+
+
+def abspath(path: str) -> str:
+    if path.startswith("//"):
+        return os.path.join(os.path.dirname(data.filepath), path[2:])
+    return path
@@ -0,0 +1,30 @@
+"""Stub of `bpy.props`. Each property function returns a description of the property, as Blender's do when used as annotations."""
+
+
+class _PropertyDeferred:
+    def __init__(self, function, keywords: dict) -> None:
+        self.function = function
+        self.keywords = keywords
+
+    def __repr__(self) -> str:
+        return f"<_PropertyDeferred, {self.function.__name__}, {self.keywords}>"
+
+
+def _property(name: str):
+    def function(**keywords) -> _PropertyDeferred:
+        return _PropertyDeferred(function, keywords)
+
+    function.__name__ = name
+    return function
+
+
+BoolProperty = _property("BoolProperty")
+BoolVectorProperty = _property("BoolVectorProperty")
+CollectionProperty = _property("CollectionProperty")
+EnumProperty = _property("EnumProperty")
+FloatProperty = _property("FloatProperty")
+FloatVectorProperty = _property("FloatVectorProperty")
+IntProperty = _property("IntProperty")
+IntVectorProperty = _property("IntVectorProperty")
+PointerProperty = _property("PointerProperty")
+StringProperty = _property("StringProperty")
@@ -0,0 +1,26 @@
+"""
+Stub of `bpy.types`. Types that BADKit doesn't define explicitly (e.g. `VIEW3D_MT_object` or `ShaderNodeTexImage`) are created on first access.
+"""
+
+from bpy_types import Menu, Operator, Panel, PropertyGroup, StructRNA
+
+
+class Context(StructRNA):
+    pass
+
+
+class Event(StructRNA):
+    pass
+
+
+class Scene(StructRNA):
+    pass
+
+
+def __getattr__(name: str) -> type:
+    if name.startswith("__"):
+        raise AttributeError(name)
+    base = Menu if "_MT_" in name else StructRNA
+    cls = type(name, (base,), {"__module__": __name__, "bl_idname": name})
+    globals()[name] = cls
+    return cls
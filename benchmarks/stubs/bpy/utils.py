@@ -0,0 +1,22 @@
+"""Stub of `bpy.utils`, which records registered classes instead of registering them with Blender."""
+
+# Every registered class, by name
+REGISTERED: dict[str, type] = {}
+
+
+def register_class(cls: type) -> None:
+    name = getattr(cls, "bl_idname", cls.__name__)
+    if name in REGISTERED:
+        raise ValueError(
+            f"register_class(...): already registered as a subclass '{name}'"
+        )
+    REGISTERED[name] = cls
+
+
+def unregister_class(cls: type) -> None:
+    name = getattr(cls, "bl_idname", cls.__name__)
+    if REGISTERED.get(name) is not cls:
+        raise RuntimeError(
+            f"unregister_class(...): missing bl_rna attribute from '{name}'"
+        )
+    del REGISTERED[name]
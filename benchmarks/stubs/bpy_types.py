@@ -0,0 +1,39 @@
+"""Stub of Blender's `bpy_types` module, the Python base classes of the registerable `bpy.types`."""
+
+
+class StructRNA:
+    """The base of every Blender data type."""
+
+    bl_rna = None
+
+
+class Operator(StructRNA):
+    bl_idname: str
+    bl_label: str
+
+    def report(self, level: set[str], message: str) -> None:
+        print(f"{'/'.join(sorted(level))}: {message}")
+
+
+class Panel(StructRNA):
+    bl_idname: str
+    bl_label: str
+
+
+class Menu(StructRNA):
+    bl_idname: str
+    bl_label: str
+    # Functions appended to the menu with `append`
+    draw_funcs: list = []
+
+    @classmethod
+    def append(cls, draw_func) -> None:
+        cls.draw_funcs = [*cls.draw_funcs, draw_func]
+
+    @classmethod
+    def remove(cls, draw_func) -> None:
+        cls.draw_funcs = [func for func in cls.draw_funcs if func is not draw_func]
+
+
+class PropertyGroup(StructRNA):
+    pass
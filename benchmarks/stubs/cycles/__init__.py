@@ -0,0 +1 @@
+"""Stub of Blender's bundled `cycles` addon."""
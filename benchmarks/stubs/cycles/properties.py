@@ -0,0 +1,26 @@
+"""Stub of `cycles.properties`, with one CPU device and no GPUs."""
+
+from types import SimpleNamespace
+
+
+class CyclesRenderSettings:
+    def __init__(self) -> None:
+        self.device = "CPU"
+        self.feature_set = "SUPPORTED"
+        self.samples = 4096
+        self.use_denoising = True
+        self.tile_size = 2048
+        self.use_adaptive_sampling = True
+        self.adaptive_threshold = 0.01
+
+
+class CyclesPreferences:
+    def __init__(self) -> None:
+        self.compute_device_type = "NONE"
+        self.devices = [SimpleNamespace(name="CPU", type="CPU", id="CPU", use=True)]
+
+    def get_devices(self) -> None:
+        pass
+
+    def has_active_device(self) -> bool:
+        return any(device.use and device.type != "CPU" for device in self.devices)
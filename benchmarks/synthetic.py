@@ -0,0 +1,222 @@
+import os
+import random
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """The shape of a synthetic addon to benchmark building."""
+
+    name: str
+    # The number of operators, each with a property group and a generated panel
+    operators: int
+    # The number of properties of each operator's property group
+    properties: int
+    # The number of .blend files in src/blend
+    blend_assets: int
+    # The size of each .blend file in KiB
+    blend_size: int
+    # The number of modules vendored into src/vendor
+    vendored_files: int
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario(
+            "small",
+            operators=5,
+            properties=4,
+            blend_assets=1,
+            blend_size=256,
+            vendored_files=0,
+        ),
+        Scenario(
+            "medium",
+            operators=50,
+            properties=8,
+            blend_assets=10,
+            blend_size=1024,
+            vendored_files=200,
+        ),
+        Scenario(
+            "large",
+            operators=200,
+            properties=16,
+            blend_assets=40,
+            blend_size=4096,
+            vendored_files=2000,
+        ),
+    )
+}
+# The number of vendored modules in each synthetic vendored package
+VENDORED_PACKAGE_SIZE = 50
+
+ADDON_TEMPLATE = """\
+!Addon
+bl_info: !BLInfo
+  name: Benchmark {name}
+  description: A synthetic addon for benchmarking BADKit builds.
+  author: BADKit
+  addon_version: [1, 0, 0]
+  blender_version: [3, 3, 0]
+  support: COMMUNITY
+operators:
+{operators}
+blend:
+{blend}
+"""
+OPERATOR_TEMPLATE = """\
+import bpy
+from badkit import wrappers
+
+
+class Operator{index}(wrappers.BADKitOperator):
+    bl_idname = "object.benchmark_{index}"
+    bl_label = "Benchmark Operator {index}"
+    bl_description = "A synthetic operator for benchmarking BADKit builds."
+    bl_options = {{"REGISTER", "UNDO"}}
+
+    def execute(self, context: bpy.types.Context) -> set[str]:
+        props = getattr(context.scene, "benchmark_props_{index}")
+        total = sum(getattr(props, name) for name in ({names}))
+        self.report({{"INFO"}}, f"Total: {{total}}")
+        return {{"FINISHED"}}
+"""
+PROPERTIES_TEMPLATE = """\
+import bpy
+from badkit.wrappers import BADKitPropertyGroup
+
+
+class Properties{index}(BADKitPropertyGroup):
+    bl_idname = "benchmark_props_{index}"
+
+{props}
+"""
+VENDORED_TEMPLATE = '''\
+"""Synthetic vendored module {index}."""
+
+
+def function_{index}(values):
+    """Sum the squares of some values."""
+
+    return sum(value * value for value in values) + {index}
+
+
+class Class{index}:
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return f"Class{index}({{self.value!r}})"
+'''
+
+
+def write(path: str, contents: str | bytes) -> None:
+    """
+    Write a file, creating its directory if needed.
+
+    :param path: The path to write to.
+    :param contents: The text or bytes to write.
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb" if isinstance(contents, bytes) else "w") as file:
+        file.write(contents)
+
+
+def generate_blend(rng: random.Random, size: int) -> bytes:
+    """
+    Generate the contents of a fake .blend file, roughly half of which compresses well like the real thing.
+
+    :param rng: The random number generator to use.
+    :param size: The size of the file in bytes.
+    """
+
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        length = min(remaining, 4096)
+        if rng.random() < 0.5:
+            chunks.append(rng.randbytes(length))
+        else:
+            chunks.append(bytes([rng.randrange(256)]) * length)
+        remaining -= length
+    return b"BLENDER-v303" + b"".join(chunks)[12:]
+
+
+def generate_addon(root: str, scenario: Scenario, seed: int = 0) -> None:
+    """
+    Generate a synthetic addon project. The same scenario and seed always generate the same project.
+
+    :param root: The directory to generate the project in, which should be empty.
+    :param scenario: The shape of the addon.
+    :param seed: The seed for the contents of generated assets.
+    """
+
+    rng = random.Random(seed)
+    src_dir = os.path.join(root, "src")
+
+    for index in range(scenario.operators):
+        names = tuple(f"value_{prop}" for prop in range(scenario.properties))
+        write(os.path.join(src_dir, f"op{index}", "__init__.py"), "")
+        write(
+            os.path.join(src_dir, f"op{index}", "operator.py"),
+            OPERATOR_TEMPLATE.format(
+                index=index, names=", ".join(map(repr, names)) + ","
+            ),
+        )
+        write(
+            os.path.join(src_dir, f"op{index}", "properties.py"),
+            PROPERTIES_TEMPLATE.format(
+                index=index,
+                props="\n".join(
+                    f'    {name}: bpy.props.IntProperty(name="{name}", default={prop})'
+                    for prop, name in enumerate(names)
+                ),
+            ),
+        )
+
+    for index in range(scenario.blend_assets):
+        write(
+            os.path.join(src_dir, "blend", f"asset{index}.blend"),
+            generate_blend(rng, scenario.blend_size * 1024),
+        )
+
+    for index in range(scenario.vendored_files):
+        package = f"package{index // VENDORED_PACKAGE_SIZE}"
+        if index % VENDORED_PACKAGE_SIZE == 0:
+            write(os.path.join(src_dir, "vendor", package, "__init__.py"), "")
+        write(
+            os.path.join(src_dir, "vendor", package, f"module{index}.py"),
+            VENDORED_TEMPLATE.format(index=index),
+        )
+
+    write(
+        os.path.join(root, "addon.yaml"),
+        ADDON_TEMPLATE.format(
+            name=scenario.name,
+            operators="\n".join(
+                f"  - !Operator\n    name: op{index}\n    panel: !Panel {{space: VIEW_3D, category: Benchmark}}"
+                for index in range(scenario.operators)
+            )
+            or "  []",
+            blend="\n".join(
+                f"  - !Blend {{name: asset{index}.blend, node_groups: [[NodeTree, Group{index}]]}}"
+                for index in range(scenario.blend_assets)
+            )
+            or "  []",
+        ),
+    )
+
+
+def touch_operator(root: str, index: int = 0) -> None:
+    """
+    Change the source of one operator of a generated project, as a developer would between builds.
+
+    :param root: The root directory of the project.
+    :param index: The index of the operator to change.
+    """
+
+    with open(os.path.join(root, "src", f"op{index}", "operator.py"), "a") as file:
+        file.write("# changed\n")
@@ -1,6 +1,6 @@
 import click
 
-from .commands import build, install, launch
+from .commands import build, install, launch, render, run, test
 
 # TODO: add fake-bpy-module install instructions to README. I would have liked to install it automatically but we don't know which version of blender they're using
 # - maybe we could infer it from the Blender version in the addon.yaml file?
@@ -25,6 +25,9 @@ def main() -> None:
     cli.add_command(build)
     cli.add_command(install)
     cli.add_command(launch)
+    cli.add_command(render)
+    cli.add_command(run)
+    cli.add_command(test)
     cli(prog_name="badkit")
 
 
@@ -1,3 +1,6 @@
 from .build import build
 from .install import install
 from .launch import launch
+from .render import render
+from .run import run
+from .test import test
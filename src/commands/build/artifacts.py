@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+# The default maximum total size of a store, in bytes
+DEFAULT_MAX_SIZE = 10 * 1024**3
+
+
+class ArtifactStore:
+    """
+    A directory of built bundles, named by the hash of the inputs they were built from, so identical inputs are only ever built once.
+    Stores are safe to share between projects, checkouts and machines (e.g. CI runners on a network drive), since artifacts are only ever added whole and never modified.
+    The least recently used artifacts are evicted once the store grows past its maximum size.
+    """
+
+    def __init__(self, path: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        Construct an ArtifactStore object.
+
+        :param path: The directory of the store, which is created if it doesn't exist.
+        :param max_size: The maximum total size of the store's artifacts in bytes.
+        """
+
+        self.path = os.path.abspath(path)
+        self.max_size = max_size
+        os.makedirs(self.path, exist_ok=True)
+
+    def get_path(self, key: str) -> str:
+        """
+        Get the path of the artifact with a key, whether or not it exists.
+
+        :param key: The hex hash of the artifact's inputs.
+        """
+
+        return os.path.join(self.path, key[:2], f"{key}.zip")
+
+    def fetch(self, key: str, dest: str) -> bool:
+        """
+        Place the artifact with a key at a path, hardlinking it where possible and copying it otherwise.
+        The artifact is marked as used, so it is evicted last.
+
+        :param key: The hex hash of the artifact's inputs.
+        :param dest: The path to place the artifact at. Any existing file is replaced.
+        :returns: whether the artifact was in the store.
+        """
+
+        path = self.get_path(key)
+        partial_path = f"{dest}.partial"
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        try:
+            try:
+                os.link(path, partial_path)
+            except OSError:
+                shutil.copyfile(path, partial_path)
+            os.utime(path)
+        except FileNotFoundError:
+            # Missing, or evicted by another build sharing the store
+            return False
+        os.replace(partial_path, dest)
+        return True
+
+    def put(self, key: str, src: str) -> None:
+        """
+        Add a file to the store as the artifact with a key, then evict artifacts if the store is over its maximum size.
+        The file is copied rather than linked, so later builds replacing it can't change the stored artifact.
+
+        :param key: The hex hash of the artifact's inputs.
+        :param src: The path to the file to add.
+        """
+
+        path = self.get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Copy under a temporary name first so other builds never see a partial artifact
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".partial")
+        try:
+            with os.fdopen(fd, "wb") as file, open(src, "rb") as source:
+                shutil.copyfileobj(source, file)
+            # mkstemp creates files only readable by their owner, which a shared store can't use
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self.evict(keep=key)
+
+    def evict(self, keep: Optional[str] = None) -> list[str]:
+        """
+        Remove the least recently used artifacts until the store is within its maximum size.
+
+        :param keep: The key of an artifact to never remove, e.g. one that was just added.
+        :returns: the keys of the removed artifacts.
+        """
+
+        artifacts = []
+        for dir_entry in os.scandir(self.path):
+            if not dir_entry.is_dir():
+                continue
+            for entry in os.scandir(dir_entry.path):
+                if entry.name.endswith(".zip"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    artifacts.append((stat.st_mtime, stat.st_size, entry.name[:-4]))
+
+        total = sum(size for _, size, _ in artifacts)
+        evicted = []
+        for _, size, key in sorted(artifacts):
+            if total <= self.max_size:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self.get_path(key))
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted.append(key)
+        return evicted
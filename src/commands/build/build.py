@@ -1,22 +1,41 @@
+import dataclasses
+import functools
 import os
-import pickle
+import time
+from dataclasses import dataclass
 from types import ModuleType
-from typing import Callable, TypeVar
-import zipfile
+from typing import Optional, cast
 
 import click
 import yaml
 
 from .. import utils as cmd_utils
-from . import descriptors
+from ..launch import push_addon, session
+from . import (
+    artifacts,
+    bundle,
+    bytecode,
+    codegen,
+    compression,
+    descriptors,
+    discovery,
+    manifest,
+    pruning,
+    report,
+    snapshot,
+    timings,
+    treeshake,
+    vendoring,
+    watcher,
+    workspace,
+)
 from ... import utils as badkit_utils, wrappers as badkit_wrappers
 
-T = TypeVar("T")
-
 SRC = "src"
 BLEND = "blend"
 ADDON = "addon.yaml"
 BUILD = "build"
+CACHE = ".badkit"
 
 
 if False:  # Test switch
@@ -24,76 +43,621 @@ if False:  # Test switch
     ADDON = os.path.join("test", ADDON)
     BUILD = os.path.join("test", BUILD)
 
+# Use the libyaml based loader if PyYAML was built with it
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 for descriptor in descriptors.DESCRIPTOR_CLASSES:
-    yaml.SafeLoader.add_constructor(descriptor.yaml_tag, descriptor.from_yaml)
+    Loader.add_constructor(descriptor.yaml_tag, descriptor.from_yaml)
+
+
+@dataclass(frozen=True)
+class Project:
+    """The paths of an addon project, resolved against its root directory so that builds never depend on the working directory."""
+
+    root: str
+
+    @property
+    def addon_path(self) -> str:
+        return os.path.join(self.root, ADDON)
+
+    @property
+    def src_dir(self) -> str:
+        return os.path.join(self.root, SRC)
+
+    @property
+    def build_dir(self) -> str:
+        return os.path.join(self.root, BUILD)
+
+    def get_cache_path(self, name: str) -> str:
+        """
+        Get the path of a file in the build cache directory.
+
+        :param name: The name of the cached file.
+        """
+
+        return os.path.join(self.build_dir, CACHE, name)
+
+
+def collect_badkit_module(module: ModuleType) -> list[bundle.Member]:
+    """
+    Collect the files of a BADKit subpackage so it can be bundled under `badkit/`.
+
+    :param module: The BADKit subpackage to collect.
+    """
+
+    module_dir = os.path.dirname(cast(str, module.__file__))
+    return bundle.collect_members(
+        module_dir, os.path.join("badkit", os.path.basename(module_dir))
+    )
+
+
+def load_addon(project: Project) -> descriptors.Addon:
+    """
+    Load the addon descriptor from a project's addon file, discovering the classes of each of its operators.
+    If neither the addon file nor any of the sources it was resolved from have changed since the last build, the resolved descriptor is loaded from a snapshot instead.
+
+    :param project: The project to load the addon of.
+    """
+
+    if not os.path.exists(project.addon_path):
+        raise FileNotFoundError(f"Failed to find {project.addon_path}.")
+
+    addon: descriptors.Addon
+    with timings.TRACER.span("load snapshot"):
+        cached = snapshot.load(project.get_cache_path("addon.pkl"), project.addon_path)
+    if cached:
+        addon, discovery.CACHE.sources = cached
+        return addon
+
+    discovery.CACHE.load(project.get_cache_path("discovery.json"))
+    discovery.CACHE.sources.clear()
+    with timings.TRACER.span("parse addon file"), open(
+        project.addon_path, "r"
+    ) as addon_file:
+        addon = yaml.load(addon_file, Loader=Loader)
+    addon.load(project.src_dir)
+    save_addon(project, addon)
+    return addon
+
+
+def save_addon(project: Project, addon: descriptors.Addon) -> None:
+    """
+    Save the discovery cache and a snapshot of a resolved addon descriptor, so the next build can skip resolving it.
 
+    :param project: The project the addon belongs to.
+    :param addon: The resolved addon descriptor.
+    """
 
-def run_in_dir(dir: str, func: Callable[[], T]) -> T:
-    cwd = os.getcwd()
-    os.chdir(dir)
-    ret = func()
-    os.chdir(cwd)
-    return ret
+    with timings.TRACER.span("save snapshot"):
+        discovery.CACHE.save(project.get_cache_path("discovery.json"))
+        snapshot.save(
+            project.get_cache_path("addon.pkl"),
+            project.addon_path,
+            discovery.CACHE.sources,
+            addon,
+        )
+
+
+@dataclass
+class BuildOptions:
+    """Options controlling how a bundle is built."""
+
+    # Rebuild every member, ignoring the manifest of the previous build
+    force: bool = False
+    # The number of members to compress in parallel
+    jobs: int = 1
+    # Precompile Python modules to bytecode for the Blender version of the addon
+    bytecode: bool = False
+    # Bundle compiled modules without their sources
+    sourceless: bool = False
+    # Register stand-ins for operators, which import the real operator when it is first run
+    lazy: bool = False
+    # Only bundle the BADKit modules that the addon imports
+    tree_shake: bool = True
+    # Pack pure Python vendored modules into an archive imported from with zipimport
+    vendor_archive: bool = False
+    # Leave vendored files that aren't needed at runtime, like tests and type stubs, out of the bundle
+    prune_vendor: bool = True
+    # Also leave out vendored modules that the addon never imports
+    prune_unused: bool = False
+    # The directory of a content-addressed store of built bundles to reuse
+    store: Optional[str] = None
+    # The maximum total size of the artifact store in bytes
+    store_size: int = artifacts.DEFAULT_MAX_SIZE
+
+
+def collect_bundle_members(
+    project: Project, addon: descriptors.Addon, options: BuildOptions
+) -> list[bundle.Member]:
+    """
+    Collect every member of an addon's bundle, tree-shaking, pruning and compiling them as requested by the build options.
 
+    :param project: The project the addon belongs to.
+    :param addon: The addon to collect the members of.
+    :param options: The options to build with.
+    """
 
-def copy_to_zipf(zipf: zipfile.ZipFile, path: str, prefix: str = "") -> None:
-    for root, _, files in os.walk(path):
-        for file in files:
-            zipf.write(
-                os.path.join(root, file),
-                arcname=os.path.join(prefix, root, file),
+    vendor_dir = os.path.join(project.src_dir, vendoring.VENDOR)
+    has_vendor = os.path.isdir(vendor_dir)
+    with timings.TRACER.span("generate __init__.py"):
+        init = bundle.Member(
+            "__init__.py",
+            data=codegen.generate_init(
+                addon, lazy=options.lazy, vendor=has_vendor
+            ).encode(),
+        )
+    with timings.TRACER.span("collect members"):
+        members = [
+            init,
+            *bundle.collect_members(os.path.join(project.src_dir, BLEND), BLEND),
+            *(
+                member
+                for operator in addon.operators
+                for member in bundle.collect_members(
+                    os.path.join(project.src_dir, operator.name), operator.name
+                )
+            ),
+            *collect_badkit_module(badkit_utils),
+            *collect_badkit_module(badkit_wrappers),
+        ]
+    if options.tree_shake:
+        with timings.TRACER.span("tree-shake"):
+            members, dropped = treeshake.shake(members)
+        if dropped:
+            cmd_utils.log(
+                f"Dropped {len(dropped)} unused BADKit modules ({sum(len(member.read()) for member in dropped) / 1024:.1f} KiB): "
+                + ", ".join(member.arcname for member in dropped),
+                fg="white",
+            )
+    vendor_members = []
+    if has_vendor:
+        with timings.TRACER.span("collect vendored files"):
+            vendor_members = vendoring.collect_vendor_files(vendor_dir)
+    if vendor_members and options.prune_vendor:
+        try:
+            python_version = bytecode.get_python_version(addon.bl_info.blender_version)
+        except ValueError:
+            python_version = None
+        with timings.TRACER.span("prune vendored files"):
+            vendor_members, pruned = pruning.prune(
+                vendor_members,
+                pruning.Pruner(addon.prune, python_version=python_version),
+                roots=members if options.prune_unused else None,
+            )
+        if pruned:
+            cmd_utils.log(
+                f"Pruned {len(pruned)} vendored files, saving {sum(member.size for member in pruned) / 1024:.1f} KiB",
+                fg="white",
+            )
+    if options.bytecode or options.sourceless:
+        python_version = bytecode.get_python_version(addon.bl_info.blender_version)
+        with timings.TRACER.span("compile bytecode"):
+            members, compile_time = bytecode.compile_members(
+                members, python_version, sourceless=options.sourceless
+            )
+        cmd_utils.log(
+            f"Precompiled bytecode for Python {'.'.join(map(str, python_version))}, saving ~{compile_time * 1000:.0f}ms of compilation on first enable",
+            fg="white",
+        )
+    # Vendored packages are neither tree-shaken nor compiled, since they may not parse with the running interpreter
+    if has_vendor:
+        with timings.TRACER.span("collect vendored modules"):
+            members += vendoring.collect_vendor_members(
+                vendor_dir, vendor_members, archive=options.vendor_archive
             )
 
+    # Sorted so that bundles are reproducible whatever order members are collected in
+    return sorted(members, key=lambda member: member.arcname)
 
-@click.command()
-def build() -> None:
-    """Build an addon bundle from a specified source directory."""
 
-    addon_path = os.path.abspath(ADDON)
-    if not os.path.exists(addon_path):
-        raise FileNotFoundError(f"Failed to find {ADDON}.")
+def build_bundle(
+    project: Project, addon: descriptors.Addon, options: BuildOptions
+) -> str:
+    """
+    Build the bundle for an addon, reusing any members that haven't changed since the last build.
 
-    addon: descriptors.Addon = None
-    with open(ADDON, "r") as addon_file:
-        addon = run_in_dir(SRC, lambda: yaml.safe_load(addon_file))
+    :param project: The project the addon belongs to.
+    :param addon: The addon to build.
+    :param options: The options to build with.
+    :returns: the path to the bundle.
+    """
 
     # Prepare names/paths
-    build_dir = os.path.abspath(BUILD)
-    build_path = f"{build_dir}{os.path.sep}{addon.bl_info.name}.zip".replace(
-        " ", "-"
-    ).lower()
-    if os.path.exists(build_path):
-        os.remove(build_path)
+    build_dir = os.path.abspath(project.build_dir)
+    build_path = os.path.join(
+        build_dir, f"{addon.bl_info.name}.zip".replace(" ", "-").lower()
+    )
     if not os.path.exists(build_dir):
         os.makedirs(build_dir, exist_ok=True)
 
-    # Create archive
-    with zipfile.ZipFile(build_path, "w") as bundle:
-        bundle.write(
-            os.path.join(
-                os.path.dirname(__file__),
-                "initializer.py",
-            ),
-            arcname="__init__.py",
+    members = collect_bundle_members(project, addon, options)
+    policy = compression.Policy(addon.compression)
+
+    # Compare against the previous build
+    manifest_path = manifest.Manifest.get_path(build_path)
+    previous = (
+        manifest.Manifest() if options.force else manifest.Manifest.load(manifest_path)
+    )
+    with timings.TRACER.span("hash members"):
+        current = manifest.Manifest.from_members(
+            members,
+            previous,
+            settings={
+                "compression": policy.get_settings(),
+                "date_time": list(bundle.get_date_time()),
+            },
+        )
+    if os.path.exists(build_path) and current == previous:
+        cmd_utils.log(
+            f'Bundle "{os.path.abspath(build_path)}" is up to date',
+            fg="white",
+            bold=True,
         )
+        return build_path
 
-        run_in_dir(SRC, lambda: copy_to_zipf(bundle, BLEND))
-        copy_badkit_module_to_bundle: Callable[
-            [ModuleType], None
-        ] = lambda module: run_in_dir(
-            os.path.dirname(os.path.dirname(module.__file__)),
-            lambda: copy_to_zipf(
-                bundle, os.path.basename(os.path.dirname(module.__file__)), prefix="badkit"
-            ),
+    # Reuse an identical bundle built before, possibly by another project or machine
+    store = (
+        artifacts.ArtifactStore(options.store, options.store_size)
+        if options.store
+        else None
+    )
+    key = current.get_key()
+    fetched = False
+    if store and not options.force:
+        with timings.TRACER.span("fetch from store"):
+            fetched = store.fetch(key, build_path)
+    if fetched:
+        current.save(manifest_path)
+        cmd_utils.log(
+            f'Bundle restored to "{os.path.abspath(build_path)}" from the artifact store',
+            fg="white",
+            bold=True,
         )
-        copy_badkit_module_to_bundle(badkit_utils)
-        copy_badkit_module_to_bundle(badkit_wrappers)
+        return build_path
 
-        bundle.writestr("classes.pkl", pickle.dumps(addon.get_classes()))
-        bundle.writestr("blend.pkl", pickle.dumps(addon.blend))
+    # Create archive
+    with timings.TRACER.span("write bundle"):
+        reused = bundle.write_bundle(
+            build_path,
+            members,
+            reusable=current.get_unchanged(previous),
+            jobs=options.jobs,
+            policy=policy,
+        )
+    current.save(manifest_path)
+    if store:
+        with timings.TRACER.span("add to store"):
+            store.put(key, build_path)
 
     cmd_utils.log(
-        f'Bundle built to "{os.path.abspath(build_path)}"',
+        f'Bundle built to "{os.path.abspath(build_path)}" ({len(members) - reused} updated, {reused} reused)',
         fg="white",
         bold=True,
     )
+    return build_path
+
+
+def build_project(root: str, options: BuildOptions) -> str:
+    """
+    Load and build the addon of a project.
+
+    :param root: The root directory of the project.
+    :param options: The options to build with.
+    :returns: the path to the bundle.
+    """
+
+    project = Project(root)
+    return build_bundle(project, load_addon(project), options)
+
+
+def build_workspace(workspace_dir: str, options: BuildOptions) -> None:
+    """
+    Build every addon project in a workspace concurrently, one process per project, and print how long each one took.
+    The members of each bundle are compressed with an even share of `options.jobs` threads.
+
+    :param workspace_dir: The directory to search for projects in.
+    :param options: The options to build with.
+    """
+
+    roots = workspace.find_projects(workspace_dir, os.path.basename(ADDON))
+    if not roots:
+        raise FileNotFoundError(f"Failed to find any {ADDON} files in {workspace_dir}.")
+
+    processes = min(options.jobs, len(roots))
+    project_options = dataclasses.replace(
+        options, jobs=max(1, options.jobs // processes)
+    )
+    start = time.perf_counter()
+    results = workspace.build_all(
+        functools.partial(build_project, options=project_options), roots, processes
+    )
+
+    width = max(len(os.path.relpath(result.root, workspace_dir)) for result in results)
+    for result in sorted(results, key=lambda result: result.seconds, reverse=True):
+        name = os.path.relpath(result.root, workspace_dir)
+        status = "ok" if result.error is None else f"FAILED: {result.error}"
+        click.secho(
+            f"{name:<{width}}  {result.seconds:>7.2f}s  {status}",
+            fg="red" if result.error else None,
+        )
+    failed = sum(result.error is not None for result in results)
+    cmd_utils.log(
+        f"Built {len(results) - failed}/{len(results)} addons in {time.perf_counter() - start:.2f}s",
+        fg="red" if failed else "white",
+        bold=True,
+    )
+    if failed:
+        raise click.exceptions.Exit(1)
+
+
+def watch_addon(
+    project: Project,
+    addon: descriptors.Addon,
+    options: BuildOptions,
+    socket_path: Optional[str] = None,
+) -> None:
+    """
+    Rebuild an addon whenever its addon file or sources change, until interrupted.
+    The addon descriptor is kept in memory between builds, and only the operators whose packages changed are discovered again.
+
+    :param project: The project the addon belongs to.
+    :param addon: The already loaded addon to rebuild.
+    :param options: The options to build with. Rebuilds are never forced.
+    :param socket_path: The socket of a dev session to push each rebuilt bundle to, if any.
+    """
+
+    addon_path = os.path.abspath(project.addon_path)
+    src_dir = os.path.abspath(project.src_dir)
+
+    def rebuild(changed: set[str]) -> None:
+        nonlocal addon
+        try:
+            if addon_path in changed:
+                addon = load_addon(project)
+            else:
+                for operator in addon.operators:
+                    operator_dir = os.path.join(src_dir, operator.name) + os.path.sep
+                    if any(path.startswith(operator_dir) for path in changed):
+                        operator.load(src_dir)
+                save_addon(project, addon)
+            build_path = build_bundle(
+                project, addon, dataclasses.replace(options, force=False)
+            )
+            if socket_path:
+                push_addon(socket_path, build_path)
+        except Exception as e:
+            cmd_utils.log(f"Build failed: {e}", fg="red", bold=True)
+
+    cmd_utils.log(f"Watching {addon_path} and {src_dir} for changes...", fg="white")
+    watcher.watch((addon_path, src_dir), rebuild)
+
+
+def print_report(build_path: str) -> None:
+    """
+    Print a breakdown of the size and composition of a built bundle, and save it as JSON alongside the bundle.
+
+    :param build_path: The path to the bundle.
+    """
+
+    bundle_report = report.create_report(build_path)
+    report_path = report.Report.get_path(build_path)
+    bundle_report.save(report_path)
+    click.echo(report.format_text(bundle_report))
+    cmd_utils.log(f'Report saved to "{os.path.abspath(report_path)}"', fg="white")
+
+
+def print_timings() -> None:
+    """Print how long each phase of the build took, as recorded by the build's tracer."""
+
+    summary = timings.TRACER.summarize()
+    width = max((len(category) for category, _, _ in summary), default=0)
+    click.echo(f"{'phase':<{width}}{'count':>8}{'time':>12}")
+    for category, count, seconds in summary:
+        click.echo(f"{category:<{width}}{count:>8}{seconds * 1000:>10.1f}ms")
+    elapsed = time.perf_counter() - timings.TRACER.origin
+    click.echo(f"{'total':<{width}}{'':>8}{elapsed * 1000:>10.1f}ms")
+
+
+def print_compression_benchmark(
+    project: Project, addon: descriptors.Addon, options: BuildOptions
+) -> None:
+    """
+    Print the size and time of compressing an addon's bundle with each compression method, and with its compression policy.
+
+    :param project: The project the addon belongs to.
+    :param addon: The addon to benchmark.
+    :param options: The options to build with.
+    """
+
+    members = collect_bundle_members(project, addon, options)
+    results = compression.benchmark(members, compression.Policy(addon.compression))
+    click.echo(f"{'method':<10}{'raw':>14}{'compressed':>14}{'ratio':>8}{'time':>10}")
+    for name, raw_size, compressed_size, seconds in results:
+        click.echo(
+            f"{name:<10}{raw_size:>14,}{compressed_size:>14,}"
+            f"{compressed_size / max(raw_size, 1):>8.1%}{seconds:>9.2f}s"
+        )
+
+
+@click.command()
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Rebuild every member of the bundle, ignoring the manifest of the previous build.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    help="The number of bundle members to compress in parallel.",
+    show_default=True,
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running after the build, and rebuild the bundle whenever the addon file or sources change.",
+)
+@click.option(
+    "--bytecode",
+    is_flag=True,
+    help="Precompile the bundle's Python modules for the Python version of the addon's Blender version. BADKit must be run with that Python version.",
+)
+@click.option(
+    "--sourceless",
+    is_flag=True,
+    help="Precompile the bundle's Python modules (see --bytecode) and leave their sources out of the bundle.",
+)
+@click.option(
+    "--lazy",
+    is_flag=True,
+    help="Only import each operator's module when the operator is first run, instead of when the addon is enabled.",
+)
+@click.option(
+    "--benchmark-compression",
+    is_flag=True,
+    help="Instead of building, compress the bundle's members with each compression method and with the addon's compression policy, and compare the size and time of each.",
+)
+@click.option(
+    "--workspace",
+    type=click.Path(file_okay=False, exists=True),
+    help="Build every addon project found under this directory concurrently, instead of the project in the current directory. The --jobs processes are shared between the addons.",
+)
+@click.option(
+    "--tree-shake/--no-tree-shake",
+    default=True,
+    help="Only bundle the BADKit modules that the addon's sources import.",
+    show_default=True,
+)
+@click.option(
+    "--vendor-archive",
+    is_flag=True,
+    help="Pack the pure Python packages in src/vendor into a single archive in the bundle, imported from with zipimport. Packages that read their own files through __file__ won't work from an archive.",
+)
+@click.option(
+    "--prune-vendor/--no-prune-vendor",
+    default=True,
+    help="Leave vendored files that aren't needed at runtime out of the bundle, like tests, docs, type stubs, package metadata and extension module sources. Rules in addon.yaml take precedence.",
+    show_default=True,
+)
+@click.option(
+    "--prune-unused",
+    is_flag=True,
+    help="Also leave out the vendored modules that can't be reached by following the imports of the addon's sources. Modules that are only imported dynamically must be included with a rule in addon.yaml.",
+)
+@click.option(
+    "--push",
+    is_flag=True,
+    help="Push the built bundle to a dev session started with `badkit launch --session`, which reloads the addon in place. With --watch, every rebuild is pushed.",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default=session.get_default_socket,
+    envvar="BADKIT_SESSION",
+    help="The Unix socket the dev session listens on.",
+    show_default=f"$XDG_RUNTIME_DIR/{session.SOCKET}",
+)
+@click.option(
+    "--report",
+    is_flag=True,
+    help="Print a breakdown of the bundle's size by directory, member and origin, with any duplicated members, and save it as JSON alongside the bundle.",
+)
+@click.option(
+    "--timings",
+    "print_phase_timings",
+    is_flag=True,
+    help="Print how long each phase of the build took. Phases run concurrently, like compressing members, are summed across threads.",
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write a trace of every phase of the build to this file in the Chrome trace event format, to be viewed in chrome://tracing or Perfetto.",
+)
+@click.option(
+    "--store",
+    type=click.Path(file_okay=False),
+    envvar="BADKIT_STORE",
+    help="A directory of previously built bundles, keyed by the hash of their inputs. Bundles with identical inputs are fetched from it instead of being built, and new bundles are added to it. Can be shared between projects and machines.",
+)
+@click.option(
+    "--store-size",
+    type=click.IntRange(min=0),
+    default=artifacts.DEFAULT_MAX_SIZE // 1024**2,
+    help="The maximum size of the artifact store in MiB. The least recently used bundles are removed once it grows past this.",
+    show_default=True,
+)
+def build(
+    force: bool,
+    jobs: int,
+    watch: bool,
+    bytecode: bool,
+    sourceless: bool,
+    lazy: bool,
+    tree_shake: bool,
+    vendor_archive: bool,
+    prune_vendor: bool,
+    prune_unused: bool,
+    benchmark_compression: bool,
+    workspace: Optional[str],
+    push: bool,
+    socket_path: str,
+    report: bool,
+    print_phase_timings: bool,
+    trace: Optional[str],
+    store: Optional[str],
+    store_size: int,
+) -> None:
+    """Build an addon bundle from a specified source directory."""
+
+    options = BuildOptions(
+        force=force,
+        jobs=jobs,
+        bytecode=bytecode,
+        sourceless=sourceless,
+        lazy=lazy,
+        tree_shake=tree_shake,
+        vendor_archive=vendor_archive,
+        prune_vendor=prune_vendor,
+        prune_unused=prune_unused,
+        store=store,
+        store_size=store_size * 1024**2,
+    )
+    if workspace:
+        if (
+            watch
+            or benchmark_compression
+            or push
+            or report
+            or print_phase_timings
+            or trace
+        ):
+            raise click.UsageError(
+                "--workspace can't be combined with --watch, --benchmark-compression, --push, --report, --timings or --trace."
+            )
+        build_workspace(workspace, options)
+        return
+
+    if print_phase_timings or trace:
+        timings.TRACER.enable()
+    project = Project(os.getcwd())
+    addon = load_addon(project)
+    if benchmark_compression:
+        print_compression_benchmark(project, addon, options)
+        return
+    build_path = build_bundle(project, addon, options)
+    if report:
+        with timings.TRACER.span("report"):
+            print_report(build_path)
+    if timings.TRACER.enabled:
+        # Only the first build is traced in watch mode
+        timings.TRACER.disable()
+        if print_phase_timings:
+            print_timings()
+        if trace:
+            timings.TRACER.save(trace)
+            cmd_utils.log(f'Trace saved to "{os.path.abspath(trace)}"', fg="white")
+    if push:
+        push_addon(socket_path, build_path)
+    if watch:
+        watch_addon(project, addon, options, socket_path if push else None)
@@ -0,0 +1,358 @@
+import copy
+import io
+import os
+import shutil
+import struct
+import sys
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    AbstractSet,
+    Any,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+    cast,
+)
+
+from . import timings
+
+
+@dataclass(frozen=True)
+class Member:
+    """A single file to be written into an addon bundle, sourced either from disk or from memory."""
+
+    arcname: str
+    path: Optional[str] = None
+    data: Optional[bytes] = None
+
+    @property
+    def size(self) -> int:
+        """The size of the member's contents in bytes."""
+
+        if self.data is not None:
+            return len(self.data)
+        return os.path.getsize(self.get_path())
+
+    def get_path(self) -> str:
+        """
+        Get the path of the file the member is sourced from.
+
+        :raises ValueError: if the member has neither a path nor data.
+        """
+
+        if self.path is None:
+            raise ValueError(f"The bundle member {self.arcname} has no contents.")
+        return self.path
+
+    def open(self) -> BinaryIO:
+        """Open the contents of the member for reading."""
+
+        if self.data is not None:
+            return io.BytesIO(self.data)
+        return open(self.get_path(), "rb")
+
+    def read(self) -> bytes:
+        """Read the full contents of the member."""
+
+        if self.data is not None:
+            return self.data
+        with self.open() as file:
+            return file.read()
+
+
+def collect_members(path: str, arcdir: str) -> list[Member]:
+    """
+    Recursively collect every file under a directory as bundle members, skipping bytecode caches. Members are returned in a stable order.
+
+    :param path: The directory to collect files from.
+    :param arcdir: The directory inside the archive that `path` should be mapped to.
+    """
+
+    members = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(dir for dir in dirs if dir != "__pycache__")
+        for file in sorted(files):
+            file_path = os.path.join(root, file)
+            arcname = os.path.join(arcdir, os.path.relpath(file_path, path))
+            members.append(
+                Member(
+                    arcname.replace(os.path.sep, "/"), path=os.path.abspath(file_path)
+                )
+            )
+    return members
+
+
+# `read_raw`, `write_raw` and `compress_member` rely on private `zipfile` internals: the header field offsets, `_get_compressor`,
+# the member's compression level, and the archive's file object and central directory bookkeeping. These are unchanged from CPython 3.9 to 3.13,
+# so they are only used on those versions. Elsewhere, members are streamed through the public `zipfile` API instead, recompressing reused members.
+RAW_PYTHON_VERSIONS = ((3, 9), (3, 13))
+RAW_MODULE_ATTRS = (
+    "structFileHeader",
+    "sizeFileHeader",
+    "_FH_FILENAME_LENGTH",
+    "_FH_EXTRA_FIELD_LENGTH",
+    "_get_compressor",
+)
+RAW_ARCHIVE_ATTRS = ("fp", "filelist", "NameToInfo", "start_dir", "_didModify")
+# Members at least this large are streamed into the archive by the writing thread instead of being compressed whole in memory by a worker thread
+STREAM_SIZE = 16 * 1024 * 1024
+# The number of bytes copied at a time when streaming members
+CHUNK_SIZE = 1024 * 1024
+# The untyped `zipfile` module, for the private internals that typeshed doesn't declare
+ZIPFILE_INTERNALS: Any = zipfile
+
+
+def supports_raw(zipf: zipfile.ZipFile) -> bool:
+    """
+    Check whether the `zipfile` internals that raw reads and writes rely on are available.
+
+    :param zipf: The archive to be written to.
+    """
+
+    version = sys.version_info[:2]
+    return (
+        RAW_PYTHON_VERSIONS[0] <= version <= RAW_PYTHON_VERSIONS[1]
+        and all(hasattr(zipfile, attr) for attr in RAW_MODULE_ATTRS)
+        and all(hasattr(zipf, attr) for attr in RAW_ARCHIVE_ATTRS)
+    )
+
+
+def read_raw(zipf: zipfile.ZipFile, info: zipfile.ZipInfo) -> Iterator[bytes]:
+    """
+    Read the compressed bytes of an archive member in chunks, without decompressing them.
+
+    :param zipf: The archive to read from.
+    :param info: The member to read.
+    """
+
+    archive = cast(Any, zipf)
+    archive.fp.seek(info.header_offset)
+    header = struct.unpack(
+        ZIPFILE_INTERNALS.structFileHeader,
+        archive.fp.read(ZIPFILE_INTERNALS.sizeFileHeader),
+    )
+    archive.fp.seek(
+        header[ZIPFILE_INTERNALS._FH_FILENAME_LENGTH]
+        + header[ZIPFILE_INTERNALS._FH_EXTRA_FIELD_LENGTH],
+        1,
+    )
+    remaining = info.compress_size
+    while remaining:
+        chunk = archive.fp.read(min(remaining, CHUNK_SIZE))
+        if not chunk:
+            raise zipfile.BadZipFile(f"{info.filename} is truncated.")
+        remaining -= len(chunk)
+        yield chunk
+
+
+def write_raw(
+    zipf: zipfile.ZipFile, info: zipfile.ZipInfo, chunks: Iterable[bytes]
+) -> None:
+    """
+    Append an already compressed member to an archive. `info` must describe the data (CRC, sizes and compression type).
+
+    :param zipf: The archive to write to.
+    :param info: The header describing the member.
+    :param chunks: The compressed bytes of the member.
+    """
+
+    archive = cast(Any, zipf)
+    info = copy.copy(info)
+    # Sizes and CRC are known up front, so no data descriptor is needed after the member
+    info.flag_bits &= ~0x08
+    info.header_offset = archive.fp.tell()
+    archive.fp.write(info.FileHeader())
+    for chunk in chunks:
+        archive.fp.write(chunk)
+    archive.filelist.append(info)
+    archive.NameToInfo[info.filename] = info
+    archive.start_dir = archive.fp.tell()
+    archive._didModify = True
+
+
+def get_date_time() -> tuple[int, int, int, int, int, int]:
+    """
+    Get the timestamp given to every member of a bundle, so bundles are reproducible.
+    This is taken from the `SOURCE_DATE_EPOCH` environment variable if it's set, otherwise the earliest date a zip file can represent is used.
+    """
+
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch is None:
+        return (1980, 1, 1, 0, 0, 0)
+    return max(time.gmtime(int(epoch))[:6], (1980, 1, 1, 0, 0, 0))
+
+
+def get_member_info(member: Member) -> zipfile.ZipInfo:
+    """
+    Get the header of a member, with fixed metadata so that bundles are reproducible across machines and checkouts.
+
+    :param member: The member.
+    """
+
+    info = zipfile.ZipInfo(member.arcname, date_time=get_date_time())
+    info.create_system = 3
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def compress_member(
+    member: Member, compression: int, compresslevel: Optional[int] = None
+) -> tuple[zipfile.ZipInfo, bytes]:
+    """
+    Compress a member in memory, ready to be appended to an archive with `write_raw`. This is safe to call from worker threads.
+
+    :param member: The member to compress.
+    :param compression: The `zipfile` compression method to use.
+    :param compresslevel: The compression level to use, or `None` for the method's default.
+    :returns: the header describing the compressed member and its compressed bytes.
+    """
+
+    info = get_member_info(member)
+    data = member.read()
+    info.compress_type = compression
+    cast(Any, info)._compresslevel = compresslevel
+    info.file_size = len(data)
+    info.CRC = zlib.crc32(data)
+    compressor = ZIPFILE_INTERNALS._get_compressor(compression, compresslevel)
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    info.compress_size = len(data)
+    return info, data
+
+
+def stream_member(
+    zipf: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    file: BinaryIO,
+    compresslevel: Optional[int] = None,
+) -> None:
+    """
+    Write a member to an archive through the public `zipfile` API, compressing it a chunk at a time so it is never held in memory whole.
+
+    :param zipf: The archive to write to.
+    :param info: The header of the member, with its compression method and uncompressed size set.
+    :param file: The member's uncompressed contents.
+    :param compresslevel: The compression level to use, or `None` for the method's default.
+    """
+
+    # Renamed from the private `_compresslevel` in Python 3.13
+    if sys.version_info >= (3, 13):
+        info.compress_level = compresslevel
+    else:
+        cast(Any, info)._compresslevel = compresslevel
+    with zipf.open(info, "w") as dest:
+        shutil.copyfileobj(file, dest, CHUNK_SIZE)
+
+
+def compress_with(
+    member: Member, policy: Callable[[Member], tuple[int, Optional[int]]]
+) -> tuple[zipfile.ZipInfo, bytes]:
+    """
+    Compress a member with the method and level chosen for it by a policy.
+
+    :param member: The member to compress.
+    :param policy: A function returning the `zipfile` compression method and level to use for a member.
+    """
+
+    with timings.TRACER.span(f"compress {member.arcname}", "compress members"):
+        return compress_member(member, *policy(member))
+
+
+def write_bundle(
+    build_path: str,
+    members: Iterable[Member],
+    reusable: AbstractSet[str] = frozenset(),
+    jobs: int = 1,
+    policy: Callable[[Member], tuple[int, Optional[int]]] = lambda member: (
+        zipfile.ZIP_DEFLATED,
+        None,
+    ),
+) -> int:
+    """
+    Write a set of members to an archive, replacing any existing archive once it is complete.
+    Members named in `reusable` are raw-copied from the existing archive instead of being read and compressed again.
+    Other members are compressed concurrently by a pool of `jobs` threads (zlib, bz2 and lzma release the GIL while compressing), but are always written in the order they are given in.
+    Members of at least `STREAM_SIZE` bytes, and every member on Python versions without the `zipfile` internals raw writes need, are streamed in chunks by the writing thread instead.
+
+    :param build_path: The path to write the archive to.
+    :param members: The members to write.
+    :param reusable: The names of members which are unchanged since the existing archive was built.
+    :param jobs: The number of members to compress concurrently.
+    :param policy: A function returning the `zipfile` compression method and level to use for a new member. Policies run in the worker threads.
+    :returns: the number of members that were reused from the existing archive.
+    """
+
+    reused = 0
+    partial_path = f"{build_path}.partial"
+    previous = (
+        zipfile.ZipFile(build_path, "r")
+        if reusable and os.path.exists(build_path)
+        else None
+    )
+    # Members waiting to be written, in archive order. Bounded so that at most `2 * jobs` members compressed in memory are held at once.
+    pending: deque[Union[zipfile.ZipInfo, Future, Member]] = deque()
+
+    def flush(limit: int) -> None:
+        while len(pending) > limit:
+            item = pending.popleft()
+            if isinstance(item, zipfile.ZipInfo):
+                assert previous is not None
+                with timings.TRACER.span(f"copy {item.filename}", "copy members"):
+                    if raw:
+                        write_raw(bundle, item, read_raw(previous, item))
+                    else:
+                        with previous.open(item) as file:
+                            stream_member(bundle, copy.copy(item), cast(BinaryIO, file))
+            elif isinstance(item, Member):
+                compression, compresslevel = policy(item)
+                info = get_member_info(item)
+                info.compress_type = compression
+                info.file_size = item.size
+                with timings.TRACER.span(
+                    f"compress {item.arcname}", "compress members"
+                ), item.open() as file:
+                    stream_member(bundle, info, file, compresslevel)
+            else:
+                info, data = item.result()
+                write_raw(bundle, info, [data])
+
+    try:
+        with zipfile.ZipFile(partial_path, "w") as bundle, ThreadPoolExecutor(
+            max_workers=jobs
+        ) as pool:
+            raw = supports_raw(bundle)
+            for member in members:
+                info = (
+                    previous.NameToInfo.get(member.arcname)
+                    if previous and member.arcname in reusable
+                    else None
+                )
+                if info:
+                    pending.append(info)
+                    reused += 1
+                elif raw and member.size < STREAM_SIZE:
+                    pending.append(pool.submit(compress_with, member, policy))
+                else:
+                    pending.append(member)
+                flush(2 * jobs)
+            flush(0)
+            with timings.TRACER.span("finalize bundle"):
+                bundle.close()
+        os.replace(partial_path, build_path)
+    except BaseException:
+        # Don't leave a half-written bundle behind
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    finally:
+        if previous:
+            previous.close()
+    return reused
@@ -0,0 +1,122 @@
+import importlib.util
+import marshal
+import os
+import sys
+import time
+from typing import Iterable
+
+from .bundle import Member
+
+# The first Blender version to ship each Python version, in ascending order
+BLENDER_PYTHON_VERSIONS: tuple[tuple[tuple[int, ...], tuple[int, int]], ...] = (
+    ((2, 80), (3, 7)),
+    ((2, 93), (3, 9)),
+    ((3, 1), (3, 10)),
+    ((4, 1), (3, 11)),
+)
+# The bytecode magic number of the final release of each Python version
+PYTHON_MAGIC_NUMBERS: dict[tuple[int, int], int] = {
+    (3, 7): 3394,
+    (3, 8): 3413,
+    (3, 9): 3425,
+    (3, 10): 3439,
+    (3, 11): 3495,
+    (3, 12): 3531,
+    (3, 13): 3571,
+}
+
+
+def get_python_version(blender_version: tuple[int, ...]) -> tuple[int, int]:
+    """
+    Get the version of Python bundled with a version of Blender.
+
+    :param blender_version: The Blender version, e.g. `(3, 3, 0)`.
+    :raises ValueError: if the Blender version is older than any supported version.
+    """
+
+    python_version = None
+    for first_blender_version, version in BLENDER_PYTHON_VERSIONS:
+        if tuple(blender_version) >= first_blender_version:
+            python_version = version
+    if not python_version:
+        raise ValueError(
+            f"Blender {'.'.join(map(str, blender_version))} is not supported for bytecode bundles."
+        )
+    return python_version
+
+
+def check_magic_number(python_version: tuple[int, int]) -> None:
+    """
+    Check that the running interpreter produces bytecode that a given Python version can load.
+
+    :param python_version: The Python version the bytecode will be loaded by.
+    :raises RuntimeError: if the magic numbers of the two versions differ.
+    """
+
+    magic = int.from_bytes(importlib.util.MAGIC_NUMBER[:2], "little")
+    expected = PYTHON_MAGIC_NUMBERS.get(python_version)
+    if magic != expected:
+        target = ".".join(map(str, python_version))
+        raise RuntimeError(
+            f"Bytecode for Python {target} (magic number {expected}) can't be compiled by Python "
+            f"{sys.version_info.major}.{sys.version_info.minor} (magic number {magic}). Run BADKit with Python {target} instead."
+        )
+
+
+def compile_source(source: bytes, filename: str, checked: bool) -> bytes:
+    """
+    Compile Python source to the contents of a hash-based `.pyc` file (PEP 552), which doesn't depend on the modification time of the source.
+
+    :param source: The Python source.
+    :param filename: The filename to record in the code object, shown in tracebacks.
+    :param checked: Have the import system validate the `.pyc` against the hash of the source before using it.
+    """
+
+    code = compile(source, filename, "exec", dont_inherit=True)
+    flags = 0b11 if checked else 0b01
+    return (
+        importlib.util.MAGIC_NUMBER
+        + flags.to_bytes(4, "little")
+        + importlib.util.source_hash(source)
+        + marshal.dumps(code)
+    )
+
+
+def compile_members(
+    members: Iterable[Member], python_version: tuple[int, int], sourceless: bool = False
+) -> tuple[list[Member], float]:
+    """
+    Compile every Python module in a set of bundle members.
+    Compiled modules are written to `__pycache__` alongside their sources, or replace their sources if `sourceless` is set.
+
+    :param members: The members of the bundle.
+    :param python_version: The Python version of the Blender the bundle targets.
+    :param sourceless: Bundle only the compiled modules, without their sources.
+    :returns: the new members of the bundle and the number of seconds spent compiling, which Blender would otherwise spend on the first enable.
+    :raises RuntimeError: if the running interpreter can't compile bytecode for `python_version`.
+    """
+
+    check_magic_number(python_version)
+    compiled = []
+    elapsed = 0.0
+    for member in members:
+        if not member.arcname.endswith(".py"):
+            compiled.append(member)
+            continue
+
+        start = time.perf_counter()
+        pyc = compile_source(member.read(), member.arcname, checked=not sourceless)
+        elapsed += time.perf_counter() - start
+        if sourceless:
+            compiled.append(Member(f"{member.arcname}c", data=pyc))
+        else:
+            compiled.append(member)
+            compiled.append(
+                Member(
+                    importlib.util.cache_from_source(member.arcname).replace(
+                        os.path.sep, "/"
+                    ),
+                    data=pyc,
+                )
+            )
+    return compiled, elapsed
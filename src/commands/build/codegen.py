@@ -0,0 +1,184 @@
+import os
+import pprint
+from typing import Any, Optional, cast
+
+from . import descriptors, discovery
+
+INITIALIZER = os.path.join(os.path.dirname(__file__), "initializer.py")
+HEADER = (
+    "# Generated by BADKit. Do not edit, changes will be overwritten by the next build."
+)
+# Operator methods Blender looks up when the class is registered, so a stand-in can't provide them by loading the real operator later
+REGISTERED_CALLBACKS = ("poll", "modal", "draw", "check", "cancel", "description")
+
+
+def get_ref_key(ref: dict[str, object]) -> tuple[str, str]:
+    """
+    Get the key a class is looked up by in the names chosen by `get_class_names()`.
+
+    :param ref: The class reference.
+    :returns: the module and name of an imported class, or the package and name of a generated class.
+    """
+
+    module = ref["module"] if "module" in ref else ref["package"]
+    return cast(str, module), cast(str, ref["name"])
+
+
+def get_class_names(refs: tuple[dict[str, object], ...]) -> dict[tuple[str, str], str]:
+    """
+    Choose the name each class is bound to or defined as in the generated module. Classes keep their own name unless another class shares it,
+    in which case the name is prefixed with the class's module, or with the package a generated class is generated for.
+
+    :param refs: The class references of the addon.
+    :returns: the local name of each class, keyed by `get_ref_key()`.
+    """
+
+    keys = [get_ref_key(ref) for ref in refs]
+    names = {}
+    for module, name in keys:
+        clashes = any(
+            other == name and other_module != module for other_module, other in keys
+        )
+        names[(module, name)] = (
+            f"{module.replace('.', '_')}_{name}" if clashes else name
+        )
+    return names
+
+
+def get_menu_target_source(menu_target: str) -> Optional[str]:
+    """
+    Get source for the menu an operator is appended to that can be evaluated in the generated module, where only `bpy` is imported.
+
+    :param menu_target: The source of the operator's `menu_target` attribute.
+    :returns: the source, or `None` if it can't be evaluated without importing the operator's module.
+    """
+
+    if menu_target.startswith("bpy.types.") and menu_target[10:].isidentifier():
+        return menu_target
+    if menu_target.isidentifier():
+        return f"bpy.types.{menu_target}"
+    return None
+
+
+def can_load_lazily(info: discovery.ClassInfo) -> bool:
+    """
+    Check if an operator can be registered as a `LazyOperator` stand-in. Its metadata must be literal, and it can't declare properties
+    or any Blender callback besides `invoke()` and `execute()` (see `REGISTERED_CALLBACKS`), since Blender needs those before the operator is first run.
+
+    :param info: The static metadata of the operator.
+    """
+
+    return (
+        info.bl_idname is not None
+        and info.bl_label is not None
+        and not info.props
+        and not any(method in info.methods for method in REGISTERED_CALLBACKS)
+        and (
+            info.menu_target is None
+            or get_menu_target_source(info.menu_target) is not None
+        )
+    )
+
+
+def generate_lazy_operator(info: discovery.ClassInfo, local_name: str) -> list[str]:
+    """
+    Generate the source of a `LazyOperator` stand-in for an operator.
+
+    :param info: The static metadata of the operator.
+    :param local_name: The name to give the stand-in class.
+    """
+
+    lines = [f"class {local_name}(LazyOperator):"]
+    for attr in ("bl_idname", "bl_label", "bl_description"):
+        if getattr(info, attr) is not None:
+            lines.append(f"    {attr} = {getattr(info, attr)!r}")
+    if info.bl_options is not None:
+        lines.append(f"    bl_options = {set(info.bl_options)!r}")
+    if info.menu_target is not None:
+        lines.append(f"    menu_target = {get_menu_target_source(info.menu_target)}")
+    lines += [
+        f'    lazy_module = f"{{__package__}}.{info.module}"',
+        f"    lazy_class = {info.name!r}",
+    ]
+    return lines
+
+
+def generate_init(
+    addon: descriptors.Addon, lazy: bool = False, vendor: bool = False
+) -> str:
+    """
+    Generate the `__init__.py` of an addon bundle. The module imports the addon's classes directly, defines its generated panels and
+    lists everything to register in literal tables, followed by the runtime registration code from `initializer.py`.
+
+    :param addon: The addon to generate the module for.
+    :param lazy: Register stand-ins for operators that support it (see `can_load_lazily()`), so their modules are only imported when they are first run.
+    :param vendor: Install a finder for the bundle's vendored modules (see `vendor_utils`) before the addon's modules are imported.
+    """
+
+    refs = addon.get_classes()
+    names = get_class_names(refs)
+    lazy_operators = {
+        (operator.operator.module, operator.operator.name): operator.operator
+        for operator in addon.operators
+        if lazy and can_load_lazily(operator.operator)
+    }
+    lines = [HEADER]
+    if vendor:
+        lines.append("import os")
+    if lazy_operators:
+        lines.append("import bpy")
+    if vendor:
+        lines.append("from badkit.utils import vendor_utils")
+    lines.append("from badkit.wrappers import BADKitPanel")
+    if lazy_operators:
+        lines.append("from badkit.wrappers.lazy_operator import LazyOperator")
+    lines.append("")
+    if vendor:
+        lines += [
+            "# Vendored modules must be importable before the addon's modules import them",
+            'vendor_utils.install(os.path.join(os.path.dirname(__file__), "vendor"))',
+            "",
+        ]
+
+    imported = sorted(get_ref_key(ref) for ref in refs if "module" in ref)
+    for module, name in imported:
+        if (module, name) in lazy_operators:
+            continue
+        local_name = names[(module, name)]
+        alias = f" as {local_name}" if local_name != name else ""
+        lines.append(f"from .{module} import {name}{alias}")
+
+    lines += [
+        "",
+        f"bl_info = {pprint.pformat(addon.bl_info.get_dict(), sort_dicts=False)}",
+    ]
+
+    for key, info in lazy_operators.items():
+        lines += ["", "", *generate_lazy_operator(info, names[key])]
+
+    for ref in refs:
+        if "module" in ref:
+            continue
+        lines += ["", "", f"class {names[get_ref_key(ref)]}(BADKitPanel):"]
+        for attr, value in cast(dict[str, Any], ref["attrs"]).items():
+            if attr == "props":
+                value_source = names[(value["module"], value["name"])]
+            else:
+                value_source = repr(value)
+            lines.append(f"    {attr} = {value_source}")
+
+    class_names = [names[get_ref_key(ref)] for ref in refs]
+    blend = tuple(
+        (blend.name, tuple(tuple(group) for group in blend.node_groups))
+        for blend in addon.blend or ()
+    )
+    lines += [
+        "",
+        "",
+        f"CLASSES = ({', '.join(class_names)}{',' if len(class_names) == 1 else ''})",
+        f"BLEND = {pprint.pformat(blend)}",
+        "",
+    ]
+
+    with open(INITIALIZER, "r") as initializer:
+        return "\n".join(lines) + "\n" + initializer.read()
@@ -0,0 +1,141 @@
+import fnmatch
+import os
+import time
+import zipfile
+import zlib
+from typing import Iterable, Optional
+
+from . import descriptors
+from .bundle import Member, compress_member
+
+METHODS = {
+    "store": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+# Extensions of formats that are already compressed, so compressing them again only wastes time
+COMPRESSED_EXTENSIONS = (
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".webp",
+    ".zip",
+    ".whl",
+    ".gz",
+    ".bz2",
+    ".xz",
+    ".zst",
+    ".7z",
+    ".mp3",
+    ".mp4",
+    ".ogg",
+)
+# Rules applied to members not matched by any rule in addon.yaml
+DEFAULT_RULES = (
+    descriptors.Compression("*.py", "deflate", 9),
+    *(descriptors.Compression(f"*{ext}", "store") for ext in COMPRESSED_EXTENSIONS),
+    descriptors.Compression("*", "auto"),
+)
+# The number of bytes sampled from each member by the "auto" method
+SAMPLE_SIZE = 64 * 1024
+# Members whose sample compresses to more than this fraction of its size are stored by the "auto" method
+STORE_THRESHOLD = 0.9
+
+
+def sample(member: Member, size: int = SAMPLE_SIZE) -> bytes:
+    """
+    Read a sample of a member's contents from its start and its middle, to avoid being misled by file headers.
+
+    :param member: The member to sample.
+    :param size: The total number of bytes to sample.
+    """
+
+    if member.data is not None:
+        data = member.data
+        middle = len(data) // 2
+        return data[: size // 2] + data[middle : middle + size // 2]
+
+    with open(member.get_path(), "rb") as file:
+        head = file.read(size // 2)
+        file.seek(os.fstat(file.fileno()).st_size // 2)
+        return head + file.read(size // 2)
+
+
+def estimate_ratio(member: Member) -> float:
+    """
+    Estimate how well a member compresses by quickly deflating a sample of it.
+
+    :param member: The member to estimate for.
+    :returns: the size of the compressed sample as a fraction of its original size.
+    """
+
+    data = sample(member)
+    if not data:
+        return 1.0
+    return len(zlib.compress(data, 1)) / len(data)
+
+
+class Policy:
+    """A callable choosing the compression method and level of each bundle member from a list of rules, where the first matching rule wins."""
+
+    def __init__(self, rules: Iterable[descriptors.Compression] = ()) -> None:
+        """
+        Construct a Policy object.
+
+        :param rules: The rules from addon.yaml, which take precedence over `DEFAULT_RULES`.
+        """
+
+        self.rules = (*rules, *DEFAULT_RULES)
+
+    def __call__(self, member: Member) -> tuple[int, Optional[int]]:
+        """
+        Choose how to compress a member.
+
+        :param member: The member to compress.
+        :returns: the `zipfile` compression method and the compression level.
+        """
+
+        for rule in self.rules:
+            if fnmatch.fnmatchcase(member.arcname, rule.pattern):
+                if rule.method != "auto":
+                    return METHODS[rule.method], rule.level
+                if estimate_ratio(member) > STORE_THRESHOLD:
+                    return zipfile.ZIP_STORED, None
+                return zipfile.ZIP_DEFLATED, rule.level
+        return zipfile.ZIP_DEFLATED, None
+
+    def get_settings(self) -> list[dict[str, object]]:
+        """Get the rules of the policy in a form that can be stored in a manifest."""
+
+        return [
+            {"pattern": rule.pattern, "method": rule.method, "level": rule.level}
+            for rule in self.rules
+        ]
+
+
+def benchmark(
+    members: Iterable[Member], policy: Policy
+) -> list[tuple[str, int, int, float]]:
+    """
+    Compress a set of members with every method, and with a policy, to compare the size and time trade-off of each.
+
+    :param members: The members to compress.
+    :param policy: The policy to compare against the uniform methods.
+    :returns: the name, total uncompressed size, total compressed size and time in seconds of each method.
+    """
+
+    members = list(members)
+    choices = {name: Policy((descriptors.Compression("*", name),)) for name in METHODS}
+    choices["policy"] = policy
+
+    results = []
+    for name, choose in choices.items():
+        raw_size = compressed_size = 0
+        start = time.perf_counter()
+        for member in members:
+            info, _ = compress_member(member, *choose(member))
+            raw_size += info.file_size
+            compressed_size += info.compress_size
+        results.append((name, raw_size, compressed_size, time.perf_counter() - start))
+    return results
@@ -1,36 +1,14 @@
-import importlib
-import os
-import re
-from typing import Literal, Optional, Type, cast
+from typing import Literal, Optional, Type
 
 import yaml
 
-from ... import wrappers
+from . import discovery, timings
 
 # TODO: use dataclasses
 # TODO: use privacy
 # TODO: use tuple instead of list
 
 
-def import_class(package: str, module: str, super_name: str):
-    # TODO: document that does imports relative to cwd
-    mod_path = os.path.abspath(os.path.join(package, module + ".py"))
-    if not os.path.exists(mod_path):
-        raise FileNotFoundError(f"Failed to locate {package}.{module} at {mod_path}")
-    cls: str = None
-    with open(mod_path, "r") as mod_file:
-        match = re.search(
-            f"(?<=class )\w*(?=\((\w\.?)*\.?({super_name})\):)", mod_file.read()
-        )
-        if not match:
-            raise ImportError(
-                f"Failed to locate a subclass of {super_name} in {package}.{module} at {mod_path}"
-            )
-        cls = match.group()
-    module = importlib.import_module(f"{package}.{module}")
-    return getattr(module, cls)
-
-
 class Serializable(yaml.YAMLObject):
     @classmethod
     def get_attrs(cls) -> tuple[str, ...]:
@@ -128,47 +106,84 @@ class Operator(Serializable):
         panel: Optional[Panel | str] = None,
     ) -> None:
         """
-        Construct a Package object.
+        Construct an Operator object. The operator's classes are discovered by parsing its package's source, which is never imported at build time.
 
-        :param operator: The operator class of the addon.
-        :param properties: A custom property group class defined by the addon.
-        :param panel: A panel class defined by the addon or a `PanelData` object.
+        :param name: The name of the operator's package, relative to the source directory.
+        :param panel: A `Panel` descriptor to generate a panel from, or the name of a module in the operator's package defining a `BADKitPanel` subclass.
         """
 
         self.name = name
-        # TODO: currently Assumes to be running in src
-        self.operator = cast(
-            wrappers.BADKitOperator, import_class(name, "operator", "BADKitOperator")
+        self.panel_descriptor = panel
+        # Discovered by `load()`
+        self.operator: discovery.ClassInfo
+        self.properties: Optional[discovery.ClassInfo] = None
+        self.panel: Optional[discovery.ClassInfo | dict[str, object]] = None
+
+    def load(self, src_dir: str) -> None:
+        """
+        Discover the operator's classes and describe its panel, if one was requested. Unchanged modules are served from the discovery cache.
+
+        :param src_dir: The source directory containing the operator's package.
+        """
+
+        name = self.name
+        panel = self.panel_descriptor
+        self.operator = discovery.discover_class(
+            name, "operator", "BADKitOperator", src_dir
         )
         try:
-            self.properties = cast(
-                wrappers.BADKitPropertyGroup,
-                import_class(name, "properties", "BADKitPropertyGroup"),
+            self.properties = discovery.discover_class(
+                name, "properties", "BADKitPropertyGroup", src_dir
             )
         except FileNotFoundError:
             self.properties = None
 
         if panel and isinstance(panel, Panel):
+            for attr in ("bl_idname", "bl_label"):
+                if getattr(self.operator, attr) is None:
+                    reason = (
+                        "isn't a literal"
+                        if attr in self.operator.dynamic
+                        else "isn't set"
+                    )
+                    raise ValueError(
+                        f"Failed to generate a panel for {self.operator.module}.{self.operator.name}: its {attr} {reason}, "
+                        "so it can't be read without importing the operator. Set it to a string literal in the class body."
+                    )
             if not self.properties:
                 raise FileNotFoundError(
                     f"Panel generation was attempted but there are no properties defined for the operator {self.operator.bl_idname}."
                 )
-            generated_panel: wrappers.BADKitPanel = type(
-                f"{self.operator.__name__}Panel",
-                (wrappers.BADKitPanel,),
-                {
-                    "bl_label": self.operator.bl_label,
-                    "bl_idname": f"{panel.space}_PT_{name}",
-                    "bl_category": panel.category,
-                    "bl_description": f"Panel for running the {self.operator.bl_label} operator.",
-                    "operator_idname": self.operator.bl_idname,
-                    "props": self.properties,
-                },
-            )
-            globals()[generated_panel.__name__] = generated_panel
-            self.panel = generated_panel
+            with timings.TRACER.span(f"generate {name} panel", "generate panels"):
+                self.panel = {
+                    "name": f"{self.operator.name}Panel",
+                    "package": name,
+                    "attrs": {
+                        "bl_label": self.operator.bl_label,
+                        "bl_idname": f"{panel.space}_PT_{name}",
+                        "bl_category": panel.category,
+                        "bl_description": f"Panel for running the {self.operator.bl_label} operator.",
+                        "operator_idname": self.operator.bl_idname,
+                        "props": self.properties.get_ref(),
+                        "prop_names": self.properties.props,
+                    },
+                }
+        elif panel:
+            self.panel = discovery.discover_class(name, panel, "BADKitPanel", src_dir)
         else:
-            self.panel = panel
+            self.panel = None
+
+    def get_class_refs(self) -> tuple[dict[str, object], ...]:
+        """
+        Get plain references to the operator's classes, from which the bundle's registration module is generated.
+        Classes defined in source are referenced by module and name, and generated panels are referenced by their name and class attributes.
+        """
+
+        return tuple(
+            cls.get_ref() if isinstance(cls, discovery.ClassInfo) else cls
+            for cls in (self.operator, self.properties, self.panel)
+            if cls is not None
+        )
 
     @classmethod
     def get_attrs(cls) -> tuple[str, ...]:
@@ -188,29 +203,111 @@ class Blend(Serializable):
         return "name", "node_groups"
 
 
+class Compression(Serializable):
+    yaml_tag = "!Compression"
+
+    """A rule choosing how bundle members with names matching a glob pattern are compressed."""
+
+    METHODS = ("store", "deflate", "bzip2", "lzma", "auto")
+    # The levels each method accepts, where "auto" deflates. Store and lzma ignore the level
+    LEVELS = {"deflate": range(0, 10), "bzip2": range(1, 10), "auto": range(0, 10)}
+
+    def __init__(self, pattern: str, method: str, level: Optional[int] = None) -> None:
+        """
+        Construct a Compression object.
+
+        :param pattern: A glob pattern matched against the names of members in the bundle, e.g. `"blend/*.blend"`.
+        :param method: One of `"store"`, `"deflate"`, `"bzip2"`, `"lzma"` or `"auto"`. `"auto"` samples each member and stores it if it doesn't compress well, deflating it otherwise.
+        :param level: The compression level to use, or `None` for the method's default. Deflate accepts 0 to 9 and bzip2 1 to 9.
+        :raises ValueError: if the method is unknown, or the level is out of the method's range.
+        """
+
+        if method not in self.METHODS:
+            raise ValueError(
+                f'Unknown compression method "{method}" for "{pattern}", expected one of {", ".join(self.METHODS)}.'
+            )
+        levels = self.LEVELS.get(method)
+        if (
+            level is not None
+            and levels is not None
+            and (not isinstance(level, int) or level not in levels)
+        ):
+            raise ValueError(
+                f'Invalid compression level {level!r} for "{pattern}", the {method} method expects a level from {levels.start} to {levels.stop - 1}.'
+            )
+        self.pattern = pattern
+        self.method = method
+        self.level = level
+
+    @classmethod
+    def get_attrs(cls) -> tuple[str, ...]:
+        return "pattern", "method", "level"
+
+
+class Prune(Serializable):
+    yaml_tag = "!Prune"
+
+    """A rule choosing whether vendored files with bundle names matching a glob pattern are bundled or pruned."""
+
+    ACTIONS = ("include", "exclude")
+
+    def __init__(self, pattern: str, action: str) -> None:
+        """
+        Construct a Prune object.
+
+        :param pattern: A glob pattern matched against the names of vendored files in the bundle, e.g. `"vendor/numpy/tests/*"`.
+        :param action: `"include"` to bundle the matching files, or `"exclude"` to prune them.
+        """
+
+        if action not in self.ACTIONS:
+            raise ValueError(
+                f'Unknown prune action "{action}" for "{pattern}", expected one of {", ".join(self.ACTIONS)}.'
+            )
+        self.pattern = pattern
+        self.action = action
+
+    @classmethod
+    def get_attrs(cls) -> tuple[str, ...]:
+        return "pattern", "action"
+
+
 class Addon(Serializable):
     """A class representing an entire Blender addon."""
 
     yaml_tag = "!Addon"
 
     def __init__(
-        self, bl_info: BLInfo, operators: list[Operator], blend: list[Blend]
+        self,
+        bl_info: BLInfo,
+        operators: list[Operator],
+        blend: list[Blend],
+        compression: Optional[list[Compression]] = None,
+        prune: Optional[list[Prune]] = None,
     ) -> None:
         self.bl_info = bl_info
         self.operators = operators
         self.blend = blend
+        self.compression = compression or []
+        self.prune = prune or []
 
-    def get_classes(self):
+    def load(self, src_dir: str) -> None:
+        """
+        Discover the classes of every operator of the addon.
+
+        :param src_dir: The source directory containing the operators' packages.
+        """
+
+        for operator in self.operators:
+            operator.load(src_dir)
+
+    def get_classes(self) -> tuple[dict[str, object], ...]:
         return tuple(
-            cls
-            for operator in self.operators
-            for cls in (operator.operator, operator.properties, operator.panel)
-            if cls is not None
+            ref for operator in self.operators for ref in operator.get_class_refs()
         )
 
     @classmethod
     def get_attrs(cls) -> tuple[str, ...]:
-        return "bl_info", "operators", "blend"
+        return "bl_info", "operators", "blend", "compression", "prune"
 
 
 DESCRIPTOR_CLASSES: set[Type[yaml.YAMLObject]] = {
@@ -218,5 +315,7 @@ DESCRIPTOR_CLASSES: set[Type[yaml.YAMLObject]] = {
     Panel,
     Operator,
     Blend,
+    Compression,
+    Prune,
     Addon,
 }
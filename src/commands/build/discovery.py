@@ -0,0 +1,242 @@
+import ast
+import dataclasses
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+from . import manifest, timings
+
+DISCOVERY_CACHE_VERSION = 3
+# Class attributes recorded in static metadata, rather than treated as properties
+BL_ATTRS = ("bl_idname", "bl_label", "bl_description", "bl_options", "menu_target")
+
+
+@dataclass(frozen=True)
+class ClassInfo:
+    """Static metadata about a class in an addon's source, discovered without importing the module that defines it."""
+
+    module: str
+    name: str
+    bl_idname: Optional[str] = None
+    bl_label: Optional[str] = None
+    bl_description: Optional[str] = None
+    bl_options: Optional[tuple[str, ...]] = None
+    menu_target: Optional[str] = None
+    props: tuple[str, ...] = ()
+    methods: tuple[str, ...] = ()
+    # The `bl_*` attributes that are set to something other than a literal, so can't be read without importing the class
+    dynamic: tuple[str, ...] = ()
+
+    def get_ref(self) -> dict[str, object]:
+        """Get a plain reference to the class that can be resolved by importing its module at runtime."""
+
+        return {"module": self.module, "name": self.name}
+
+
+class DiscoveryCache:
+    """A cache of discovered classes, keyed by the hash of the source file they were discovered in."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, ClassInfo] = {}
+        # Hashes of every source file looked up by discovery, or None for files that didn't exist
+        self.sources: dict[str, Optional[str]] = {}
+        self.modified = False
+
+    def load(self, path: str) -> None:
+        """
+        Load cached entries from disk, replacing any entries already loaded. Missing or unreadable caches are ignored.
+
+        :param path: The path to the cache file.
+        """
+
+        self.entries.clear()
+        self.modified = False
+        try:
+            with open(path, "r") as file:
+                contents = json.load(file)
+        except (OSError, ValueError):
+            return
+        if contents.get("version") != DISCOVERY_CACHE_VERSION:
+            return
+        for key, entry in contents.get("classes", {}).items():
+            for field in ("bl_options", "props", "methods", "dynamic"):
+                if entry[field] is not None:
+                    entry[field] = tuple(entry[field])
+            self.entries[key] = ClassInfo(**entry)
+
+    def save(self, path: str) -> None:
+        """
+        Write the cache to disk, if it was modified since it was loaded.
+
+        :param path: The path to the cache file.
+        """
+
+        if not self.modified:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "version": DISCOVERY_CACHE_VERSION,
+                    "classes": {
+                        key: dataclasses.asdict(info)
+                        for key, info in self.entries.items()
+                    },
+                },
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+        self.modified = False
+
+
+CACHE = DiscoveryCache()
+
+
+def get_base_name(base: ast.expr) -> Optional[str]:
+    """
+    Get the unqualified name of a base class expression, e.g. `BADKitOperator` for `wrappers.BADKitOperator`.
+
+    :param base: The base class expression.
+    """
+
+    if isinstance(base, ast.Name):
+        return base.id
+    if isinstance(base, ast.Attribute):
+        return base.attr
+    return None
+
+
+def get_class_attrs(cls: ast.ClassDef) -> dict[str, Any]:
+    """
+    Get the `bl_*` and `menu_target` attributes, the annotated property names and the method names declared in a class body.
+    Attributes that aren't literals are listed in `dynamic` instead, except `menu_target` which is kept as source text.
+
+    :param cls: The class definition to inspect.
+    """
+
+    attrs: dict[str, Any] = {"props": (), "methods": (), "dynamic": ()}
+    targets: list[ast.expr]
+    value: Optional[ast.expr]
+    for statement in cls.body:
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            attrs["methods"] = (*attrs["methods"], statement.name)
+            continue
+        if isinstance(statement, ast.AnnAssign) and isinstance(
+            statement.target, ast.Name
+        ):
+            targets, value = [statement.target], statement.value
+            if statement.target.id not in BL_ATTRS:
+                attrs["props"] = (*attrs["props"], statement.target.id)
+        elif isinstance(statement, ast.Assign):
+            targets, value = statement.targets, statement.value
+        else:
+            continue
+
+        for target in targets:
+            if not isinstance(target, ast.Name) or value is None:
+                continue
+            if target.id == "menu_target":
+                attrs["menu_target"] = (
+                    None
+                    if isinstance(value, ast.Constant) and value.value is None
+                    else ast.unparse(value)
+                )
+            elif target.id in BL_ATTRS:
+                try:
+                    literal = ast.literal_eval(value)
+                except ValueError:
+                    attrs["dynamic"] = (*attrs["dynamic"], target.id)
+                    continue
+                attrs[target.id] = (
+                    tuple(sorted(literal))
+                    if isinstance(literal, (set, frozenset))
+                    else literal
+                )
+    return attrs
+
+
+def find_subclass(
+    source: Union[str, bytes],
+    module: str,
+    super_name: str,
+    filename: str = "<unknown>",
+) -> Optional[ClassInfo]:
+    """
+    Statically find a subclass of `super_name` in some Python source. Subclasses of other matching classes in the same source are matched too, inheriting their attributes,
+    and the most derived match is returned.
+
+    :param source: The Python source to search, as text or as the raw bytes of the source file.
+    :param module: The dotted name of the module the source belongs to.
+    :param super_name: The unqualified name of the base class to search for.
+    :param filename: The name of the source file, used in syntax errors.
+    """
+
+    matches: dict[str, dict[str, Any]] = {}
+    bases: set[str] = set()
+    for node in ast.parse(source, filename=filename).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for base in map(get_base_name, node.bases):
+            if base == super_name or base in matches:
+                attrs = dict(matches.get(base, {}))
+                own = get_class_attrs(node)
+                own["props"] = (*attrs.get("props", ()), *own["props"])
+                own["methods"] = (*attrs.get("methods", ()), *own["methods"])
+                # Attributes the subclass sets override whether the base's were literals
+                own["dynamic"] = (
+                    *(attr for attr in attrs.get("dynamic", ()) if attr not in own),
+                    *own["dynamic"],
+                )
+                for attr in own["dynamic"]:
+                    attrs.pop(attr, None)
+                attrs.update(own)
+                matches[node.name] = attrs
+                bases.add(base)
+                break
+
+    for name, attrs in matches.items():
+        if name not in bases:
+            return ClassInfo(module, name, **attrs)
+    return None
+
+
+def discover_class(
+    package: str, module: str, super_name: str, src_dir: str
+) -> ClassInfo:
+    """
+    Find a subclass of `super_name` in the module `package.module` without importing it.
+    Results are cached against the hash of the module's source.
+
+    :param package: The package containing the module.
+    :param module: The name of the module.
+    :param super_name: The unqualified name of the base class to search for.
+    :param src_dir: The source directory containing the package.
+    :raises FileNotFoundError: if the module doesn't exist.
+    :raises ImportError: if the module doesn't define a subclass of `super_name`.
+    """
+
+    with timings.TRACER.span(f"discover {package}.{module}", "discover classes"):
+        mod_path = os.path.abspath(os.path.join(src_dir, package, module + ".py"))
+        if not os.path.exists(mod_path):
+            CACHE.sources[mod_path] = None
+            raise FileNotFoundError(
+                f"Failed to locate {package}.{module} at {mod_path}"
+            )
+        with open(mod_path, "rb") as mod_file:
+            source = mod_file.read()
+
+        source_hash = manifest.hash_bytes(source)
+        CACHE.sources[mod_path] = source_hash
+        key = f"{package}.{module}:{super_name}:{source_hash}"
+        info = CACHE.entries.get(key)
+        if not info:
+            info = find_subclass(source, f"{package}.{module}", super_name, mod_path)
+            if not info:
+                raise ImportError(
+                    f"Failed to locate a subclass of {super_name} in {package}.{module} at {mod_path}"
+                )
+            CACHE.entries[key] = info
+            CACHE.modified = True
+        return info
@@ -1,6 +1,7 @@
+# The runtime half of a bundle's __init__.py. The generated half (bl_info, imports of the addon's classes and the
+# CLASSES and BLEND registration tables) is written above this file's contents at build time, see `codegen.py`.
 import os
-from typing import Any, Callable, Type
-import pickle
+from typing import Callable, Type
 
 import bpy
 from bpy.props import PointerProperty
@@ -8,15 +9,9 @@ from bpy.types import Context, Menu, PropertyGroup, Scene
 
 from badkit.wrappers import registerable
 
-
-def unpickle(filename: str) -> Any:
-    pkl = None
-    with open(f"{filename}.pkl") as file:
-        pkl = pickle.loads(file.read())
-    return pkl
-
-
-CLASSES: tuple[Type[registerable.Registerable]] = unpickle("classes")
+CLASSES: tuple[Type[registerable.Registerable], ...]
+# Blend libraries and the (directory, object name) pairs to append from each of them
+BLEND: tuple[tuple[str, tuple[tuple[str, str], ...]], ...]
 # dictionary of operators to their draw functions
 menu_funcs: dict[Type[registerable.Registerable], Callable[[Menu, Context], None]] = {}
 
@@ -24,10 +19,9 @@ menu_funcs: dict[Type[registerable.Registerable], Callable[[Menu, Context], None
 def register():
     "Register classes and append them to their associated menus."
 
-    for blend in unpickle("blend"):
-        for group in blend.node_groups:
-            blend_file_path = os.path.join("blend", blend.name)
-            # TODO: add the object_name
+    for blend_name, node_groups in BLEND:
+        for group, object_name in node_groups:
+            blend_file_path = os.path.join(os.path.dirname(__file__), "blend", blend_name)
             bpy.ops.wm.append(
                 filepath=os.path.join(blend_file_path, group, object_name),
                 directory=os.path.join(blend_file_path, group),
@@ -59,6 +53,3 @@ def unregister():
             cls.menu_target.remove(menu_funcs[cls])
         print(f"[[CBP]] - Unregistered: {cls}")
 
-
-if __name__ == "__main__":
-    register()
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+from typing import Iterable, Optional
+
+from .bundle import Member
+
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data: bytes) -> str:
+    """Get the hex SHA-256 digest of some bytes."""
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Get the hex SHA-256 digest of a file, reading it in chunks so large `.blend` files aren't loaded into memory at once.
+
+    :param path: The path to the file.
+    :param chunk_size: The number of bytes to read at a time.
+    """
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """A record of the content of each member of a built bundle, stored alongside the bundle to allow incremental builds."""
+
+    def __init__(
+        self,
+        entries: Optional[dict[str, dict[str, object]]] = None,
+        settings: Optional[dict[str, object]] = None,
+    ) -> None:
+        """
+        Construct a Manifest object.
+
+        :param entries: The size, modification time and hash of each member, keyed by archive name.
+        :param settings: The build settings that affect how members are stored. Members are never reused across builds with different settings.
+        """
+
+        self.entries = entries if entries is not None else {}
+        self.settings = settings if settings is not None else {}
+
+    @staticmethod
+    def get_path(build_path: str) -> str:
+        """
+        Get the path of the manifest stored alongside a bundle.
+
+        :param build_path: The path to the bundle.
+        """
+
+        return f"{os.path.splitext(build_path)[0]}.manifest.json"
+
+    @classmethod
+    def load(cls, path: str) -> "Manifest":
+        """
+        Load a manifest from disk. An empty manifest is returned if the file is missing, unreadable or from another version of BADKit.
+
+        :param path: The path to the manifest file.
+        """
+
+        try:
+            with open(path, "r") as file:
+                contents = json.load(file)
+        except (OSError, ValueError):
+            return cls()
+        if contents.get("version") != MANIFEST_VERSION:
+            return cls()
+        return cls(contents.get("members", {}), contents.get("settings", {}))
+
+    @classmethod
+    def from_members(
+        cls,
+        members: Iterable[Member],
+        previous: Optional["Manifest"] = None,
+        settings: Optional[dict[str, object]] = None,
+    ) -> "Manifest":
+        """
+        Build a manifest describing a set of members. Files whose size and modification time match `previous` aren't hashed again.
+
+        :param members: The members to describe.
+        :param previous: The manifest of the last build, if there is one.
+        :param settings: The build settings that affect how members are stored.
+        """
+
+        previous = previous or cls()
+        entries: dict[str, dict[str, object]] = {}
+        for member in members:
+            if member.path is None:
+                data = member.read()
+                entries[member.arcname] = {
+                    "size": len(data),
+                    "mtime_ns": None,
+                    "sha256": hash_bytes(data),
+                }
+                continue
+
+            stat = os.stat(member.path)
+            entry: dict[str, object] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+            old = previous.entries.get(member.arcname)
+            if old and all(old.get(key) == value for key, value in entry.items()):
+                entry["sha256"] = old["sha256"]
+            else:
+                entry["sha256"] = hash_file(member.path)
+            entries[member.arcname] = entry
+        return cls(entries, settings)
+
+    def save(self, path: str) -> None:
+        """
+        Write the manifest to disk.
+
+        :param path: The path to write the manifest to.
+        """
+
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "settings": self.settings,
+                    "members": self.entries,
+                },
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+
+    def get_unchanged(self, previous: "Manifest") -> set[str]:
+        """
+        Get the names of members whose content is identical in both manifests.
+
+        :param previous: The manifest to compare against.
+        """
+
+        if self.settings != previous.settings:
+            return set()
+        return {
+            arcname
+            for arcname, entry in self.entries.items()
+            if arcname in previous.entries
+            and previous.entries[arcname]["sha256"] == entry["sha256"]
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Manifest):
+            return NotImplemented
+        return self.settings == other.settings and {
+            name: entry["sha256"] for name, entry in self.entries.items()
+        } == {name: entry["sha256"] for name, entry in other.entries.items()}
+
+    def get_key(self) -> str:
+        """Get a hash of the contents and settings of the manifest, identifying the bundle built from it in an artifact store."""
+
+        return hash_bytes(
+            json.dumps(
+                {
+                    "version": MANIFEST_VERSION,
+                    "members": {
+                        name: entry["sha256"] for name, entry in self.entries.items()
+                    },
+                    "settings": self.settings,
+                },
+                sort_keys=True,
+            ).encode()
+        )
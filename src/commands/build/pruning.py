@@ -0,0 +1,186 @@
+import fnmatch
+import os
+import re
+from typing import Iterable, Optional
+
+from . import descriptors, treeshake
+from .bundle import Member
+from .vendoring import NATIVE_SUFFIXES, VENDOR
+
+# Rules applied to vendored files not matched by any rule in addon.yaml
+DEFAULT_RULES = (
+    # Bytecode caches, which Blender would rebuild anyway
+    descriptors.Prune("*.pyc", "exclude"),
+    descriptors.Prune("*.pyo", "exclude"),
+    # Type stubs
+    descriptors.Prune("*.pyi", "exclude"),
+    descriptors.Prune("*/py.typed", "exclude"),
+    # Installation metadata, which the vendor import finder doesn't expose
+    descriptors.Prune("*.dist-info/*", "exclude"),
+    descriptors.Prune("*.egg-info/*", "exclude"),
+    # Test suites and documentation
+    descriptors.Prune("*/tests/*", "exclude"),
+    descriptors.Prune("*/test/*", "exclude"),
+    descriptors.Prune("*/docs/*", "exclude"),
+    # Sources, headers and debug symbols of extension modules, which are only needed to build them
+    *(
+        descriptors.Prune(f"*{ext}", "exclude")
+        for ext in (".c", ".cpp", ".h", ".hpp", ".pyx", ".pxd", ".pxi")
+    ),
+    *(descriptors.Prune(f"*{ext}", "exclude") for ext in (".a", ".lib", ".pdb")),
+)
+# Matches the CPython version tag of an extension module, e.g. `cpython-310` in `_core.cpython-310-x86_64-linux-gnu.so`
+CPYTHON_TAG = re.compile(r"\.cpython-(?P<major>\d)(?P<minor>\d+)[-.]")
+
+
+def get_module_name(arcname: str) -> Optional[str]:
+    """
+    Get the dotted name of a vendored module, relative to the vendor directory.
+
+    :param arcname: The name of the member in the bundle, under `vendor/`.
+    :returns: the module name, or `None` if the member is neither a Python module nor an extension module.
+    """
+
+    rel_name = arcname[len(VENDOR) + 1 :]
+    if not rel_name.endswith(NATIVE_SUFFIXES):
+        return treeshake.get_module_name(rel_name) or None
+    *parents, file = rel_name.split("/")
+    # e.g. _core.cpython-310-x86_64-linux-gnu.so and _core.pyd are both _core
+    return ".".join((*parents, file.split(".")[0]))
+
+
+class Pruner:
+    """A callable choosing whether each vendored file is bundled from a list of rules, where the first matching rule wins."""
+
+    def __init__(
+        self,
+        rules: Iterable[descriptors.Prune] = (),
+        python_version: Optional[tuple[int, int]] = None,
+    ) -> None:
+        """
+        Construct a Pruner object.
+
+        :param rules: The rules from addon.yaml, which take precedence over `DEFAULT_RULES`.
+        :param python_version: The Python version the addon runs on. Extension modules built for another version of CPython are pruned unless a rule includes them.
+        """
+
+        self.rules = (*rules, *DEFAULT_RULES)
+        self.python_version = python_version
+
+    def __call__(self, member: Member) -> bool:
+        """
+        Choose whether to bundle a vendored file.
+
+        :param member: The vendored file.
+        :returns: whether the file should be bundled.
+        """
+
+        for rule in self.rules:
+            if fnmatch.fnmatchcase(member.arcname, rule.pattern):
+                return rule.action == "include"
+        match = CPYTHON_TAG.search(member.arcname)
+        if match and self.python_version:
+            return (int(match["major"]), int(match["minor"])) == self.python_version
+        return True
+
+
+def find_used_modules(
+    roots: Iterable[Member], vendor_members: Iterable[Member]
+) -> tuple[set[str], set[str]]:
+    """
+    Find the vendored modules that can be reached by following imports from the addon's modules.
+    Imports are followed statically, so modules that are only imported dynamically (e.g. with `importlib` or a module `__getattr__`) aren't found.
+
+    :param roots: The addon's own members, whose imports are followed.
+    :param vendor_members: The vendored files, under `vendor/`.
+    :returns: the dotted names of the vendored modules reached, relative to the vendor directory, and the top level packages with a reached module that couldn't be parsed, which must be kept whole.
+    """
+
+    # Vendored modules by name, with None for extension modules, whose imports can't be followed
+    modules: dict[str, Optional[Member]] = {}
+    for member in vendor_members:
+        name = get_module_name(member.arcname)
+        if name and (name not in modules or member.arcname.endswith(".py")):
+            modules[name] = member if member.arcname.endswith(".py") else None
+
+    queue: list[str] = []
+    for member in roots:
+        name = treeshake.get_module_name(member.arcname)
+        if name is None:
+            continue
+        try:
+            queue.extend(
+                treeshake.get_imports(
+                    member.read(),
+                    name,
+                    member.arcname.endswith("/__init__.py") or name == "",
+                )
+            )
+        except SyntaxError:
+            pass
+
+    reached: set[str] = set()
+    unparsed: set[str] = set()
+    while queue:
+        imported = queue.pop()
+        # Importing a module executes its parent packages too
+        parts = imported.split(".")
+        for name in (".".join(parts[:i]) for i in range(1, len(parts) + 1)):
+            if name in reached or name not in modules:
+                continue
+            reached.add(name)
+            module = modules[name]
+            if module is None:
+                continue
+            try:
+                queue.extend(
+                    treeshake.get_imports(
+                        module.read(), name, module.arcname.endswith("/__init__.py")
+                    )
+                )
+            except SyntaxError:
+                # e.g. syntax newer than the running interpreter
+                unparsed.add(name.split(".")[0])
+    return reached, unparsed
+
+
+def prune(
+    vendor_members: Iterable[Member],
+    pruner: Pruner,
+    roots: Optional[Iterable[Member]] = None,
+) -> tuple[list[Member], list[Member]]:
+    """
+    Drop the vendored files that the addon doesn't need at runtime.
+
+    :param vendor_members: The vendored files, under `vendor/`.
+    :param pruner: Chooses which files are bundled.
+    :param roots: The addon's own members. If given, vendored modules that can't be reached by following imports from them are dropped too, along with the data files of top level packages none of whose modules are reached.
+    :returns: the members to keep and the members that were dropped.
+    """
+
+    kept: list[Member] = []
+    dropped: list[Member] = []
+    for member in vendor_members:
+        (kept if pruner(member) else dropped).append(member)
+    if roots is None:
+        return kept, dropped
+
+    reached, unparsed = find_used_modules(roots, kept)
+    used_packages = {name.split(".")[0] for name in reached}
+    names = {member.arcname: get_module_name(member.arcname) for member in kept}
+    packages = {name.split(".")[0] for name in names.values() if name}
+    used = []
+    for member in kept:
+        name = names[member.arcname]
+        # e.g. numpy for vendor/numpy/core/_multiarray_umath.so, six for vendor/six.py
+        package = member.arcname.split("/")[1].split(".")[0]
+        if package in unparsed:
+            used.append(member)
+        elif name is not None:
+            (used if name in reached else dropped).append(member)
+        elif package in packages and package not in used_packages:
+            # The data files of a package that is never imported
+            dropped.append(member)
+        else:
+            used.append(member)
+    return used, dropped
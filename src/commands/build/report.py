@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import posixpath
+import zipfile
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+# The parts of a bundle reported separately, by the prefix of their members' names. Other members are the addon's own sources.
+GROUPS = (
+    ("src/blend", "blend/"),
+    ("badkit/utils", "badkit/utils/"),
+    ("badkit/wrappers", "badkit/wrappers/"),
+    ("vendor", "vendor/"),
+)
+SOURCES_GROUP = "src"
+
+
+@dataclass
+class Sizes:
+    """The total raw and compressed size of some bundle members."""
+
+    raw: int = 0
+    compressed: int = 0
+    count: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """The compressed size as a fraction of the raw size."""
+
+        return self.compressed / self.raw if self.raw else 1.0
+
+    def add(self, info: zipfile.ZipInfo) -> None:
+        """
+        Add a member to the totals.
+
+        :param info: The header of the member.
+        """
+
+        self.raw += info.file_size
+        self.compressed += info.compress_size
+        self.count += 1
+
+    def to_dict(self) -> dict[str, object]:
+        """Get the sizes in a form that can be serialized to JSON."""
+
+        return {
+            "raw": self.raw,
+            "compressed": self.compressed,
+            "ratio": round(self.ratio, 4),
+            "count": self.count,
+        }
+
+
+@dataclass
+class Report:
+    """A breakdown of the size and composition of a built bundle."""
+
+    path: str
+    total: Sizes = field(default_factory=Sizes)
+    groups: dict[str, Sizes] = field(default_factory=dict)
+    directories: dict[str, Sizes] = field(default_factory=dict)
+    members: list[zipfile.ZipInfo] = field(default_factory=list)
+    # Sets of members with identical contents, largest first
+    duplicates: list[list[zipfile.ZipInfo]] = field(default_factory=list)
+
+    def get_largest(self, count: int) -> list[zipfile.ZipInfo]:
+        """
+        Get the members taking up the most space in the bundle.
+
+        :param count: The number of members to get.
+        """
+
+        return sorted(self.members, key=lambda info: info.compress_size, reverse=True)[
+            :count
+        ]
+
+    def get_wasted(self) -> int:
+        """Get the number of compressed bytes taken up by every copy of a duplicated member but the first."""
+
+        return sum(
+            sum(info.compress_size for info in infos[1:]) for infos in self.duplicates
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        """Get the report in a form that can be serialized to JSON."""
+
+        return {
+            "path": self.path,
+            "total": self.total.to_dict(),
+            "groups": {name: sizes.to_dict() for name, sizes in self.groups.items()},
+            "directories": {
+                name: sizes.to_dict() for name, sizes in self.directories.items()
+            },
+            "members": [
+                {
+                    "name": info.filename,
+                    "raw": info.file_size,
+                    "compressed": info.compress_size,
+                    "ratio": round(info.compress_size / info.file_size, 4)
+                    if info.file_size
+                    else 1.0,
+                }
+                for info in self.members
+            ],
+            "duplicates": [
+                [info.filename for info in infos] for infos in self.duplicates
+            ],
+            "wasted": self.get_wasted(),
+        }
+
+    def save(self, path: str) -> None:
+        """
+        Write the report to disk as JSON.
+
+        :param path: The path to write the report to.
+        """
+
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    @staticmethod
+    def get_path(build_path: str) -> str:
+        """
+        Get the path of the JSON report stored alongside a bundle.
+
+        :param build_path: The path to the bundle.
+        """
+
+        return f"{os.path.splitext(build_path)[0]}.report.json"
+
+
+def get_group(arcname: str) -> str:
+    """
+    Get the name of the part of a bundle a member belongs to.
+
+    :param arcname: The name of the member in the bundle.
+    """
+
+    for name, prefix in GROUPS:
+        if arcname.startswith(prefix):
+            return name
+    return SOURCES_GROUP
+
+
+def find_duplicates(bundle: zipfile.ZipFile) -> list[list[zipfile.ZipInfo]]:
+    """
+    Find the members of an archive with identical contents.
+    Only members with the same size and CRC are read and hashed, so this is cheap when there are few duplicates.
+
+    :param bundle: The archive to search.
+    :returns: each set of duplicated members, largest first.
+    """
+
+    candidates: dict[tuple[int, int], list[zipfile.ZipInfo]] = defaultdict(list)
+    for info in bundle.infolist():
+        if info.file_size:
+            candidates[info.file_size, info.CRC].append(info)
+
+    duplicates: list[list[zipfile.ZipInfo]] = []
+    for infos in candidates.values():
+        if len(infos) < 2:
+            continue
+        by_hash: dict[str, list[zipfile.ZipInfo]] = defaultdict(list)
+        for info in infos:
+            by_hash[hashlib.sha256(bundle.read(info)).hexdigest()].append(info)
+        duplicates.extend(infos for infos in by_hash.values() if len(infos) > 1)
+    return sorted(
+        duplicates, key=lambda infos: infos[0].compress_size * len(infos), reverse=True
+    )
+
+
+def create_report(build_path: str) -> Report:
+    """
+    Create a report on a built bundle.
+
+    :param build_path: The path to the bundle.
+    """
+
+    report = Report(build_path)
+    report.groups = {name: Sizes() for name, _ in (*GROUPS, (SOURCES_GROUP, None))}
+    directories: dict[str, Sizes] = defaultdict(Sizes)
+    with zipfile.ZipFile(build_path) as bundle:
+        for info in bundle.infolist():
+            if info.is_dir():
+                continue
+            report.members.append(info)
+            report.total.add(info)
+            report.groups[get_group(info.filename)].add(info)
+            # Every directory's totals include its subdirectories
+            directory = posixpath.dirname(info.filename)
+            while directory:
+                directories[directory].add(info)
+                directory = posixpath.dirname(directory)
+        report.duplicates = find_duplicates(bundle)
+    report.directories = dict(sorted(directories.items()))
+    return report
+
+
+def format_size(size: float) -> str:
+    """Format a number of bytes in the largest unit it has at least one of."""
+
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def format_text(report: Report, largest: int = 10, depth: Optional[int] = 2) -> str:
+    """
+    Format a report as a human readable table.
+
+    :param report: The report to format.
+    :param largest: The number of the largest members to list.
+    :param depth: The deepest level of directories to list, or `None` to list every directory.
+    """
+
+    width = max((len(info.filename) for info in report.members), default=0)
+    width = max(width, *(len(name) for name in report.groups), len("total"))
+
+    def row(name: str, raw: int, compressed: int) -> str:
+        ratio = compressed / raw if raw else 1.0
+        return f"{name:<{width}}{format_size(raw):>12}{format_size(compressed):>12}{ratio:>8.1%}"
+
+    header = f"{'':<{width}}{'raw':>12}{'compressed':>12}{'ratio':>8}"
+    lines = [f'Bundle report for "{report.path}"', "", header]
+    lines.extend(
+        row(name, sizes.raw, sizes.compressed)
+        for name, sizes in report.groups.items()
+        if sizes.count
+    )
+    lines.append(row("total", report.total.raw, report.total.compressed))
+
+    lines += ["", "Directories:"]
+    lines.extend(
+        row(name, sizes.raw, sizes.compressed)
+        for name, sizes in report.directories.items()
+        if depth is None or name.count("/") < depth
+    )
+
+    lines += ["", "Largest members:"]
+    lines.extend(
+        row(info.filename, info.file_size, info.compress_size)
+        for info in report.get_largest(largest)
+    )
+
+    if report.duplicates:
+        lines += [
+            "",
+            f"Duplicated members ({format_size(report.get_wasted())} compressed could be saved):",
+        ]
+        for infos in report.duplicates:
+            lines.append(
+                f"{format_size(infos[0].file_size)} x{len(infos)}: "
+                + ", ".join(info.filename for info in infos)
+            )
+    return "\n".join(lines)
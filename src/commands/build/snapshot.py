@@ -0,0 +1,76 @@
+import os
+import pickle
+from typing import Optional
+
+from . import descriptors, manifest
+
+SNAPSHOT_VERSION = 6
+
+
+def get_source_hashes(sources: dict[str, Optional[str]]) -> dict[str, Optional[str]]:
+    """
+    Hash the current contents of a set of source files.
+
+    :param sources: The paths of the source files.
+    :returns: the hash of each file, or None for files that don't exist.
+    """
+
+    return {
+        path: manifest.hash_file(path) if os.path.exists(path) else None
+        for path in sources
+    }
+
+
+def load(
+    path: str, addon_path: str
+) -> Optional[tuple[descriptors.Addon, dict[str, Optional[str]]]]:
+    """
+    Load a resolved addon descriptor from a snapshot, if the addon file and every source file it was resolved from are unchanged.
+
+    :param path: The path to the snapshot.
+    :param addon_path: The path to the addon file.
+    :returns: the addon descriptor and the hashes of the sources it was resolved from, or `None` if there is no valid snapshot.
+    """
+
+    try:
+        with open(path, "rb") as file:
+            contents = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if (
+        not isinstance(contents, dict)
+        or contents.get("version") != SNAPSHOT_VERSION
+        or contents.get("addon_hash") != manifest.hash_file(addon_path)
+        or contents.get("sources") != get_source_hashes(contents.get("sources", {}))
+    ):
+        return None
+    return contents["addon"], contents["sources"]
+
+
+def save(
+    path: str,
+    addon_path: str,
+    sources: dict[str, Optional[str]],
+    addon: descriptors.Addon,
+) -> None:
+    """
+    Save a resolved addon descriptor as a snapshot.
+
+    :param path: The path to write the snapshot to.
+    :param addon_path: The path to the addon file the descriptor was loaded from.
+    :param sources: The hash of every source file the descriptor was resolved from, or None for files that were looked up but didn't exist.
+    :param addon: The addon descriptor.
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        pickle.dump(
+            {
+                "version": SNAPSHOT_VERSION,
+                "addon_hash": manifest.hash_file(addon_path),
+                "sources": sources,
+                "addon": addon,
+            },
+            file,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
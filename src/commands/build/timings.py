@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class Tracer:
+    """
+    A recorder of how long each phase of a build takes, which can be summarized or saved in the Chrome trace event format (viewable in `chrome://tracing` or Perfetto).
+    Spans are only recorded while the tracer is enabled, so instrumented code costs next to nothing otherwise. Spans can be recorded from any thread.
+    """
+
+    def __init__(self) -> None:
+        """Construct a Tracer object."""
+
+        self.enabled = False
+        self.origin = time.perf_counter()
+        # Tuples of (name, category, start, duration, thread id, args), with times in seconds since `origin`
+        self.events: list[tuple[str, str, float, float, int, dict[str, object]]] = []
+
+    def enable(self) -> None:
+        """Start recording spans, discarding any recorded before."""
+
+        self.enabled = True
+        self.origin = time.perf_counter()
+        self.events.clear()
+
+    def disable(self) -> None:
+        """Stop recording spans."""
+
+        self.enabled = False
+
+    @contextmanager
+    def span(
+        self, name: str, category: Optional[str] = None, **args: object
+    ) -> Iterator[None]:
+        """
+        Record how long a block takes, as a context manager.
+
+        :param name: The name of the span, e.g. `"compress blend/lib.blend"`.
+        :param category: The phase the span belongs to, under which it is summarized, e.g. `"compress"`. Defaults to the name.
+        :param args: Details to attach to the span in the trace.
+        """
+
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # list.append is atomic, so worker threads can record spans without a lock
+            self.events.append(
+                (
+                    name,
+                    category or name,
+                    start - self.origin,
+                    time.perf_counter() - start,
+                    threading.get_ident(),
+                    args,
+                )
+            )
+
+    def summarize(self) -> list[tuple[str, int, float]]:
+        """
+        Total up the recorded spans by category, in the order each category was first entered.
+        Spans recorded concurrently by different threads are summed, so a category's total can exceed the wall-clock time it took.
+
+        :returns: the category, number of spans and total seconds of each category.
+        """
+
+        totals: dict[str, tuple[float, int, float]] = {}
+        for _, category, start, duration, _, _ in self.events:
+            first, count, total = totals.get(category, (start, 0, 0.0))
+            totals[category] = (min(first, start), count + 1, total + duration)
+        return [
+            (category, count, total)
+            for category, (_, count, total) in sorted(
+                totals.items(), key=lambda item: item[1][0]
+            )
+        ]
+
+    def save(self, path: str) -> None:
+        """
+        Write the recorded spans to disk in the Chrome trace event format.
+
+        :param path: The path to write the trace to.
+        """
+
+        pid = os.getpid()
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "traceEvents": [
+                        {
+                            "name": name,
+                            "cat": category,
+                            "ph": "X",
+                            "ts": round(start * 1e6, 3),
+                            "dur": round(duration * 1e6, 3),
+                            "pid": pid,
+                            "tid": tid,
+                            "args": args,
+                        }
+                        for name, category, start, duration, tid, args in self.events
+                    ],
+                    "displayTimeUnit": "ms",
+                },
+                file,
+            )
+
+
+# The tracer shared by every phase of the build
+TRACER = Tracer()
@@ -0,0 +1,96 @@
+import ast
+from typing import Iterable, Optional
+
+from .bundle import Member
+
+
+def get_module_name(arcname: str) -> Optional[str]:
+    """
+    Get the dotted name of a module in a bundle, relative to the addon's package. The addon's own `__init__.py` is named `""`.
+
+    :param arcname: The name of the member in the bundle.
+    :returns: the module name, or `None` if the member isn't a Python module.
+    """
+
+    if not arcname.endswith(".py"):
+        return None
+    parts = arcname[:-3].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def get_imports(source: bytes, module: str, is_package: bool) -> set[str]:
+    """
+    Get the names of every module that some Python source might import, resolving relative imports.
+    Names imported from a module are included too, since they may be submodules.
+
+    :param source: The Python source.
+    :param module: The dotted name of the module the source belongs to.
+    :param is_package: Whether the module is a package's `__init__.py`.
+    """
+
+    package = module if is_package else module.rpartition(".")[0]
+    imports: set[str] = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package.split(".") if package else []
+                anchor = parts[: len(parts) - node.level + 1]
+                base = ".".join(part for part in (*anchor, base) if part)
+            imports.add(base)
+            imports.update(
+                f"{base}.{alias.name}" if base else alias.name for alias in node.names
+            )
+    return imports
+
+
+def shake(
+    members: Iterable[Member], prefix: str = "badkit"
+) -> tuple[list[Member], list[Member]]:
+    """
+    Drop the modules under `prefix` that can't be reached by following imports from the rest of the bundle's modules.
+    Imports are followed statically, so modules that are only imported dynamically (e.g. with `importlib`) must not live under `prefix`.
+
+    :param members: The members of the bundle.
+    :param prefix: The top level directory of the modules to consider dropping.
+    :returns: the members to keep and the members that were dropped.
+    """
+
+    members = list(members)
+    modules = {
+        name: member
+        for member in members
+        if (name := get_module_name(member.arcname)) is not None
+    }
+
+    reached: set[str] = set()
+    queue = [name for name in modules if name.split(".")[0] != prefix]
+    while queue:
+        name = queue.pop()
+        if name in reached:
+            continue
+        reached.add(name)
+        member = modules[name]
+        for imported in get_imports(
+            member.read(), name, member.arcname.endswith("/__init__.py") or name == ""
+        ):
+            # Importing a module executes its parent packages too
+            parts = imported.split(".")
+            queue.extend(
+                parent
+                for parent in (".".join(parts[:i]) for i in range(1, len(parts) + 1))
+                if parent in modules and parent not in reached
+            )
+
+    kept, dropped = [], []
+    for member in members:
+        name = get_module_name(member.arcname)
+        if name is not None and name.split(".")[0] == prefix and name not in reached:
+            dropped.append(member)
+        else:
+            kept.append(member)
+    return kept, dropped
@@ -0,0 +1,141 @@
+import io
+import json
+import os
+import zipfile
+from typing import Optional
+
+from ...utils import vendor_utils
+from .bundle import Member, collect_members, get_date_time
+
+# The directory of vendored packages, in both the sources and the bundle
+VENDOR = "vendor"
+# Suffixes of files that can't be imported from an archive
+NATIVE_SUFFIXES = (".so", ".pyd", ".dylib", ".dll")
+# Suffixes of top level directories that hold metadata rather than modules
+METADATA_SUFFIXES = (".dist-info", ".egg-info", ".data")
+
+
+def get_module_name(path: str) -> Optional[str]:
+    """
+    Get the name of the top level module a top level entry of the vendor directory provides.
+
+    :param path: The path to the entry.
+    :returns: the module name, or `None` if the entry isn't a module, e.g. metadata or data files.
+    """
+
+    name = os.path.basename(path)
+    if name.startswith((".", "__")) or name.endswith(METADATA_SUFFIXES):
+        return None
+    if os.path.isdir(path):
+        module = name
+    elif name.endswith(".py"):
+        module = name[:-3]
+    elif name.endswith(NATIVE_SUFFIXES):
+        # e.g. _cffi_backend.cpython-310-x86_64-linux-gnu.so
+        module = name.split(".")[0]
+    else:
+        return None
+    return module if module.isidentifier() else None
+
+
+def create_archive(members: list[Member]) -> bytes:
+    """
+    Create a reproducible zip archive of some members, to be imported from with `zipimport`.
+
+    :param members: The members to archive, named relative to the archive's root.
+    """
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for member in sorted(members, key=lambda member: member.arcname):
+            info = zipfile.ZipInfo(member.arcname, date_time=get_date_time())
+            info.create_system = 3
+            info.external_attr = 0o644 << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, member.read())
+    return buffer.getvalue()
+
+
+def collect_vendor_files(vendor_dir: str) -> list[Member]:
+    """
+    Collect every file of the vendor tree as bundle members.
+
+    :param vendor_dir: The flat vendor tree created by `badkit install`.
+    :returns: the members, under `vendor/`.
+    """
+
+    return collect_members(vendor_dir, VENDOR)
+
+
+def collect_vendor_members(
+    vendor_dir: str, files: Optional[list[Member]] = None, archive: bool = False
+) -> list[Member]:
+    """
+    Collect the vendored packages of an addon, along with an index of the location of each top level module, so the addon can import them without searching `sys.path`.
+
+    :param vendor_dir: The flat vendor tree created by `badkit install`.
+    :param files: The vendored files to bundle, e.g. once pruned. Defaults to every file in the vendor tree.
+    :param archive: Pack the pure Python modules into a single archive in the bundle, imported from with `zipimport`. Modules that read their own files through `__file__` won't work from an archive.
+    :returns: the members, under `vendor/`.
+    """
+
+    # The files of each top level entry of the vendor tree, by the entry's name
+    entries: dict[str, list[Member]] = {}
+    for member in collect_vendor_files(vendor_dir) if files is None else files:
+        entries.setdefault(member.arcname.split("/")[1], []).append(member)
+
+    members = []
+    archived: list[Member] = []
+    index: dict[str, dict[str, object]] = {}
+    for name, entry_members in sorted(entries.items()):
+        path = os.path.join(vendor_dir, name)
+        module = get_module_name(path)
+        if not any(
+            member.arcname.endswith((".py", *NATIVE_SUFFIXES))
+            for member in entry_members
+        ):
+            # Data files, which aren't importable
+            module = None
+        if module is None:
+            members.extend(entry_members)
+            continue
+
+        is_package = os.path.isdir(path)
+        if is_package and any(
+            member.arcname == f"{VENDOR}/{name}/__init__.py" for member in entry_members
+        ):
+            location = f"{name}/__init__.py"
+        else:
+            location = name
+        # Extension modules can't be imported from an archive, and zipimport doesn't support namespace packages
+        archivable = (
+            archive
+            and location.endswith(".py")
+            and not any(
+                member.arcname.endswith(NATIVE_SUFFIXES) for member in entry_members
+            )
+        )
+        index[module] = {
+            "path": location,
+            "package": is_package,
+            "archived": archivable,
+        }
+        if archivable:
+            archived.extend(
+                Member(member.arcname[len(VENDOR) + 1 :], member.path, member.data)
+                for member in entry_members
+            )
+        else:
+            members.extend(entry_members)
+
+    if archived:
+        members.append(
+            Member(f"{VENDOR}/{vendor_utils.ARCHIVE}", data=create_archive(archived))
+        )
+    members.append(
+        Member(
+            f"{VENDOR}/{vendor_utils.INDEX}",
+            data=json.dumps(index, indent=2, sort_keys=True).encode(),
+        )
+    )
+    return members
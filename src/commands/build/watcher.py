@@ -0,0 +1,277 @@
+import abc
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Iterable, Optional
+
+IGNORED_DIRS = ("__pycache__",)
+IGNORED_SUFFIXES = (".pyc", ".pyo", ".swp", "~")
+
+
+def is_ignored(path: str) -> bool:
+    """
+    Check if a changed path should be ignored, such as bytecode caches and editor swap files.
+
+    :param path: The changed path.
+    """
+
+    return path.endswith(IGNORED_SUFFIXES) or any(
+        part in IGNORED_DIRS for part in path.split(os.path.sep)
+    )
+
+
+class Watcher(abc.ABC):
+    """A base class for objects that report changes to a set of files and directory trees."""
+
+    def __init__(self, paths: Iterable[str]) -> None:
+        """
+        Construct a Watcher object.
+
+        :param paths: The files and directories to watch. Directories are watched recursively.
+        """
+
+        self.paths = tuple(os.path.abspath(path) for path in paths)
+
+    @abc.abstractmethod
+    def poll(self, timeout: Optional[float] = None) -> set[str]:
+        """
+        Wait for changes to the watched paths.
+
+        :param timeout: The maximum number of seconds to wait for, or `None` to wait indefinitely.
+        :returns: the absolute paths that changed, or an empty set if the timeout expired.
+        """
+
+    def close(self) -> None:
+        """Release any resources held by the watcher."""
+
+        pass
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class PollingWatcher(Watcher):
+    """A portable watcher that detects changes by periodically comparing file modification times and sizes."""
+
+    def __init__(self, paths: Iterable[str], interval: float = 0.5) -> None:
+        """
+        Construct a PollingWatcher object.
+
+        :param paths: The files and directories to watch. Directories are watched recursively.
+        :param interval: The number of seconds to wait between scans.
+        """
+
+        super().__init__(paths)
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> dict[str, tuple[int, int]]:
+        """Get the modification time and size of every watched file."""
+
+        snapshot = {}
+        for path in self.paths:
+            files = (
+                (
+                    os.path.join(root, file)
+                    for root, _, files in os.walk(path)
+                    for file in files
+                )
+                if os.path.isdir(path)
+                else (path,)
+            )
+            for file in files:
+                try:
+                    stat = os.stat(file)
+                except OSError:
+                    continue
+                snapshot[file] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: Optional[float] = None) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+                and not is_ignored(path)
+            }
+            self.snapshot = snapshot
+            if changed:
+                return changed
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return set()
+            time.sleep(
+                self.interval if remaining is None else min(self.interval, remaining)
+            )
+
+
+class InotifyWatcher(Watcher):
+    """A watcher using the Linux inotify API, so changes are reported by the kernel instead of being scanned for."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ISDIR = 0x40000000
+    IN_CLOEXEC = 0o2000000
+    MASK = (
+        IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    )
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, paths: Iterable[str]) -> None:
+        """
+        Construct an InotifyWatcher object.
+
+        :param paths: The files and directories to watch. Directories are watched recursively.
+        :raises OSError: if inotify is unavailable.
+        """
+
+        super().__init__(paths)
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify is only available on Linux.")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "Failed to initialise inotify.")
+
+        # Map of watch descriptors to the directories they watch
+        self.dirs: dict[int, str] = {}
+        # Individual files are watched through their parent directory, so editors that save by replacing the file are handled
+        self.files: set[str] = set()
+        try:
+            for path in self.paths:
+                if os.path.isdir(path):
+                    self.add_tree(path)
+                else:
+                    self.files.add(path)
+                    self.add_dir(os.path.dirname(path))
+        except OSError:
+            # e.g. the user's inotify watch limit was reached. Closing the descriptor also removes the watches added so far
+            os.close(self.fd)
+            raise
+
+    def add_dir(self, path: str) -> None:
+        """
+        Watch a single directory for changes to its entries.
+
+        :param path: The directory to watch.
+        :raises OSError: if the directory can't be watched, e.g. when the user's inotify watch limit is reached.
+        """
+
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Failed to watch {path}.")
+        self.dirs[wd] = path
+
+    def add_tree(self, path: str) -> None:
+        """
+        Watch a directory and every directory below it, except ignored ones.
+
+        :param path: The root of the tree to watch.
+        :raises OSError: if any directory can't be watched.
+        """
+
+        for root, dirs, _ in os.walk(path):
+            dirs[:] = [dir for dir in dirs if dir not in IGNORED_DIRS]
+            self.add_dir(root)
+
+    def is_watched(self, path: str) -> bool:
+        """
+        Check whether a path is one of the watched files, or is inside one of the watched directories.
+
+        :param path: The path to check.
+        """
+
+        return path in self.files or any(
+            path.startswith(watched + os.path.sep)
+            for watched in self.paths
+            if watched not in self.files
+        )
+
+    def poll(self, timeout: Optional[float] = None) -> set[str]:
+        changed: set[str] = set()
+        while not changed:
+            readable, _, _ = select.select([self.fd], [], [], timeout)
+            if not readable:
+                return changed
+
+            buffer = os.read(self.fd, 64 * 1024)
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = self.EVENT.unpack_from(buffer, offset)
+                offset += self.EVENT.size
+                name = os.fsdecode(buffer[offset : offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & self.IN_Q_OVERFLOW:
+                    # Events were dropped by the kernel, so report everything as changed
+                    changed.update(self.paths)
+                    continue
+                if wd not in self.dirs:
+                    continue
+                path = os.path.join(self.dirs[wd], name)
+                if mask & self.IN_ISDIR:
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO) and self.is_watched(
+                        path
+                    ):
+                        self.add_tree(path)
+                    continue
+                if self.is_watched(path) and not is_ignored(path):
+                    changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def create_watcher(paths: Iterable[str]) -> Watcher:
+    """
+    Create the most efficient watcher available on this platform, falling back to polling if inotify can't be used.
+
+    :param paths: The files and directories to watch. Directories are watched recursively.
+    """
+
+    paths = tuple(paths)
+    try:
+        return InotifyWatcher(paths)
+    except (OSError, AttributeError):
+        return PollingWatcher(paths)
+
+
+def watch(
+    paths: Iterable[str], callback: Callable[[set[str]], None], debounce: float = 0.3
+) -> None:
+    """
+    Watch a set of paths and call a function whenever they change, until interrupted with Ctrl+C.
+    Bursts of changes (e.g. saving several files at once) are coalesced into a single call once no changes have been seen for `debounce` seconds.
+
+    :param paths: The files and directories to watch. Directories are watched recursively.
+    :param callback: A function to call with the set of changed paths.
+    :param debounce: The number of seconds of quiet to wait for before calling `callback`.
+    """
+
+    with create_watcher(paths) as watcher:
+        try:
+            while True:
+                changed = watcher.poll()
+                while more := watcher.poll(debounce):
+                    changed |= more
+                callback(changed)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,77 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+# Directories that never contain addon projects, so aren't searched
+IGNORED_DIRS = ("build", "vendor", "node_modules", "__pycache__")
+
+
+@dataclass(frozen=True)
+class Result:
+    """The outcome of building one addon in a workspace."""
+
+    root: str
+    seconds: float
+    build_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+def find_projects(workspace: str, addon_file: str) -> list[str]:
+    """
+    Find the root directory of every addon project in a workspace, i.e. every directory containing an addon file.
+    Hidden directories and directories in `IGNORED_DIRS` aren't searched, and projects aren't searched for nested projects.
+
+    :param workspace: The directory to search.
+    :param addon_file: The name of the addon file marking a project root.
+    """
+
+    roots = []
+    for root, dirs, files in os.walk(os.path.abspath(workspace)):
+        if addon_file in files:
+            roots.append(root)
+            dirs.clear()
+            continue
+        dirs[:] = sorted(
+            dir for dir in dirs if not dir.startswith(".") and dir not in IGNORED_DIRS
+        )
+    return roots
+
+
+def timed(func: Callable[[str], str], root: str) -> Result:
+    """
+    Run a build function for a project, timing it and capturing any error so one failing addon doesn't stop the others.
+
+    :param func: The function to build a project, returning the path to its bundle.
+    :param root: The root directory of the project.
+    """
+
+    start = time.perf_counter()
+    try:
+        build_path = func(root)
+        return Result(root, time.perf_counter() - start, build_path=build_path)
+    except Exception as e:
+        return Result(root, time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+
+
+def build_all(
+    func: Callable[[str], str], roots: Iterable[str], processes: int
+) -> list[Result]:
+    """
+    Build a set of projects concurrently in a pool of processes. `func` must be picklable, e.g. a module level function or a `functools.partial` of one.
+
+    :param func: The function to build a project, returning the path to its bundle.
+    :param roots: The root directories of the projects.
+    :param processes: The maximum number of projects to build at once.
+    :returns: the result of each build, in the order the projects were given.
+    """
+
+    roots = list(roots)
+    results: dict[str, Result] = {}
+    with ProcessPoolExecutor(max_workers=max(1, min(processes, len(roots)))) as pool:
+        futures = [pool.submit(timed, func, root) for root in roots]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.root] = result
+    return [results[root] for root in roots]
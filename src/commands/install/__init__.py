@@ -1,13 +1,259 @@
-import subprocess
 import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import click
+import yaml
+
+from .. import utils as cmd_utils
+from . import lockfile, vendor, wheels
+
+VENDOR = os.path.join("src", "vendor")
+LOCKFILE = "vendor.lock"
+# Matches the distribution name at the start of a requirement, e.g. `numpy` in `numpy>=1.20`
+REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def get_requirement_name(requirement: str) -> str:
+    """
+    Get the normalized distribution name of a requirement, so the same package is recognized however its name is spelled, e.g. `Foo_Bar` and `foo-bar` (see PEP 503).
+
+    :param requirement: The requirement, e.g. `"numpy>=1.20"`.
+    :raises ValueError: if the requirement doesn't start with a distribution name.
+    """
+
+    match = REQUIREMENT_NAME.match(requirement)
+    if not match:
+        raise ValueError(
+            f"Failed to find a package name in the requirement {requirement!r}."
+        )
+    return wheels.normalize_name(match[1])
+
+
+def get_python_version() -> str:
+    """Get the Python version of the Blender version the addon in the current directory targets, or of the running interpreter if there is no addon."""
+
+    # Imported here, since the build command imports the BADKit wrappers, which need bpy
+    from ..build import bytecode
+    from ..build.build import ADDON, Loader
+
+    if not os.path.exists(ADDON):
+        return f"{sys.version_info.major}.{sys.version_info.minor}"
+    with open(ADDON) as addon_file:
+        addon = yaml.load(addon_file, Loader=Loader)
+    return ".".join(
+        map(str, bytecode.get_python_version(addon.bl_info.blender_version))
+    )
+
+
+def resolve_package(
+    name: str,
+    requirement: str,
+    cache_dir: str,
+    python_version: str,
+    constraints: Optional[str] = None,
+    offline: bool = False,
+) -> tuple[lockfile.Package, list[str]]:
+    """
+    Resolve a package and its dependencies to wheels, downloading and unpacking them into a cache shared by every project.
+
+    :param name: The name of the package.
+    :param requirement: The requirement to resolve, e.g. `"numpy>=1.20"`.
+    :param cache_dir: The directory of the shared cache.
+    :param python_version: The version of Python the package must support, e.g. `"3.10"`.
+    :param constraints: The contents of a pip constraints file pinning the versions to resolve.
+    :param offline: Only resolve wheels already in the cache.
+    :returns: the versions resolved, and the paths to the wheels.
+    """
+
+    constraints_path = None
+    if constraints:
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".txt", delete=False
+        ) as constraints_file:
+            constraints_file.write(constraints)
+        constraints_path = constraints_file.name
+    try:
+        wheel_paths = wheels.download(
+            requirement,
+            os.path.join(cache_dir, "wheels"),
+            python_version,
+            constraints=constraints_path,
+            offline=offline,
+        )
+    finally:
+        if constraints_path:
+            os.remove(constraints_path)
+    for wheel_path in wheel_paths:
+        wheels.unpack(wheel_path, os.path.join(cache_dir, "unpacked"))
+
+    versions = dict(map(wheels.parse_wheel_name, wheel_paths))
+    version = versions.pop(wheels.normalize_name(name), None)
+    if version is None:
+        raise RuntimeError(f"Failed to find a wheel for {requirement} itself.")
+    return lockfile.Package(name, version, versions), wheel_paths
+
+
+def log_conflicts(conflicts: vendor.Conflicts) -> None:
+    """
+    Log the clashes between packages merged into the vendor tree.
+
+    :param conflicts: The clashes to log.
+    """
+
+    for name, versions in sorted(conflicts.versions.items()):
+        required = ", ".join(
+            f"{version} by {', '.join(requirers)}"
+            for version, requirers in sorted(
+                versions.items(), key=lambda item: vendor.get_version_key(item[0])
+            )
+        )
+        cmd_utils.log(
+            f"Conflict: {name} is required at several versions ({required}), only the latest is vendored",
+            fg="yellow",
+        )
+    for path, names in sorted(conflicts.files.items()):
+        cmd_utils.log(
+            f"Conflict: {path} is provided by {', '.join(names)}, only the copy from {names[0]} is vendored",
+            fg="yellow",
+        )
 
 
 @click.command()
-@click.argument("pkg-name", type=str)
-def install(pkg_name: str) -> None:
-    """Locally install a distribution package from PyPI."""
-    subprocess.run(
-        ["pip", "install", pkg_name, "-t", os.path.join("src", "vendor", pkg_name)]
+@click.argument("pkg-names", type=str, nargs=-1)
+@click.option(
+    "--lockfile",
+    "lockfile_path",
+    type=click.Path(dir_okay=False),
+    default=LOCKFILE,
+    help="The lockfile pinning the installed packages. With no PKG_NAMES, every package in it is installed at its locked version.",
+    show_default=True,
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    help="The number of packages to install concurrently.",
+    show_default=True,
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Only install wheels already in the shared cache, without contacting the package index.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=wheels.get_cache_dir,
+    envvar="BADKIT_CACHE",
+    help="The cache of downloaded and unpacked wheels, shared by every project.",
+    show_default="~/.cache/badkit",
+)
+@click.option(
+    "--python-version",
+    help="The Python version to install wheels for. Defaults to the Python version of the addon's Blender version.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Replace the vendor directory even if it holds files that weren't installed from the lockfile, deleting them.",
+)
+def install(
+    pkg_names: tuple[str, ...],
+    lockfile_path: str,
+    jobs: int,
+    offline: bool,
+    cache_dir: str,
+    python_version: Optional[str],
+    force: bool,
+) -> None:
+    """
+    Locally install distribution packages from PyPI into the project's vendor directory, along with every package already in the lockfile.
+    With no PKG_NAMES, every package in the lockfile is installed.
+    """
+
+    locked = lockfile.load(lockfile_path)
+    if not pkg_names and not locked:
+        raise click.UsageError(
+            f"No packages were given and there are none locked in {lockfile_path}."
+        )
+    # The vendor tree is replaced as a whole, so anything in it that the lockfile doesn't account for would be lost
+    untracked = vendor.find_untracked(
+        VENDOR,
+        {
+            wheels.normalize_name(name)
+            for package in locked.values()
+            for name in (package.name, *package.dependencies)
+        },
+    )
+    if untracked and not force:
+        raise click.UsageError(
+            f"{VENDOR} holds {len(untracked)} files that weren't installed from {lockfile_path}, e.g. {', '.join(untracked[:3])}. "
+            "badkit install replaces the whole directory, so move them into the addon's source, or pass --force to delete them."
+        )
+    if untracked:
+        cmd_utils.log(
+            f"Deleting {len(untracked)} files from {VENDOR} that weren't installed from {lockfile_path}",
+            fg="yellow",
+        )
+    requirements: dict[str, tuple[str, Optional[str]]] = {
+        get_requirement_name(requirement): (requirement, None)
+        for requirement in pkg_names
+    }
+    # Every locked package is resolved again too, since they all share the vendor tree
+    for name, package in locked.items():
+        requirements.setdefault(
+            wheels.normalize_name(name),
+            (f"{name}=={package.version}", package.get_constraints()),
+        )
+    python_version = python_version or get_python_version()
+
+    start = time.perf_counter()
+    resolved: dict[str, tuple[lockfile.Package, list[str]]] = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            name: pool.submit(
+                resolve_package,
+                name,
+                requirement,
+                cache_dir,
+                python_version,
+                constraints=constraints,
+                offline=offline,
+            )
+            for name, (requirement, constraints) in requirements.items()
+        }
+        for name, future in futures.items():
+            try:
+                resolved[name] = future.result()
+            except Exception as e:
+                cmd_utils.log(f"Failed to install {name}: {e}", fg="red")
+    if len(resolved) < len(requirements):
+        # Leave the vendor tree and lockfile as they were, rather than dropping packages from them
+        raise click.exceptions.Exit(1)
+
+    files, conflicts = vendor.build_tree(
+        {name: wheel_paths for name, (_, wheel_paths) in resolved.items()},
+        os.path.join(cache_dir, "unpacked"),
+        VENDOR,
+    )
+    log_conflicts(conflicts)
+    lockfile.save(
+        lockfile_path, {name: package for name, (package, _) in resolved.items()}
+    )
+    for name in map(get_requirement_name, pkg_names):
+        package = resolved[name][0]
+        cmd_utils.log(
+            f"Installed {name}=={package.version} with {len(package.dependencies)} dependencies",
+            fg="white",
+        )
+    cmd_utils.log(
+        f"Vendored {len(resolved)} packages for Python {python_version} ({files} files) into {VENDOR} in {time.perf_counter() - start:.2f}s",
+        fg="white",
+        bold=True,
     )
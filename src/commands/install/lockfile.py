@@ -0,0 +1,76 @@
+import os
+import re
+from dataclasses import dataclass, field
+
+HEADER = "# Generated by badkit install. Run `badkit install` to install every package below.\n"
+# Matches a pinned requirement, and the package it was installed for if it's a dependency
+PIN = re.compile(
+    r"^(?P<name>[^=\s#]+)==(?P<version>[^\s#]+)\s*(?:#\s*via\s+(?P<via>\S+))?"
+)
+
+
+@dataclass
+class Package:
+    """A package installed into the project's vendor tree, and the versions of it and its dependencies that were installed."""
+
+    name: str
+    version: str
+    # Versions of the package's dependencies, by normalized name
+    dependencies: dict[str, str] = field(default_factory=dict)
+
+    def get_constraints(self) -> str:
+        """Get the versions of the package and its dependencies as the contents of a pip constraints file."""
+
+        return "".join(
+            f"{name}=={version}\n"
+            for name, version in ((self.name, self.version), *self.dependencies.items())
+        )
+
+
+def load(path: str) -> dict[str, Package]:
+    """
+    Load a lockfile. A missing lockfile is treated as empty.
+
+    :param path: The path to the lockfile.
+    :returns: the locked packages, by name.
+    :raises ValueError: if a line isn't a pinned requirement, or a dependency appears before the package it was installed for.
+    """
+
+    packages: dict[str, Package] = {}
+    if not os.path.exists(path):
+        return packages
+
+    with open(path) as file:
+        for number, line in enumerate(file, start=1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            match = PIN.match(line.strip())
+            if not match:
+                raise ValueError(
+                    f"{path}:{number}: expected a pinned requirement (name==version), got {line.strip()!r}."
+                )
+            if match["via"] is None:
+                packages[match["name"]] = Package(match["name"], match["version"])
+            elif match["via"] in packages:
+                packages[match["via"]].dependencies[match["name"]] = match["version"]
+            else:
+                raise ValueError(
+                    f"{path}:{number}: {match['name']} is a dependency of {match['via']}, which isn't locked above it."
+                )
+    return packages
+
+
+def save(path: str, packages: dict[str, Package]) -> None:
+    """
+    Write a lockfile. Each package is pinned, followed by each of its dependencies marked with the package they were installed for.
+
+    :param path: The path to write the lockfile to.
+    :param packages: The packages to lock, by the name of their vendor directory.
+    """
+
+    with open(path, "w") as file:
+        file.write(HEADER)
+        for name, package in sorted(packages.items()):
+            file.write(f"{name}=={package.version}\n")
+            for dependency, version in sorted(package.dependencies.items()):
+                file.write(f"{dependency}=={version}  # via {name}\n")
@@ -0,0 +1,130 @@
+import csv
+import filecmp
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from . import wheels
+
+
+@dataclass
+class Conflicts:
+    """Clashes found while merging the wheels of several packages into a single vendor tree."""
+
+    # Distributions required at more than one version, by name, with the packages requiring each version
+    versions: dict[str, dict[str, list[str]]] = field(default_factory=dict)
+    # Paths provided with different contents by more than one distribution, with the distribution whose file was kept first
+    files: dict[str, list[str]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.versions or self.files)
+
+
+def get_version_key(version: str) -> tuple:
+    """
+    Get a key sorting version numbers by their numeric parts, e.g. so `1.10` sorts after `1.9`.
+
+    :param version: The version, e.g. `"1.26.4"`.
+    """
+
+    return tuple(
+        (0, int(part), "") if part.isdigit() else (-1, 0, part)
+        for part in re.split(r"[.+-]", version)
+    )
+
+
+def find_untracked(dest: str, names: Iterable[str]) -> list[str]:
+    """
+    Find the files in an existing vendor tree that weren't installed from any of the given distributions, such as hand-vendored modules or the per-package directories of older BADKit versions.
+    Files are attributed to a distribution by the `RECORD` file of its `.dist-info` directory.
+
+    :param dest: The directory of the vendor tree.
+    :param names: The normalized names of the distributions the tree was installed from.
+    :returns: the paths of the untracked files, relative to the tree.
+    """
+
+    if not os.path.isdir(dest):
+        return []
+    names = set(names)
+    owned: set[str] = set()
+    for entry in os.listdir(dest):
+        name, _, suffix = entry.rpartition(".")
+        if suffix != "dist-info" or (
+            wheels.normalize_name(name.rsplit("-", 1)[0]) not in names
+        ):
+            continue
+        try:
+            with open(os.path.join(dest, entry, "RECORD"), newline="") as record:
+                owned.update(
+                    os.path.normpath(row[0]) for row in csv.reader(record) if row
+                )
+        except OSError:
+            continue
+
+    untracked = []
+    for dir_path, dirs, files in os.walk(dest):
+        dirs[:] = [dir for dir in dirs if dir != "__pycache__"]
+        for file in files:
+            rel_path = os.path.relpath(os.path.join(dir_path, file), dest)
+            if rel_path not in owned:
+                untracked.append(rel_path)
+    return sorted(untracked)
+
+
+def build_tree(
+    packages: dict[str, list[str]], unpacked_dir: str, dest: str
+) -> tuple[int, Conflicts]:
+    """
+    Merge the wheels installed for several packages into a single flat vendor tree, so every vendored module can be imported from one directory.
+    Each distribution is only linked once, at the highest version any package requires, and identical files provided by different distributions are only linked once.
+    Any existing tree at `dest` is replaced once the new tree is complete, so check it for untracked files with `find_untracked` first.
+
+    :param packages: The paths to the wheels installed for each package, by package name.
+    :param unpacked_dir: The directory of unpacked wheels.
+    :param dest: The directory of the vendor tree.
+    :returns: the number of files linked into the tree, and any conflicts between the packages.
+    """
+
+    conflicts = Conflicts()
+    required: dict[str, dict[str, tuple[str, list[str]]]] = {}
+    for package, wheel_paths in sorted(packages.items()):
+        for wheel_path in wheel_paths:
+            name, version = wheels.parse_wheel_name(wheel_path)
+            versions = required.setdefault(name, {})
+            versions.setdefault(version, (wheel_path, []))[1].append(package)
+
+    # Relative paths in the tree, mapped to the distribution and file providing them
+    sources: dict[str, tuple[str, str]] = {}
+    for name, versions in sorted(required.items()):
+        if len(versions) > 1:
+            conflicts.versions[name] = {
+                version: requirers for version, (_, requirers) in versions.items()
+            }
+        version = max(versions, key=get_version_key)
+        root = wheels.unpack(versions[version][0], unpacked_dir)
+        for dir_path, _, files in os.walk(root):
+            for file in files:
+                path = os.path.join(dir_path, file)
+                rel_path = os.path.relpath(path, root)
+                if rel_path not in sources:
+                    sources[rel_path] = (name, path)
+                elif not filecmp.cmp(sources[rel_path][1], path, shallow=False):
+                    conflicts.files.setdefault(rel_path, [sources[rel_path][0]]).append(
+                        name
+                    )
+
+    partial_dest = f"{dest}.partial"
+    shutil.rmtree(partial_dest, ignore_errors=True)
+    for rel_path, (_, path) in sources.items():
+        target = os.path.join(partial_dest, rel_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copy2(path, target)
+    os.makedirs(partial_dest, exist_ok=True)
+    shutil.rmtree(dest, ignore_errors=True)
+    os.replace(partial_dest, dest)
+    return len(sources), conflicts
@@ -0,0 +1,144 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from typing import Optional
+
+# Matches the distribution name and version of a wheel's filename (PEP 427)
+WHEEL_NAME = re.compile(
+    r"^(?P<name>[^-]+)-(?P<version>[^-]+)(-\d[^-]*)?-[^-]+-[^-]+-[^-]+\.whl$"
+)
+# Matches the lines pip prints for each file it downloads, or finds was already downloaded
+DOWNLOADED = re.compile(
+    r"^\s*(?:Saved|File was already downloaded) (?P<path>.+\.whl)\s*$"
+)
+
+
+def get_cache_dir() -> str:
+    """Get the directory shared by every project for downloaded and unpacked wheels, taken from `BADKIT_CACHE` if it's set."""
+
+    return os.environ.get("BADKIT_CACHE") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "badkit"
+    )
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a distribution name as wheel filenames do, e.g. `Foo.Bar-baz` becomes `foo_bar_baz`.
+
+    :param name: The name to normalize.
+    """
+
+    return re.sub(r"[-_.]+", "_", name).lower()
+
+
+def parse_wheel_name(path: str) -> tuple[str, str]:
+    """
+    Get the distribution name and version of a wheel from its filename.
+
+    :param path: The path to the wheel.
+    :raises ValueError: if the filename isn't a valid wheel filename.
+    """
+
+    match = WHEEL_NAME.match(os.path.basename(path))
+    if not match:
+        raise ValueError(f"{os.path.basename(path)} is not a valid wheel filename.")
+    return normalize_name(match["name"]), match["version"]
+
+
+def download(
+    requirement: str,
+    wheelhouse: str,
+    python_version: str,
+    constraints: Optional[str] = None,
+    offline: bool = False,
+) -> list[str]:
+    """
+    Resolve a requirement to the wheels of it and its dependencies, downloading any not already in the wheelhouse.
+    The requirement is first resolved from the wheelhouse alone, so nothing is fetched from the network when every wheel is present.
+
+    :param requirement: The requirement to resolve, e.g. `"numpy>=1.20"`.
+    :param wheelhouse: The directory of downloaded wheels.
+    :param python_version: The version of Python the wheels must support, e.g. `"3.10"`.
+    :param constraints: The path to a pip constraints file pinning the versions to resolve.
+    :param offline: Only resolve from the wheelhouse, never from the package index.
+    :returns: the paths to the wheels.
+    :raises RuntimeError: if the requirement can't be resolved.
+    """
+
+    command = [
+        sys.executable,
+        "-m",
+        "pip",
+        "download",
+        requirement,
+        "--dest",
+        wheelhouse,
+        "--find-links",
+        wheelhouse,
+        "--only-binary=:all:",
+        "--python-version",
+        python_version,
+        "--progress-bar",
+        "off",
+        "--disable-pip-version-check",
+    ]
+    if constraints:
+        command += ["--constraint", constraints]
+
+    process = subprocess.run([*command, "--no-index"], capture_output=True, text=True)
+    if process.returncode and not offline:
+        process = subprocess.run(command, capture_output=True, text=True)
+    if process.returncode:
+        raise RuntimeError(
+            f"Failed to resolve {requirement}:\n{process.stderr.strip()}"
+        )
+    return [
+        os.path.abspath(match["path"])
+        for line in process.stdout.splitlines()
+        if (match := DOWNLOADED.match(line))
+    ]
+
+
+def unpack(wheel_path: str, unpacked_dir: str) -> str:
+    """
+    Unpack a wheel into the shared cache of unpacked wheels, unless it has been unpacked already.
+    The contents of the wheel's `purelib` and `platlib` data directories are moved to its root, as pip does; other data directories are ignored.
+
+    :param wheel_path: The path to the wheel.
+    :param unpacked_dir: The directory of unpacked wheels.
+    :returns: the directory the wheel was unpacked to.
+    """
+
+    dest = os.path.join(unpacked_dir, os.path.basename(wheel_path)[:-4])
+    if os.path.isdir(dest):
+        return dest
+
+    os.makedirs(unpacked_dir, exist_ok=True)
+    # Unpack under a temporary name first so concurrent installs never see a partial wheel
+    temp_dir = tempfile.mkdtemp(dir=unpacked_dir, prefix=".partial-")
+    try:
+        with zipfile.ZipFile(wheel_path) as wheel:
+            for info in wheel.infolist():
+                name = info.filename
+                parts = name.split("/")
+                if parts[0].endswith(".data"):
+                    if len(parts) < 3 or parts[1] not in ("purelib", "platlib"):
+                        continue
+                    name = "/".join(parts[2:])
+                if info.is_dir() or not name:
+                    continue
+                path = os.path.join(temp_dir, *name.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with wheel.open(info) as source, open(path, "wb") as file:
+                    shutil.copyfileobj(source, file)
+        os.replace(temp_dir, dest)
+    except OSError:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        # Another install unpacked the same wheel first
+        if not os.path.isdir(dest):
+            raise
+    return dest
@@ -1,8 +1,69 @@
+import json
+import os
+import shutil
 import subprocess
+import tempfile
+import time
+from typing import Optional
 
 import click
 
-from . import bootloader
+from .. import utils as cmd_utils
+from . import profile, session
+
+# Run inside Blender, so it is passed by path rather than imported
+BOOTLOADER = os.path.join(os.path.dirname(__file__), "bootloader.py")
+
+
+def push_addon(socket_path: str, path: str) -> bool:
+    """
+    Push a built addon to a running dev session and log the result.
+
+    :param socket_path: The socket the session listens on.
+    :param path: The addon's bundle or directory.
+    :returns: whether the session reloaded the addon.
+    """
+
+    try:
+        reply = session.push(socket_path, path)
+    except (OSError, RuntimeError) as e:
+        cmd_utils.log(
+            f'Failed to push "{os.path.abspath(path)}" to the dev session at {socket_path}: {e}',
+            fg="red",
+        )
+        return False
+
+    if reply["installed"]:
+        message = f"Installed {reply['module']} in the dev session"
+    else:
+        message = f"Reloaded {reply['module']} in the dev session ({reply['changed']} files changed, {len(reply['reloaded'])} modules reloaded)"
+    cmd_utils.log(f"{message} in {reply['seconds']:.2f}s", fg="white")
+    if reply["restart"]:
+        cmd_utils.log(
+            "Restart Blender to load the changed extension modules: "
+            + ", ".join(reply["restart"]),
+            fg="yellow",
+        )
+    return True
+
+
+def wait_for_timings(
+    process: subprocess.Popen, timings_path: str
+) -> Optional[dict[str, float]]:
+    """
+    Wait for the bootloader of a launched Blender to report how long the launch took.
+
+    :param process: The Blender process.
+    :param timings_path: The file the bootloader writes its timings to.
+    :returns: the seconds from launch until the `"bootloader"` ran and until the `"addons"` were enabled, or `None` if Blender exited first.
+    """
+
+    while not os.path.exists(timings_path):
+        if process.poll() is not None:
+            return None
+        time.sleep(0.05)
+    with open(timings_path) as timings_file:
+        return json.load(timings_file)
 
 
 @click.command()
@@ -18,23 +79,127 @@ from . import bootloader
     type=click.Path(dir_okay=False, exists=True),
     help="A path to a file that should be opened on launch.",
 )
+@click.option(
+    "--fast",
+    is_flag=True,
+    help="Launch Blender with a minimal isolated config instead of the user's, without their addons, startup file or splash screen. The config is cached per Blender executable and --enable addons, and seeded from Blender's factory settings on first use.",
+)
+@click.option(
+    "--enable",
+    "dependencies",
+    multiple=True,
+    help="The module name of an addon to enable alongside ADDONS, e.g. a bundled addon they depend on. Can be given several times.",
+)
+@click.option(
+    "--budget",
+    type=click.FloatRange(min=0),
+    help="The number of seconds the launch should take until ADDONS are enabled. Exits with status 1 once Blender exits if the launch went over it.",
+)
+@click.option(
+    "--quit",
+    "quit_after_launch",
+    is_flag=True,
+    help="Quit Blender as soon as it has started up, e.g. to compare the launch times of different configurations.",
+)
+@click.option(
+    "--link",
+    is_flag=True,
+    help="Link ADDONS into Blender from where they are instead of installing a copy of each, and enable them all at once. Addon directories are symlinked into a temporary addons directory, and bundles are extracted there.",
+)
+@click.option(
+    "--session",
+    "dev_session",
+    is_flag=True,
+    help="Keep a dev session open in the launched Blender, so `badkit build --push` can reload rebuilt addons in place. If a session is already running, ADDONS are pushed to it instead of launching another Blender.",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default=session.get_default_socket,
+    envvar="BADKIT_SESSION",
+    help="The Unix socket the dev session listens on.",
+    show_default=f"$XDG_RUNTIME_DIR/{session.SOCKET}",
+)
 @click.argument(
     "addons",
-    type=click.Path(file_okay=False, exists=True),
+    type=click.Path(exists=True),
     nargs=-1,
 )
-def launch(blender: str, file: click.Path, addons: list[click.Path]) -> None:
+def launch(
+    blender: str,
+    file: Optional[str],
+    fast: bool,
+    dependencies: tuple[str, ...],
+    budget: Optional[float],
+    quit_after_launch: bool,
+    link: bool,
+    dev_session: bool,
+    socket_path: str,
+    addons: tuple[str, ...],
+) -> None:
     """
     Launch a Blender environment with a set of custom addons (specified in ADDONS) installed and enabled. ADDONS should be specified last since all following tokens will be collected into it's value.
     """
 
-    subprocess.run(
+    if dev_session and session.is_running(socket_path):
+        failed = [addon for addon in addons if not push_addon(socket_path, addon)]
+        if failed:
+            raise click.exceptions.Exit(1)
+        return
+
+    env = None
+    blender_args = []
+    bootloader_args = [
+        arg for dependency in dependencies for arg in ("--enable", dependency)
+    ]
+    if fast:
+        profile_dir = profile.get_profile_dir(blender, dependencies)
+        env = profile.get_environment(profile_dir)
+        if not profile.is_seeded(profile_dir):
+            blender_args.append("--factory-startup")
+            bootloader_args.append("--seed")
+
+    timings_path = os.path.join(
+        tempfile.mkdtemp(prefix="badkit-launch-"), "timings.json"
+    )
+    launched_at = time.time()
+    process = subprocess.Popen(
         [
             blender,
+            *blender_args,
             file if file else "",
             "--python",
-            bootloader.__file__,
+            BOOTLOADER,
             "--",
-            *addons,
-        ]
+            *bootloader_args,
+            "--timings",
+            timings_path,
+            "--launched-at",
+            repr(launched_at),
+            *(("--quit",) if quit_after_launch else ()),
+            *(("--link",) if link else ()),
+            *(("--session", os.path.abspath(socket_path)) if dev_session else ()),
+            *(os.path.abspath(addon) for addon in addons),
+        ],
+        env=env,
     )
+    try:
+        timings = wait_for_timings(process, timings_path)
+        if timings:
+            cmd_utils.log(
+                f"Launched {'with the fast profile ' if fast else ''}in {timings['addons']:.2f}s: bootloader reached after {timings['bootloader']:.2f}s, addons enabled {timings['addons'] - timings['bootloader']:.2f}s later",
+                fg="white",
+                bold=True,
+            )
+            if budget is not None and timings["addons"] > budget:
+                cmd_utils.log(
+                    f"The launch went {timings['addons'] - budget:.2f}s over the {budget:.2f}s budget",
+                    fg="red",
+                    bold=True,
+                )
+        process.wait()
+    finally:
+        shutil.rmtree(os.path.dirname(timings_path), ignore_errors=True)
+    if budget is not None and (not timings or timings["addons"] > budget):
+        raise click.exceptions.Exit(1)
@@ -1,30 +1,91 @@
+import time
+
+# Taken first, to measure how long Blender took to reach the bootloader
+BOOTED = time.time()
+
 import atexit
+import importlib.util
+import json
 import os
-import shutil
 import sys
-
+from typing import Optional
 
 # The script assumes that is in running inside a Blender environment
 import addon_utils
 import bpy
 
+# Blender runs this script outside of its package, so the dev session module next to it is loaded by path
+spec = importlib.util.spec_from_file_location(
+    "badkit_session",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "session.py"),
+)
+assert spec is not None and spec.loader is not None
+session = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(session)
+
 if __name__ == "__main__":
     print("\nBOOTLOADING...")
 
+    # Blender passes the arguments after "--" to the script untouched
+    args = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    socket_path: Optional[str] = None
+    link = False
+    dependencies: list[str] = []
+    seed = False
+    timings_path: Optional[str] = None
+    launched_at = BOOTED
+    quit_after_launch = False
+    while args and args[0].startswith("--"):
+        option = args.pop(0)
+        if option == "--session":
+            socket_path = args.pop(0)
+        elif option == "--link":
+            link = True
+        elif option == "--enable":
+            dependencies.append(args.pop(0))
+        elif option == "--seed":
+            seed = True
+        elif option == "--timings":
+            timings_path = args.pop(0)
+        elif option == "--launched-at":
+            launched_at = float(args.pop(0))
+        elif option == "--quit":
+            quit_after_launch = True
+
+    # Enable the addons that the addons under test depend on, unless the launch profile's preferences already have
+    for module in dependencies:
+        if not addon_utils.check(module)[1]:
+            addon_utils.enable(module, default_set=True)
+    if seed:
+        # Saved before the addons under test are enabled, since they are installed afresh on every launch
+        bpy.context.preferences.view.show_splash = False
+        bpy.context.preferences.use_preferences_save = False
+        bpy.ops.wm.save_userpref()
+
     # Install and enable addons in Blender
-    for i in range(len(sys.argv)):
-        modpath = sys.argv[i]
-        modname, _ = os.path.splitext(os.path.basename(modpath))
-        bpy.ops.preferences.addon_install(filepath=modpath)
-        bpy.ops.preferences.addon_enable(module=modname)
-
-        # Find the place that Blender copied the module into when the addon was installed
-        bl_modpath: str = None
-        for mod in addon_utils.modules():
-            if mod.__name__ == modname:
-                bl_modpath = mod.__file__
-                break
-
-        atexit.register(lambda path: shutil.rmtree(os.path.dirname(path)), bl_modpath)
+    if link:
+        session.link_addons(args)
+    else:
+        for modpath in args:
+            session.install_addon(modpath)
+    enabled = time.time()
+
+    # Keep a channel open for rebuilt addons to be pushed through and reloaded in place
+    if socket_path:
+        server = session.Server(socket_path)
+        server.start()
+        atexit.register(server.stop)
+        print(f"\nDev session listening on {socket_path}")
+
+    if timings_path:
+        with open(f"{timings_path}.partial", "w") as timings_file:
+            json.dump(
+                {"bootloader": BOOTED - launched_at, "addons": enabled - launched_at},
+                timings_file,
+            )
+        os.replace(f"{timings_path}.partial", timings_path)
+    if quit_after_launch:
+        # Run once Blender has finished starting up
+        bpy.app.timers.register(lambda: bpy.ops.wm.quit_blender())
 
     print("\n############ LOAD SUCCESSFUL ############\n")
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Iterable
+
+from ..install import wheels
+
+# The directory of cached launch profiles, in the cache shared by every project
+PROFILES = "profiles"
+# The preferences file Blender loads from a profile's config directory
+USERPREF = "userpref.blend"
+
+
+def get_profile_dir(blender: str, dependencies: Iterable[str]) -> str:
+    """
+    Get the directory of the isolated Blender config used to launch a Blender executable quickly with some addons enabled.
+    Profiles are keyed by the executable and the addons, so a Blender upgrade gets a fresh profile.
+
+    :param blender: The Blender executable.
+    :param dependencies: The module names of the addons the profile enables, e.g. bundled addons the addons under test depend on.
+    """
+
+    executable = os.path.realpath(shutil.which(blender) or blender)
+    stat = os.stat(executable)
+    key = hashlib.sha256(
+        json.dumps(
+            {
+                "blender": [executable, stat.st_size, stat.st_mtime_ns],
+                "dependencies": sorted(set(dependencies)),
+            }
+        ).encode()
+    ).hexdigest()
+    return os.path.join(wheels.get_cache_dir(), PROFILES, key[:16])
+
+
+def is_seeded(profile_dir: str) -> bool:
+    """
+    Check if a profile's preferences have been saved by a previous launch.
+
+    :param profile_dir: The profile's directory.
+    """
+
+    return os.path.exists(os.path.join(profile_dir, "config", USERPREF))
+
+
+def get_environment(profile_dir: str) -> dict[str, str]:
+    """
+    Get the environment to launch Blender with a profile in, which points Blender at the profile's config and an empty scripts directory instead of the user's, so none of the user's addons or startup file are loaded.
+
+    :param profile_dir: The profile's directory.
+    """
+
+    config_dir = os.path.join(profile_dir, "config")
+    scripts_dir = os.path.join(profile_dir, "scripts")
+    os.makedirs(config_dir, exist_ok=True)
+    os.makedirs(os.path.join(scripts_dir, "addons"), exist_ok=True)
+    return {
+        **os.environ,
+        "BLENDER_USER_CONFIG": config_dir,
+        "BLENDER_USER_SCRIPTS": scripts_dir,
+    }
@@ -0,0 +1,541 @@
+import atexit
+import importlib.util
+import json
+import os
+import queue
+import shutil
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+import zipimport
+from types import ModuleType
+from typing import Any, Optional
+
+# This module is also imported by the bootloader inside Blender, so it must only import the standard library at the top level
+
+# The name of the socket a dev session listens on by default, in a directory only the current user can access (see `get_default_socket`)
+SOCKET = "badkit-session.sock"
+# The number of seconds to wait for a dev session to reply
+TIMEOUT = 60.0
+# The number of seconds between checks for requests on Blender's main thread
+POLL_INTERVAL = 0.1
+# Suffixes of the files of modules that can be reloaded in place
+MODULE_SUFFIXES = (".py", ".pyc")
+# Suffixes of the files of extension modules, which can't be reloaded without restarting Blender
+NATIVE_SUFFIXES = (".so", ".pyd", ".dylib", ".dll")
+
+# The time each addon was last loaded, by module name, to find the files changed since in linked addons
+LOADED: dict[str, float] = {}
+# The temporary addons directory that addons are linked into, once any have been
+addons_dir: Optional[str] = None
+
+
+def check_private(path: str) -> None:
+    """
+    Check that a path belongs to the current user, and that other users can't write to it, so that nobody else can listen on or replace the session's socket.
+
+    :param path: The socket, or the directory holding it.
+    :raises PermissionError: if the path belongs to another user, or other users can write to it.
+    """
+
+    stat = os.stat(path)
+    if stat.st_uid != os.getuid():
+        raise PermissionError(f"{path} belongs to another user.")
+    if stat.st_mode & 0o022:
+        raise PermissionError(f"Other users can write to {path}.")
+
+
+def get_default_socket() -> str:
+    """
+    Get the socket a dev session listens on by default, one per user. It is kept in `$XDG_RUNTIME_DIR` if it's set,
+    otherwise in a directory only the current user can access, created in the temporary directory.
+
+    :raises PermissionError: if the directory for the socket belongs to another user, or other users can write to it.
+    """
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir or not os.path.isdir(runtime_dir):
+        runtime_dir = os.path.join(tempfile.gettempdir(), f"badkit-{os.getuid()}")
+        os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+    check_private(runtime_dir)
+    return os.path.join(runtime_dir, SOCKET)
+
+
+def send(socket_path: str, request: dict[str, object]) -> dict[str, Any]:
+    """
+    Send a request to a dev session and wait for its reply.
+
+    :param socket_path: The socket the session listens on.
+    :param request: The request, with a `"command"` and its arguments.
+    :returns: the reply.
+    :raises OSError: if no session is listening on the socket, or the socket belongs to another user.
+    :raises RuntimeError: if the session failed to handle the request.
+    """
+
+    check_private(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(TIMEOUT)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode() + b"\n")
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise RuntimeError("The dev session closed the connection without replying.")
+    reply = json.loads(line)
+    if "error" in reply:
+        raise RuntimeError(reply["error"])
+    return reply
+
+
+def is_running(socket_path: str) -> bool:
+    """
+    Check if a dev session is listening on a socket.
+
+    :param socket_path: The socket to check.
+    """
+
+    try:
+        send(socket_path, {"command": "ping"})
+    except (OSError, RuntimeError):
+        return False
+    return True
+
+
+def push(socket_path: str, path: str, module: Optional[str] = None) -> dict[str, Any]:
+    """
+    Push a built addon to a dev session, which reloads it in place, or installs it if the session doesn't have it yet.
+
+    :param socket_path: The socket the session listens on.
+    :param path: The addon's bundle, or a directory holding the addon's files.
+    :param module: The addon's module name in Blender. Defaults to the name of `path` without its extension.
+    :returns: the session's reply, with the `"module"` reloaded, whether it was newly `"installed"`, the number of `"changed"` files, the `"reloaded"` modules, any changed extension modules that need a `"restart"`, and the `"seconds"` the reload took.
+    """
+
+    return send(
+        socket_path,
+        {"command": "reload", "path": os.path.abspath(path), "module": module},
+    )
+
+
+def get_module_name(path: str) -> str:
+    """
+    Get the module name Blender installs an addon under.
+
+    :param path: The addon's bundle or directory.
+    """
+
+    return os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+
+
+def read_files(path: str) -> dict[str, bytes]:
+    """
+    Read every file of a built addon.
+
+    :param path: The addon's bundle, or a directory holding the addon's files.
+    :returns: the contents of each file, by its path relative to the addon's directory, separated by `/`.
+    """
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as bundle:
+            return {
+                name: bundle.read(name)
+                for name in bundle.namelist()
+                if not name.endswith("/")
+            }
+
+    files = {}
+    for root, dirs, names in os.walk(path):
+        dirs[:] = [dir for dir in dirs if dir != "__pycache__"]
+        for name in names:
+            file_path = os.path.join(root, name)
+            with open(file_path, "rb") as file:
+                rel_path = os.path.relpath(file_path, path)
+                files[rel_path.replace(os.path.sep, "/")] = file.read()
+    return files
+
+
+def sync_files(files: dict[str, bytes], addon_dir: str) -> set[str]:
+    """
+    Update an installed addon's directory to match a new build, only writing the files that changed.
+    The bytecode cached for each changed module is removed, since it could otherwise be mistaken for up to date.
+
+    :param files: The contents of each file of the new build, by relative path.
+    :param addon_dir: The installed addon's directory.
+    :returns: the relative paths of the files that were written or removed.
+    :raises ValueError: if the addon's directory is a link, since writing through it would change the files it links to, such as the addon's source.
+    """
+
+    if os.path.islink(addon_dir):
+        raise ValueError(
+            f"{addon_dir} is a link to {os.path.realpath(addon_dir)}, so it can't be updated."
+        )
+    existing: set[str] = set()
+    for root, dirs, names in os.walk(addon_dir):
+        dirs[:] = [dir for dir in dirs if dir != "__pycache__"]
+        existing.update(
+            os.path.relpath(os.path.join(root, name), addon_dir).replace(
+                os.path.sep, "/"
+            )
+            for name in names
+        )
+
+    changed = set()
+    for rel_path in existing - set(files):
+        os.remove(os.path.join(addon_dir, *rel_path.split("/")))
+        changed.add(rel_path)
+    for rel_path, data in files.items():
+        path = os.path.join(addon_dir, *rel_path.split("/"))
+        if rel_path in existing:
+            with open(path, "rb") as file:
+                if file.read() == data:
+                    continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(data)
+        changed.add(rel_path)
+
+    for rel_path in changed:
+        if rel_path.endswith(".py"):
+            cached = importlib.util.cache_from_source(
+                os.path.join(addon_dir, *rel_path.split("/"))
+            )
+            if os.path.exists(cached):
+                os.remove(cached)
+    return changed
+
+
+def get_changed_module(package: str, rel_path: str) -> Optional[str]:
+    """
+    Get the name of the module a changed file of an addon belongs to.
+
+    :param package: The addon's module name.
+    :param rel_path: The path of the file relative to the addon's directory.
+    :returns: the module name, or `None` if the file isn't a Python module.
+    """
+
+    if not rel_path.endswith(MODULE_SUFFIXES):
+        return None
+    parts = os.path.splitext(rel_path)[0].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    # Vendored modules are imported under their own names
+    if parts and parts[0] == "vendor":
+        return ".".join(parts[1:]) or None
+    return ".".join((package, *parts))
+
+
+def get_stale_modules(changed: set[str], prefixes: tuple[str, ...]) -> set[str]:
+    """
+    Find the loaded modules that must be imported again after some of them changed: the changed modules, and every module holding a reference to a stale module or to anything defined in one.
+
+    :param changed: The names of the changed modules.
+    :param prefixes: The names of the packages whose modules may hold such references, e.g. the addon and its vendored packages.
+    """
+
+    candidates = {
+        name: module
+        for name, module in list(sys.modules.items())
+        if isinstance(module, ModuleType)
+        and any(name == prefix or name.startswith(f"{prefix}.") for prefix in prefixes)
+    }
+    stale = {name for name in changed if name in candidates}
+    found = True
+    while found:
+        found = False
+        for name, module in candidates.items():
+            if name in stale:
+                continue
+            for value in list(vars(module).values()):
+                owner = (
+                    value.__name__
+                    if isinstance(value, ModuleType)
+                    else getattr(value, "__module__", None)
+                )
+                if owner in stale:
+                    stale.add(name)
+                    found = True
+                    break
+    return stale
+
+
+def install_addon(path: str, module: Optional[str] = None) -> str:
+    """
+    Install and enable an addon in Blender for the rest of the session. The installed copy is removed when Blender exits.
+
+    :param path: The addon's bundle.
+    :param module: The addon's module name. Defaults to the name of `path` without its extension.
+    :returns: the directory Blender installed the addon into.
+    """
+
+    import addon_utils
+    import bpy
+
+    module = module or get_module_name(path)
+    bpy.ops.preferences.addon_install(filepath=path)
+    bpy.ops.preferences.addon_enable(module=module)
+
+    # Find the place that Blender copied the module into when the addon was installed
+    addon_dir = next(
+        os.path.dirname(mod.__file__)
+        for mod in addon_utils.modules()
+        if mod.__name__ == module
+    )
+    atexit.register(shutil.rmtree, addon_dir, ignore_errors=True)
+    return addon_dir
+
+
+def link_addon(path: str, module: Optional[str] = None) -> str:
+    """
+    Make an addon importable by Blender without installing it, by linking its directory into a temporary addons directory.
+    Bundles can't be linked, so they are extracted there instead. The temporary directory is added to Blender's addon paths the first time an addon is linked, and removed when Blender exits.
+
+    :param path: The addon's directory or bundle.
+    :param module: The addon's module name. Defaults to the name of `path` without its extension.
+    :returns: the addon's module name.
+    """
+
+    import addon_utils
+
+    global addons_dir
+    if addons_dir is None:
+        addons_dir = tempfile.mkdtemp(prefix="badkit-addons-")
+        # Removes the links, not the directories they point to
+        atexit.register(shutil.rmtree, addons_dir, ignore_errors=True)
+        sys.path.append(addons_dir)
+        # Added for this session only, unlike a script directory set in the preferences
+        paths = addon_utils.paths
+        addon_utils.paths = lambda: [*paths(), addons_dir]
+
+    module = module or get_module_name(path)
+    link_path = os.path.join(addons_dir, module)
+    if os.path.isdir(path):
+        try:
+            os.symlink(os.path.abspath(path), link_path, target_is_directory=True)
+        except OSError:
+            # e.g. on Windows without the privilege to create symlinks
+            shutil.copytree(path, link_path)
+    else:
+        with zipfile.ZipFile(path) as bundle:
+            bundle.extractall(link_path)
+    return module
+
+
+def link_addons(paths: list[str]) -> list[str]:
+    """
+    Link several addons into Blender (see `link_addon`) and enable them, refreshing Blender's list of addons only once for all of them.
+
+    :param paths: The addons' directories or bundles.
+    :returns: the addons' module names.
+    """
+
+    import addon_utils
+
+    modules = [link_addon(path) for path in paths]
+    addon_utils.modules(refresh=True)
+    for module in modules:
+        LOADED[module] = time.time()
+        addon_utils.enable(module, default_set=True)
+    return modules
+
+
+def get_modified_files(addon_dir: str, since: float) -> set[str]:
+    """
+    Find the files of an addon modified since a point in time.
+
+    :param addon_dir: The addon's directory.
+    :param since: The point in time, as returned by `time.time()`.
+    :returns: the paths of the modified files, relative to the addon's directory.
+    """
+
+    modified = set()
+    for root, dirs, names in os.walk(addon_dir):
+        dirs[:] = [dir for dir in dirs if dir != "__pycache__"]
+        for name in names:
+            path = os.path.join(root, name)
+            if os.stat(path).st_mtime >= since:
+                rel_path = os.path.relpath(path, addon_dir)
+                modified.add(rel_path.replace(os.path.sep, "/"))
+    return modified
+
+
+def reload_addon(path: str, module: Optional[str] = None) -> dict[str, object]:
+    """
+    Reload an addon in place from a new build: update its installed files, then disable it, drop every stale module and enable it again. Addons whose files haven't changed are left enabled.
+    Linked addon directories are already up to date, so the files modified since the addon was last loaded are reloaded instead, even when a bundle is pushed
+    for them: they are usually the addon's source, so they are never written to.
+    Addons that aren't installed yet are installed and enabled, or linked if the session links addons. Must be run on Blender's main thread.
+
+    :param path: The addon's bundle, or a directory holding the addon's files.
+    :param module: The addon's module name. Defaults to the name of `path` without its extension.
+    :returns: the reply to send for the request, see `push`.
+    """
+
+    import addon_utils
+
+    start = time.perf_counter()
+    loaded = time.time()
+    module = module or get_module_name(path)
+    installed = next(
+        (mod for mod in addon_utils.modules() if mod.__name__ == module), None
+    )
+    if installed is None:
+        if addons_dir is None:
+            install_addon(path, module)
+        else:
+            link_addons([path])
+        return {
+            "module": module,
+            "installed": True,
+            "changed": 0,
+            "reloaded": [module],
+            "restart": [],
+            "seconds": time.perf_counter() - start,
+        }
+
+    addon_dir = os.path.dirname(installed.__file__)
+    if os.path.islink(addon_dir) or os.path.realpath(addon_dir) == os.path.realpath(
+        path
+    ):
+        changed = get_modified_files(addon_dir, LOADED.get(module, 0.0))
+        index_path = os.path.join(addon_dir, "vendor", "index.json")
+        index = {}
+        if os.path.exists(index_path):
+            with open(index_path) as index_file:
+                index = json.load(index_file)
+    else:
+        files = read_files(path)
+        index = json.loads(files.get("vendor/index.json", b"{}"))
+        # Modules are already loaded, so the files can be updated while the addon is enabled
+        changed = sync_files(files, addon_dir)
+    LOADED[module] = loaded
+    changed_modules = {
+        name
+        for rel_path in changed
+        if (name := get_changed_module(module, rel_path)) is not None
+    }
+    if "vendor/vendor.zip" in changed:
+        # Drop the directory zipimport cached for the old archive too. The cache is private, so it may be missing
+        getattr(zipimport, "_zip_directory_cache", {}).pop(
+            os.path.join(addon_dir, "vendor", "vendor.zip"), None
+        )
+        changed_modules.update(
+            name for name, entry in index.items() if entry["archived"]
+        )
+    # The top level vendored modules are imported under their own names
+    stale = get_stale_modules(changed_modules, (module, *index))
+    if stale:
+        # The addon's package is always executed again, so it imports the stale modules again
+        stale.add(module)
+    if changed:
+        addon_utils.disable(module)
+        for name in stale:
+            sys.modules.pop(name, None)
+        addon_utils.enable(module, default_set=True)
+    return {
+        "module": module,
+        "installed": False,
+        "changed": len(changed),
+        "reloaded": sorted(stale),
+        "restart": sorted(path for path in changed if path.endswith(NATIVE_SUFFIXES)),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Handles a connection to a dev session, by passing its request to Blender's main thread and sending back the reply."""
+
+    server: "Server"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        reply: queue.Queue = queue.Queue(maxsize=1)
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            self.write({"error": f"Invalid request: {e}"})
+            return
+        if request.get("command") == "ping":
+            self.write({"pong": True})
+            return
+        self.server.requests.put((request, reply))
+        try:
+            self.write(reply.get(timeout=TIMEOUT))
+        except queue.Empty:
+            self.write({"error": "Blender didn't handle the request in time."})
+
+    def write(self, reply: dict[str, object]) -> None:
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class Server(socketserver.ThreadingUnixStreamServer):
+    """
+    A local IPC channel into a running Blender, through which rebuilt addons are pushed and reloaded in place.
+    Connections are accepted on a background thread, while requests are handled on Blender's main thread by a timer, since `bpy` isn't thread safe.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str) -> None:
+        """
+        Construct a Server object, listening on a Unix socket.
+
+        :param socket_path: The socket to listen on. A stale socket left by a session that has exited is replaced.
+        :raises RuntimeError: if another session is already listening on the socket.
+        """
+
+        if os.path.exists(socket_path):
+            if is_running(socket_path):
+                raise RuntimeError(
+                    f"Another dev session is already listening on {socket_path}."
+                )
+            os.remove(socket_path)
+        self.socket_path = socket_path
+        self.requests: queue.Queue = queue.Queue()
+        super().__init__(socket_path, RequestHandler)
+        # Only the current user may connect and send reload commands
+        os.chmod(socket_path, 0o600)
+
+    def start(self) -> None:
+        """Start accepting connections, and handling requests on Blender's main thread."""
+
+        import bpy
+
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        bpy.app.timers.register(self.process, persistent=True)
+
+    def process(self) -> float:
+        """
+        Handle every pending request. Registered as a timer on Blender's main thread.
+
+        :returns: the number of seconds until the timer runs again.
+        """
+
+        while True:
+            try:
+                request, reply = self.requests.get_nowait()
+            except queue.Empty:
+                return POLL_INTERVAL
+            try:
+                if request.get("command") != "reload":
+                    raise ValueError(f"Unknown command {request.get('command')!r}.")
+                result = reload_addon(request["path"], request.get("module"))
+                print(
+                    f"BADKit: reloaded {result['module']} ({result['changed']} files changed) in {result['seconds']:.2f}s"
+                )
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            reply.put(result)
+
+    def stop(self) -> None:
+        """Stop accepting connections and remove the socket."""
+
+        self.shutdown()
+        self.server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
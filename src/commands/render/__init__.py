@@ -0,0 +1,187 @@
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+import click
+
+from .. import utils as cmd_utils
+from . import scheduler
+
+
+def parse_frames(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[list[int]]:
+    """Parse a frame range option, e.g. `1-100:2,150`."""
+
+    if value is None:
+        return None
+    try:
+        frames = scheduler.parse_frames(value)
+    except ValueError:
+        raise click.BadParameter(
+            "expected frames and START-END[:STEP] ranges separated by commas, e.g. 1-100:2,150."
+        )
+    if not frames:
+        raise click.BadParameter("the frame range is empty.")
+    return frames
+
+
+@click.command()
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--frames",
+    callback=parse_frames,
+    help="The frames to render, given as frames and START-END[:STEP] ranges separated by commas, e.g. 1-100:2,150.",
+)
+@click.option(
+    "--bake",
+    "targets",
+    multiple=True,
+    help="Bake this object instead of rendering frames. Can be given multiple times.",
+)
+@click.option(
+    "--bake-type",
+    default="COMBINED",
+    help="The type of bake, e.g. COMBINED, DIFFUSE or NORMAL.",
+    show_default=True,
+)
+@click.option(
+    "--output",
+    help="The path to render frames to, where # characters are replaced with the frame number. Defaults to the scene's output path.",
+)
+@click.option(
+    "--samples",
+    type=click.IntRange(min=1),
+    help="The number of Cycles samples to render with. Defaults to the scene's.",
+)
+@click.option(
+    "--blender",
+    default="blender",
+    envvar="BADKIT_BLENDER",
+    help="A path to the Blender executable (or an alias for it), or to a stand-in for it like benchmarks/stubs/blender.",
+    show_default=True,
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=2,
+    help="The number of Blender processes to render in concurrently.",
+    show_default=True,
+)
+@click.option(
+    "--threads",
+    type=click.IntRange(min=1),
+    help="The number of threads each Blender process renders with. Defaults to an even share of the cores, so that the processes don't oversubscribe them.",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=0),
+    default=0,
+    help="The number of frames or bakes to hand a Blender process at a time, or 0 to give each process several chunks.",
+    show_default=True,
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="The maximum number of seconds a frame or bake may take. Blender processes that take longer are replaced.",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=1,
+    help="The number of times to retry the unfinished part of a chunk on a fresh Blender process after the one rendering it crashed or timed out.",
+    show_default=True,
+)
+@click.option(
+    "--json",
+    "json_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the result, output paths and timings of each frame or bake to this file as JSON.",
+)
+def render(
+    file: str,
+    frames: Optional[list[int]],
+    targets: tuple[str, ...],
+    bake_type: str,
+    output: Optional[str],
+    samples: Optional[int],
+    blender: str,
+    jobs: int,
+    threads: Optional[int],
+    chunk_size: int,
+    timeout: Optional[float],
+    retries: int,
+    json_path: Optional[str],
+) -> None:
+    """
+    Render frames of a .blend file, or bake objects in it, across several background Blender processes rendering on the CPU.
+    The frames or bakes are split into chunks, which are handed out to whichever process is free, and the progress and estimated time left are reported as each one finishes.
+    """
+
+    if bool(targets) == bool(frames):
+        raise click.UsageError("Either --frames or --bake must be given.")
+    # A target given twice would be baked twice, and counted twice towards the progress
+    items: list[scheduler.Item] = (
+        list(dict.fromkeys(targets)) if targets else list(frames or ())
+    )
+    chunks = scheduler.split_chunks(items, jobs, chunk_size)
+    jobs = min(jobs, len(chunks))
+    threads = threads or scheduler.get_threads(jobs)
+    log_dir = tempfile.mkdtemp(prefix="badkit-render-")
+
+    render_results: list[scheduler.RenderResult] = []
+    progress = scheduler.Progress(len(items))
+    kind = "bakes" if targets else "frames"
+
+    def on_result(result: scheduler.RenderResult) -> None:
+        render_results.append(result)
+        status = progress.update()
+        if result.status == "done":
+            cmd_utils.log(
+                f"{result.item} done in {result.duration:.2f}s: {status}", fg="white"
+            )
+        else:
+            cmd_utils.log(
+                f"{result.status.upper()}: {result.item} ({result.duration:.2f}s)\n{result.message}",
+                fg="red",
+            )
+
+    cmd_utils.log(
+        f"Rendering {len(items)} {kind} in {len(chunks)} chunks on {jobs} Blender processes with {threads} threads each",
+        fg="white",
+    )
+    start = time.perf_counter()
+    scheduler.run_chunks(
+        chunks,
+        os.path.abspath(file),
+        bake_type if targets else None,
+        threads,
+        samples,
+        # Blender resolves paths starting with // against the .blend file's directory
+        output if not output or output.startswith("//") else os.path.abspath(output),
+        blender,
+        log_dir,
+        jobs,
+        on_result,
+        timeout=timeout,
+        retries=retries,
+    )
+    seconds = time.perf_counter() - start
+
+    if json_path:
+        scheduler.save_json(json_path, render_results, seconds)
+    failed = [result for result in render_results if result.status != "done"]
+    if failed:
+        cmd_utils.log(f"Blender's output was written to {log_dir}", fg="white")
+    else:
+        shutil.rmtree(log_dir, ignore_errors=True)
+    cmd_utils.log(
+        f"Rendered {len(render_results) - len(failed)}/{len(items)} {kind} in {seconds:.2f}s",
+        fg="red" if failed else "green",
+        bold=True,
+    )
+    if failed:
+        raise click.exceptions.Exit(1)
@@ -0,0 +1,222 @@
+import datetime
+import json
+import math
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Optional, Union
+
+from ..workers import Worker, run_pool
+
+WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker.py")
+# The number of chunks to aim for per worker when the chunk size is chosen automatically, so workers that finish early can pick up the slack
+CHUNKS_PER_WORKER = 4
+# A frame, or a `START-END[:STEP]` range of frames. Frames may be negative, e.g. `-10--1`
+FRAME_RANGE = re.compile(r"(-?\d+)(?:-(-?\d+))?(?::(\d+))?")
+
+# A frame number, or the name of an object to bake
+Item = Union[int, str]
+
+
+@dataclass
+class RenderResult:
+    """The outcome of rendering a single frame or baking a single object, as reported by a render worker."""
+
+    # The frame number, or the name of the object baked
+    item: Item
+    # One of "done", "error" or "crashed"
+    status: str
+    # The number of seconds the frame or bake took
+    duration: float
+    # The path of the rendered frame, or the paths of the images the object was baked to. Empty for failures
+    outputs: list[str] = field(default_factory=list)
+    # The traceback of an error, or why the worker crashed
+    message: str = ""
+
+
+def parse_frames(value: str) -> list[int]:
+    """
+    Parse a frame range, given as comma separated frames and `START-END` or `START-END:STEP` ranges, e.g. `1-100:2,150` or `-10-10`.
+
+    :param value: The frame range.
+    :returns: the frames, sorted and without duplicates.
+    :raises ValueError: if the frame range is malformed.
+    """
+
+    frames: set[int] = set()
+    for part in value.split(","):
+        match = FRAME_RANGE.fullmatch(part.strip())
+        if not match:
+            raise ValueError(f"Malformed frame range: {part}")
+        start, end, step = match.groups()
+        frames.update(range(int(start), int(end or start) + 1, int(step or 1)))
+    return sorted(frames)
+
+
+def split_chunks(items: list[Item], jobs: int, chunk_size: int = 0) -> list[list[Item]]:
+    """
+    Split frames or bake targets into contiguous chunks to hand out to workers.
+
+    :param items: The frames or bake targets.
+    :param jobs: The number of workers.
+    :param chunk_size: The number of items per chunk, or 0 to choose one that gives each worker several chunks.
+    """
+
+    if not chunk_size:
+        chunk_size = max(1, math.ceil(len(items) / (jobs * CHUNKS_PER_WORKER)))
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def get_threads(jobs: int) -> int:
+    """
+    Get the number of threads each of several workers should render with, so that together they use every core without oversubscribing them.
+
+    :param jobs: The number of workers.
+    """
+
+    return max(1, (os.cpu_count() or 1) // jobs)
+
+
+class Progress:
+    """Tracks how many items have finished, to report progress and estimate how long the rest will take."""
+
+    def __init__(self, total: int) -> None:
+        """
+        Construct a Progress object, starting the clock.
+
+        :param total: The total number of items.
+        """
+
+        self.total = total
+        self.done = 0
+        self.start = time.perf_counter()
+
+    def update(self) -> str:
+        """
+        Record that an item has finished.
+
+        :returns: a description of the progress so far and the estimated time left.
+        """
+
+        self.done += 1
+        elapsed = time.perf_counter() - self.start
+        remaining = elapsed / self.done * (self.total - self.done)
+        return (
+            f"{self.done}/{self.total} ({self.done / self.total:.0%}), "
+            f"{datetime.timedelta(seconds=round(elapsed))} elapsed, "
+            f"ETA {datetime.timedelta(seconds=round(remaining))}"
+        )
+
+
+def run_chunks(
+    chunks: list[list[Item]],
+    file: str,
+    bake_type: Optional[str],
+    threads: int,
+    samples: Optional[int],
+    output: Optional[str],
+    blender: str,
+    log_dir: str,
+    jobs: int,
+    on_result: Callable[[RenderResult], None],
+    timeout: Optional[float] = None,
+    retries: int = 0,
+) -> None:
+    """
+    Render frames or bake objects on a pool of warm workers, each with the .blend file open and configured to render on the CPU with `threads` threads. Each worker renders whichever chunk is next whenever it is free.
+    A worker that crashes or times out is replaced, and the items of its chunk that didn't finish are retried on the new worker.
+
+    :param chunks: The chunks of frames, or of objects to bake, in the order to hand them out.
+    :param file: The .blend file.
+    :param bake_type: The type of bake, or `None` to render frames.
+    :param threads: The number of threads each worker renders with.
+    :param samples: The number of samples to render with, or `None` to keep the file's.
+    :param output: The path to render frames to, or `None` to keep the file's.
+    :param blender: The Blender executable, or a stand-in for it.
+    :param log_dir: The directory to write each worker's Blender output to.
+    :param jobs: The number of workers.
+    :param on_result: Called with the result of each frame or bake as soon as a worker reports it.
+    :param timeout: The maximum number of seconds each frame or bake may take, or `None` for no limit.
+    :param retries: The number of times to retry a chunk whose worker crashed or timed out.
+    """
+
+    finished: set[Item] = set()
+    lock = threading.Lock()
+
+    def report(result: RenderResult) -> None:
+        with lock:
+            finished.add(result.item)
+            on_result(result)
+
+    def create_worker(index: int) -> Worker:
+        args = ["--threads", str(threads)]
+        if bake_type:
+            args += ["--bake-type", bake_type]
+        if samples is not None:
+            args += ["--samples", str(samples)]
+        if output:
+            args += ["--output", output]
+        return Worker(
+            blender,
+            WORKER,
+            [*args, file],
+            os.path.join(log_dir, f"worker-{index}.log"),
+        )
+
+    def handle(worker: Worker, chunk: list[Item]) -> None:
+        worker.send({"items": [item for item in chunk if item not in finished]})
+        while True:
+            event = worker.read_event(timeout)
+            if event["event"] == "chunk":
+                return
+            report(
+                RenderResult(
+                    event["item"],
+                    event["status"],
+                    event["duration"],
+                    event["outputs"],
+                    event["message"],
+                )
+            )
+
+    def on_failure(chunk: list[Item], error: Exception) -> None:
+        for item in chunk:
+            if item not in finished:
+                report(
+                    RenderResult(
+                        item,
+                        "crashed",
+                        0.0,
+                        message=f"The render worker failed while rendering {item}: {error}",
+                    )
+                )
+
+    run_pool(chunks, create_worker, handle, on_failure, jobs, retries)
+
+
+def save_json(path: str, results: list[RenderResult], seconds: float) -> None:
+    """
+    Save the results of a render as JSON.
+
+    :param path: The path to save to.
+    :param results: The result of every frame or bake.
+    :param seconds: The wall-clock duration of the render.
+    """
+
+    summary: dict[str, float] = {"items": len(results), "seconds": seconds}
+    for result in results:
+        summary[result.status] = summary.get(result.status, 0) + 1
+    with open(path, "w") as json_file:
+        json.dump(
+            {
+                "summary": summary,
+                "items": [
+                    asdict(result)
+                    for result in sorted(results, key=lambda result: result.item)
+                ],
+            },
+            json_file,
+            indent=2,
+        )
@@ -0,0 +1,176 @@
+import importlib.util
+import json
+import os
+import sys
+import time
+import traceback
+from typing import Optional, cast
+
+# The script assumes that is in running inside a Blender environment, started in the background by `badkit render`
+import bpy
+
+# Blender runs this script outside of its package, so BADKit's render utilities are loaded by path
+spec = importlib.util.spec_from_file_location(
+    "badkit_render_utils",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "utils",
+        "render_utils.py",
+    ),
+)
+assert spec is not None and spec.loader is not None
+render_utils = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(render_utils)
+
+
+def configure(
+    threads: int,
+    bake_type: str,
+    samples: Optional[int] = None,
+    output: Optional[str] = None,
+) -> None:
+    """
+    Configure the open file to render on the CPU with a share of the cores.
+    Scenes that render with Cycles, and every bake, are switched to CPU rendering with their other settings kept, while other render engines are left as they are.
+
+    :param threads: The number of threads to render with.
+    :param bake_type: The type of bake, or an empty string to render frames.
+    :param samples: The number of samples to render with, or `None` to keep the file's.
+    :param output: The path to render frames to, or `None` to keep the file's.
+    """
+
+    context = bpy.context
+    if bake_type or context.scene.render.engine == "CYCLES":
+        cycles_settings = context.scene.cycles
+        render_utils.configure_cycles(
+            context=context,
+            mode="CPU",
+            feature_set=cycles_settings.feature_set,
+            samples=cycles_settings.samples if samples is None else samples,
+            denoise=cycles_settings.use_denoising,
+        )
+    render_utils.configure_threads(context=context, threads=threads)
+    if output:
+        context.scene.render.filepath = output
+
+
+def render_frame(frame: int) -> str:
+    """
+    Render a frame and write it to the scene's output path.
+
+    :param frame: The frame number.
+    :returns: the path the frame was written to.
+    """
+
+    scene = bpy.context.scene
+    scene.frame_set(frame)
+    bpy.ops.render.render(write_still=True)
+    return scene.render.frame_path(frame=frame)
+
+
+def bake_object(name: str, bake_type: str) -> list[str]:
+    """
+    Bake an object to the active image texture of each of its materials, and save the images to their files.
+
+    :param name: The name of the object.
+    :param bake_type: The type of bake, e.g. `COMBINED` or `NORMAL`.
+    :returns: the paths of the images saved.
+    :raises ValueError: if the object has no image textures to bake to, or one of them has no file to save to.
+    """
+
+    obj = bpy.data.objects[name]
+    # Cycles bakes each material to the image of its active image texture node
+    images = {}
+    for slot in obj.material_slots:
+        material = slot.material
+        node = (
+            material.node_tree.nodes.active if material and material.use_nodes else None
+        )
+        if node and node.type == "TEX_IMAGE":
+            image = cast("bpy.types.ShaderNodeTexImage", node).image
+            if image:
+                images[image.name] = image
+    if not images:
+        raise ValueError(
+            f"{name} has no material with an active image texture to bake to."
+        )
+    for image in images.values():
+        if not image.filepath_raw:
+            raise ValueError(
+                f"The image {image.name} that {name} is baked to has no file to save to."
+            )
+
+    bpy.ops.object.select_all(action="DESELECT")
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.bake(type=bake_type, save_mode="INTERNAL")
+    for image in images.values():
+        image.save()
+    return [bpy.path.abspath(image.filepath_raw) for image in images.values()]
+
+
+def run_chunk(send, items: list, bake_type: str) -> None:
+    """
+    Render the frames of a chunk, or bake its objects, reporting each one as it finishes and then the whole chunk.
+
+    :param send: Sends an event to the scheduler.
+    :param items: The frames, or the names of the objects to bake.
+    :param bake_type: The type of bake, or an empty string to render frames.
+    """
+
+    chunk_start = time.perf_counter()
+    for item in items:
+        start = time.perf_counter()
+        outputs = []
+        message = ""
+        try:
+            if bake_type:
+                outputs = bake_object(item, bake_type)
+            else:
+                outputs = [render_frame(item)]
+            status = "done"
+        except Exception:
+            status = "error"
+            message = traceback.format_exc()
+        send(
+            {
+                "event": "item",
+                "item": item,
+                "status": status,
+                "duration": time.perf_counter() - start,
+                "outputs": outputs,
+                "message": message,
+            }
+        )
+    send({"event": "chunk", "duration": time.perf_counter() - chunk_start})
+
+
+if __name__ == "__main__":
+    # Blender passes the arguments after "--" to the script untouched
+    args = sys.argv[sys.argv.index("--") + 1 :]
+    requests_fd = int(args[args.index("--requests-fd") + 1])
+    results_fd = int(args[args.index("--results-fd") + 1])
+    threads = int(args[args.index("--threads") + 1])
+    bake_type = args[args.index("--bake-type") + 1] if "--bake-type" in args else ""
+    samples = int(args[args.index("--samples") + 1]) if "--samples" in args else None
+    output = args[args.index("--output") + 1] if "--output" in args else None
+    file = args[-1]
+
+    results = os.fdopen(results_fd, "w", buffering=1)
+
+    def send(event: dict[str, object]) -> None:
+        results.write(json.dumps(event) + "\n")
+
+    try:
+        bpy.ops.wm.open_mainfile(filepath=file, load_ui=False)
+        configure(threads, bake_type, samples, output)
+    except Exception:
+        send({"event": "error", "message": traceback.format_exc()})
+        sys.exit(1)
+    send({"event": "ready"})
+
+    # Chunks are rendered one at a time as the scheduler hands them out, until it closes the pipe
+    with os.fdopen(requests_fd) as requests:
+        for line in requests:
+            run_chunk(send, json.loads(line)["items"], bake_type)
+    results.close()
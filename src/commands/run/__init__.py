@@ -0,0 +1,191 @@
+import json
+import os
+import time
+from typing import Optional, TextIO
+
+import click
+
+from .. import utils as cmd_utils
+from ..build.build import BuildOptions, Project, build_project
+from . import pool, results
+
+
+def find_blend_files(paths: tuple[str, ...]) -> list[str]:
+    """
+    Find the .blend files to run an operator over: any files given, and every `.blend` file under any directories given.
+
+    :param paths: The .blend files and directories.
+    :returns: the absolute paths of the files, largest first, so that no worker is left loading a large file after the rest have finished.
+    """
+
+    files = set()
+    for path in paths:
+        if os.path.isfile(path):
+            files.add(os.path.abspath(path))
+            continue
+        for dir_path, _, names in os.walk(path):
+            files.update(
+                os.path.abspath(os.path.join(dir_path, name))
+                for name in names
+                if name.endswith(".blend")
+            )
+    return sorted(files, key=lambda file: (-os.path.getsize(file), file))
+
+
+def parse_properties(
+    ctx: click.Context, param: click.Parameter, value: tuple[str, ...]
+) -> dict[str, object]:
+    """Parse operator properties given as `NAME=VALUE`, where values are parsed as JSON if they can be and are strings otherwise."""
+
+    properties: dict[str, object] = {}
+    for item in value:
+        name, separator, raw = item.partition("=")
+        if not separator or not name:
+            raise click.BadParameter(f"expected NAME=VALUE, not {item}.")
+        try:
+            properties[name] = json.loads(raw)
+        except ValueError:
+            properties[name] = raw
+    return properties
+
+
+@click.command()
+@click.argument("idname")
+@click.argument("paths", type=click.Path(exists=True), nargs=-1)
+@click.option(
+    "--files-from",
+    type=click.File(),
+    help="Also read .blend files from this file, one per line, e.g. when there are too many to pass as arguments.",
+)
+@click.option(
+    "--set",
+    "properties",
+    multiple=True,
+    callback=parse_properties,
+    help="Set one of the operator's properties, given as NAME=VALUE, where VALUE is parsed as JSON if it can be. Can be given multiple times.",
+)
+@click.option(
+    "--save",
+    is_flag=True,
+    help="Save each file the operator finished on.",
+)
+@click.option(
+    "--blender",
+    default="blender",
+    envvar="BADKIT_BLENDER",
+    help="A path to the Blender executable (or an alias for it), or to a stand-in for it like benchmarks/stubs/blender.",
+    show_default=True,
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    help="The number of Blender processes to run the operator in concurrently.",
+    show_default=True,
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="The maximum number of seconds a file may take. Blender processes that take longer are replaced.",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=1,
+    help="The number of times to retry a file on a fresh Blender process after the one running it crashed or timed out.",
+    show_default=True,
+)
+@click.option(
+    "--json",
+    "json_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the result and timings of each file to this file as JSON.",
+)
+@click.option(
+    "--csv",
+    "csv_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the result and timings of each file to this file as CSV.",
+)
+def run(
+    idname: str,
+    paths: tuple[str, ...],
+    files_from: Optional[TextIO],
+    properties: dict[str, object],
+    save: bool,
+    blender: str,
+    jobs: int,
+    timeout: Optional[float],
+    retries: int,
+    json_path: Optional[str],
+    csv_path: Optional[str],
+) -> None:
+    """
+    Build the addon and run one of its operators over many .blend files in background Blender processes. IDNAME is the operator's idname, e.g. object.my_operator, and PATHS are .blend files or directories of them.
+    Each process opens one file at a time, runs the operator on it and is reused for the next file, resetting to an empty scene in between.
+    """
+
+    if files_from:
+        paths += tuple(line.strip() for line in files_from if line.strip())
+    files = find_blend_files(paths)
+    if not files:
+        raise click.UsageError("No .blend files were given.")
+    project = Project(os.getcwd())
+    build_path = build_project(project.root, BuildOptions(jobs=jobs))
+    log_dir = project.get_cache_path("run-logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    file_results: list[results.FileResult] = []
+
+    def on_result(result: results.FileResult) -> None:
+        file_results.append(result)
+        if not result.passed:
+            cmd_utils.log(
+                f"{result.status.upper()}: {result.file} ({result.duration:.2f}s)\n{result.message}",
+                fg="red",
+            )
+        if len(file_results) % 100 == 0:
+            cmd_utils.log(f"{len(file_results)}/{len(files)} files", fg="white")
+
+    cmd_utils.log(
+        f"Running {idname} over {len(files)} files on {min(jobs, len(files))} Blender processes",
+        fg="white",
+    )
+    start = time.perf_counter()
+    pool.run_files(
+        files,
+        idname,
+        properties,
+        save,
+        blender,
+        os.path.abspath(build_path),
+        log_dir,
+        jobs,
+        on_result,
+        timeout=timeout,
+        retries=retries,
+    )
+    seconds = time.perf_counter() - start
+
+    if json_path:
+        results.save_json(json_path, file_results, seconds)
+    if csv_path:
+        results.save_csv(csv_path, file_results)
+    counts: dict[str, int] = {}
+    for result in file_results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    slowest = max(file_results, key=lambda result: result.duration)
+    cmd_utils.log(
+        f"Slowest file: {slowest.file} ({slowest.duration:.2f}s, {slowest.load_duration:.2f}s loading)",
+        fg="white",
+    )
+    failed = [result for result in file_results if not result.passed]
+    cmd_utils.log(
+        f"{len(file_results)} files in {seconds:.2f}s ({len(file_results) / seconds:.1f} files/s): "
+        + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())),
+        fg="red" if failed else "green",
+        bold=True,
+    )
+    if failed:
+        raise click.exceptions.Exit(1)
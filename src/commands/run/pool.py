@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+from typing import Callable, Optional
+
+from ..workers import Worker, run_pool
+from .results import FileResult
+
+WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker.py")
+
+
+def run_files(
+    files: list[str],
+    idname: str,
+    properties: dict[str, object],
+    save: bool,
+    blender: str,
+    bundle: str,
+    log_dir: str,
+    jobs: int,
+    on_result: Callable[[FileResult], None],
+    timeout: Optional[float] = None,
+    retries: int = 0,
+) -> None:
+    """
+    Run an operator over .blend files on a pool of warm workers, each with the addon enabled. Each worker runs whichever file is next in `files` whenever it is free.
+    A worker that crashes or times out is replaced, and its file is retried on the new worker.
+
+    :param files: The absolute paths of the .blend files, in the order to hand them out.
+    :param idname: The operator's idname.
+    :param properties: The operator's properties.
+    :param save: Save each file the operator finished on.
+    :param blender: The Blender executable, or a stand-in for it.
+    :param bundle: The addon's bundle.
+    :param log_dir: The directory to write each worker's Blender output to.
+    :param jobs: The number of workers.
+    :param on_result: Called with the result of each file as soon as a worker reports it.
+    :param timeout: The maximum number of seconds each file may take, or `None` for no limit.
+    :param retries: The number of times to retry a file whose worker crashed or timed out.
+    """
+
+    attempts: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def report(result: FileResult) -> None:
+        with lock:
+            on_result(result)
+
+    def create_worker(index: int) -> Worker:
+        args = ["--idname", idname, "--properties", json.dumps(properties)]
+        if save:
+            args.append("--save")
+        return Worker(
+            blender,
+            WORKER,
+            [*args, bundle],
+            os.path.join(log_dir, f"worker-{index}.log"),
+        )
+
+    def handle(worker: Worker, file: str) -> None:
+        attempts[file] = attempts.get(file, 0) + 1
+        worker.send({"file": file})
+        event = worker.read_event(timeout)
+        report(
+            FileResult(
+                event["file"],
+                event["status"],
+                event["duration"],
+                event["load_duration"],
+                attempts[file],
+                event["message"],
+            )
+        )
+
+    def on_failure(file: str, error: Exception) -> None:
+        report(
+            FileResult(
+                file,
+                "crashed",
+                0.0,
+                attempts=attempts.get(file, 1),
+                message=f"The run worker failed while running {file}: {error}",
+            )
+        )
+
+    run_pool(files, create_worker, handle, on_failure, jobs, retries)
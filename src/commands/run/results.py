@@ -0,0 +1,83 @@
+import csv
+import json
+from dataclasses import asdict, dataclass, fields
+
+# The statuses of a file, where every status but these fails the run
+PASSING_STATUSES = ("finished", "skipped")
+
+
+@dataclass
+class FileResult:
+    """The outcome of running the operator on a single file, as reported by a run worker."""
+
+    # The absolute path of the .blend file
+    file: str
+    # One of "finished", "cancelled", "skipped" (the operator's poll failed), "error" or "crashed"
+    status: str
+    # The number of seconds the file took, including loading it
+    duration: float
+    # The number of seconds loading the file took
+    load_duration: float = 0.0
+    # The number of workers the file was attempted on
+    attempts: int = 1
+    # The traceback of an error, or why the worker crashed
+    message: str = ""
+
+    @property
+    def passed(self) -> bool:
+        return self.status in PASSING_STATUSES
+
+
+def summarize(results: list[FileResult], seconds: float) -> dict[str, float]:
+    """
+    Summarize a run: how many files there were of each status and how fast they were processed.
+
+    :param results: The result of every file.
+    :param seconds: The wall-clock duration of the run.
+    """
+
+    summary: dict[str, float] = {
+        "files": len(results),
+        "seconds": seconds,
+        "files_per_second": len(results) / seconds if seconds else 0.0,
+        "worker_seconds": sum(result.duration for result in results),
+    }
+    for result in results:
+        summary[result.status] = summary.get(result.status, 0) + 1
+    return summary
+
+
+def save_json(path: str, results: list[FileResult], seconds: float) -> None:
+    """
+    Save the results of a run as JSON.
+
+    :param path: The path to save to.
+    :param results: The result of every file.
+    :param seconds: The wall-clock duration of the run.
+    """
+
+    with open(path, "w") as json_file:
+        json.dump(
+            {
+                "summary": summarize(results, seconds),
+                "files": [asdict(result) for result in results],
+            },
+            json_file,
+            indent=2,
+        )
+
+
+def save_csv(path: str, results: list[FileResult]) -> None:
+    """
+    Save the results of a run as CSV, with a row per file.
+
+    :param path: The path to save to.
+    :param results: The result of every file.
+    """
+
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.DictWriter(
+            csv_file, fieldnames=[field.name for field in fields(FileResult)]
+        )
+        writer.writeheader()
+        writer.writerows(asdict(result) for result in results)
@@ -0,0 +1,115 @@
+import importlib.util
+import json
+import os
+import sys
+import time
+import traceback
+
+# The script assumes that is in running inside a Blender environment, started in the background by `badkit run`
+import bpy
+
+# Blender runs this script outside of its package, so the dev session module is loaded by path
+spec = importlib.util.spec_from_file_location(
+    "badkit_session",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "launch",
+        "session.py",
+    ),
+)
+assert spec is not None and spec.loader is not None
+session = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(session)
+
+
+def get_operator(idname: str):
+    """
+    Get an operator from its idname, e.g. `object.my_operator`.
+
+    :param idname: The operator's idname.
+    :raises ValueError: if the idname has no category.
+    """
+
+    category, _, name = idname.partition(".")
+    if not category or not name:
+        raise ValueError(
+            f"Expected an operator idname like object.my_operator, not {idname}."
+        )
+    return getattr(getattr(bpy.ops, category), name)
+
+
+def run_file(
+    send, operator, file: str, properties: dict, save: bool, reset: bool
+) -> None:
+    """
+    Open a .blend file, run the operator on it and report the outcome.
+
+    :param send: Sends an event to the scheduler.
+    :param operator: The operator to run.
+    :param file: The absolute path of the .blend file.
+    :param properties: The operator's properties.
+    :param save: Save the file if the operator finished.
+    :param reset: Load an empty scene first, so the previous file is freed before this one is loaded rather than after.
+    """
+
+    start = time.perf_counter()
+    loaded = start
+    message = ""
+    try:
+        if reset:
+            bpy.ops.wm.read_homefile(use_empty=True)
+        bpy.ops.wm.open_mainfile(filepath=file, load_ui=False)
+        loaded = time.perf_counter()
+        if not operator.poll():
+            status = "skipped"
+            message = "The operator can't run on this file, its poll() failed."
+        else:
+            result = operator("EXEC_DEFAULT", **properties)
+            status = "finished" if "FINISHED" in result else "cancelled"
+            if save and status == "finished":
+                bpy.ops.wm.save_mainfile()
+    except Exception:
+        status = "error"
+        message = traceback.format_exc()
+    send(
+        {
+            "event": "file",
+            "file": file,
+            "status": status,
+            "duration": time.perf_counter() - start,
+            "load_duration": loaded - start,
+            "message": message,
+        }
+    )
+
+
+if __name__ == "__main__":
+    # Blender passes the arguments after "--" to the script untouched
+    args = sys.argv[sys.argv.index("--") + 1 :]
+    requests_fd = int(args[args.index("--requests-fd") + 1])
+    results_fd = int(args[args.index("--results-fd") + 1])
+    idname = args[args.index("--idname") + 1]
+    properties = json.loads(args[args.index("--properties") + 1])
+    save = "--save" in args
+    bundle = args[-1]
+
+    results = os.fdopen(results_fd, "w", buffering=1)
+
+    def send(event: dict[str, object]) -> None:
+        results.write(json.dumps(event) + "\n")
+
+    try:
+        session.link_addons([bundle])
+        operator = get_operator(idname)
+    except Exception:
+        send({"event": "error", "message": traceback.format_exc()})
+        sys.exit(1)
+    send({"event": "ready"})
+
+    # Files are run one at a time as the scheduler hands them out, until it closes the pipe
+    ran = False
+    with os.fdopen(requests_fd) as requests:
+        for line in requests:
+            run_file(send, operator, json.loads(line)["file"], properties, save, ran)
+            ran = True
+    results.close()
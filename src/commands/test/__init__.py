@@ -0,0 +1,169 @@
+import os
+import time
+from typing import Optional
+
+import click
+
+from .. import utils as cmd_utils
+from ..build.build import BuildOptions, Project, build_project
+from . import pool, results
+
+TESTS = "tests"
+# The history of how long each test module took, in the build cache
+DURATIONS = "test-durations.json"
+
+
+def find_test_files(root: str, paths: tuple[str, ...]) -> list[str]:
+    """
+    Find the test modules to run: any files given, and every `test_*.py` file under any directories given.
+
+    :param root: The project root.
+    :param paths: The test files and directories.
+    :returns: the paths of the test modules, relative to the project root and separated by `/`.
+    """
+
+    files = set()
+    for path in paths:
+        if os.path.isfile(path):
+            files.add(os.path.abspath(path))
+            continue
+        for dir_path, dirs, names in os.walk(path):
+            dirs[:] = [dir for dir in dirs if dir != "__pycache__"]
+            files.update(
+                os.path.abspath(os.path.join(dir_path, name))
+                for name in names
+                if name.startswith("test_") and name.endswith(".py")
+            )
+    return sorted(
+        os.path.relpath(file, root).replace(os.path.sep, "/") for file in files
+    )
+
+
+def parse_shard(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[tuple[int, int]]:
+    """Parse a shard given as `INDEX/COUNT`, e.g. `2/4`, into its 0-based index and count."""
+
+    if value is None:
+        return None
+    try:
+        index, count = map(int, value.split("/"))
+    except ValueError:
+        raise click.BadParameter("expected INDEX/COUNT, e.g. 2/4.")
+    if not 1 <= index <= count:
+        raise click.BadParameter(f"the index must be between 1 and {count}.")
+    return index - 1, count
+
+
+@click.command()
+@click.argument("paths", type=click.Path(exists=True), nargs=-1)
+@click.option(
+    "--blender",
+    default="blender",
+    envvar="BADKIT_BLENDER",
+    help="A path to the Blender executable (or an alias for it), or to a stand-in for it like benchmarks/stubs/blender.",
+    show_default=True,
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    help="The number of Blender processes to run test modules in concurrently.",
+    show_default=True,
+)
+@click.option(
+    "--shard",
+    callback=parse_shard,
+    help="Only run one of several shards of the test modules, given as INDEX/COUNT, e.g. 2/4 on the second of four CI machines. Shards are balanced by how long each module took last time.",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="The maximum number of seconds a test module may take. Modules that take longer are reported as errors, and their Blender process is replaced.",
+)
+@click.option(
+    "--junit",
+    "junit_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the results to this file as JUnit XML.",
+)
+@click.option(
+    "--json",
+    "json_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the results to this file as JSON.",
+)
+def test(
+    paths: tuple[str, ...],
+    blender: str,
+    jobs: int,
+    shard: Optional[tuple[int, int]],
+    timeout: Optional[float],
+    junit_path: Optional[str],
+    json_path: Optional[str],
+) -> None:
+    """
+    Build the addon and run its tests in background Blender processes. PATHS are test modules or directories of `test_*.py` modules, and default to the tests directory.
+    Test modules hold `unittest.TestCase` classes or plain `test_*` functions, and run with the addon enabled. Each process runs one module at a time, slowest first, and is reused for the next module.
+    """
+
+    project = Project(os.getcwd())
+    files = find_test_files(project.root, paths or (TESTS,))
+    if not files:
+        raise click.UsageError(
+            f"No test modules were found in {', '.join(paths or (TESTS,))}."
+        )
+    build_path = build_project(project.root, BuildOptions(jobs=jobs))
+
+    durations_path = project.get_cache_path(DURATIONS)
+    history = results.load_durations(durations_path)
+    if shard:
+        files = results.shard_files(files, history, *shard)
+    log_dir = project.get_cache_path("test-logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    test_results: list[results.TestResult] = []
+
+    def on_result(result: results.TestResult) -> None:
+        test_results.append(result)
+        if not result.passed:
+            cmd_utils.log(
+                f"{result.outcome.upper()}: {result.name} ({result.file}, {result.duration:.2f}s)\n{result.message}",
+                fg="red",
+            )
+
+    cmd_utils.log(
+        f"Running {len(files)} test modules on {min(jobs, len(files))} Blender processes",
+        fg="white",
+    )
+    start = time.perf_counter()
+    durations = pool.run_tests(
+        results.order_files(files, history),
+        blender,
+        os.path.abspath(build_path),
+        project.root,
+        log_dir,
+        jobs,
+        on_result,
+        timeout=timeout,
+    )
+    seconds = time.perf_counter() - start
+    results.save_durations(durations_path, {**history, **durations})
+
+    if junit_path:
+        results.save_junit(junit_path, test_results, seconds)
+    if json_path:
+        results.save_json(json_path, test_results, seconds)
+    failed = [result for result in test_results if not result.passed]
+    counts: dict[str, int] = {}
+    for result in test_results:
+        counts[result.outcome] = counts.get(result.outcome, 0) + 1
+    cmd_utils.log(
+        f"{len(test_results)} tests in {seconds:.2f}s: "
+        + ", ".join(f"{count} {outcome}" for outcome, count in sorted(counts.items())),
+        fg="red" if failed else "green",
+        bold=True,
+    )
+    if failed or not test_results:
+        raise click.exceptions.Exit(1)
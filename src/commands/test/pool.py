@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from ..workers import Worker, run_pool
+from .results import TestResult
+
+WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker.py")
+
+
+def run_file(
+    worker: Worker,
+    file: str,
+    on_result: Callable[[TestResult], None],
+    timeout: Optional[float] = None,
+) -> float:
+    """
+    Run a test module in a worker.
+
+    :param worker: The worker.
+    :param file: The path of the test module, relative to the project root.
+    :param on_result: Called with the result of each test as soon as the worker reports it.
+    :param timeout: The maximum number of seconds the module may take, or `None` for no limit.
+    :returns: the number of seconds the module took in the worker.
+    :raises WorkerError: if the worker crashes or the module times out.
+    """
+
+    worker.send({"file": file})
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        event = worker.read_event(remaining)
+        if event["event"] == "file":
+            return event["duration"]
+        on_result(
+            TestResult(
+                event["file"],
+                event["name"],
+                event["outcome"],
+                event["duration"],
+                event["message"],
+            )
+        )
+
+
+def run_tests(
+    files: list[str],
+    blender: str,
+    bundle: str,
+    root: str,
+    log_dir: str,
+    jobs: int,
+    on_result: Callable[[TestResult], None],
+    timeout: Optional[float] = None,
+) -> dict[str, float]:
+    """
+    Run test modules on a pool of warm workers, each with the addon enabled. Each worker runs whichever module is next in `files` whenever it is free.
+    A worker that crashes or times out is replaced, and the rest of its module is reported as a single error.
+
+    :param files: The test modules, relative to the project root, in the order to hand them out.
+    :param blender: The Blender executable, or a stand-in for it.
+    :param bundle: The addon's bundle.
+    :param root: The project root.
+    :param log_dir: The directory to write each worker's Blender output to.
+    :param jobs: The number of workers.
+    :param on_result: Called with the result of each test as soon as a worker reports it.
+    :param timeout: The maximum number of seconds each module may take, or `None` for no limit.
+    :returns: the seconds each module took, by its path.
+    """
+
+    durations: dict[str, float] = {}
+    started: dict[str, float] = {}
+    lock = threading.Lock()
+
+    def report(result: TestResult) -> None:
+        with lock:
+            on_result(result)
+
+    def create_worker(index: int) -> Worker:
+        return Worker(
+            blender,
+            WORKER,
+            ["--root", root, bundle],
+            os.path.join(log_dir, f"worker-{index}.log"),
+        )
+
+    def handle(worker: Worker, file: str) -> None:
+        started[file] = time.perf_counter()
+        durations[file] = run_file(worker, file, report, timeout)
+
+    def on_failure(file: str, error: Exception) -> None:
+        report(
+            TestResult(
+                file,
+                os.path.splitext(file)[0].replace("/", "."),
+                "error",
+                time.perf_counter() - started[file] if file in started else 0.0,
+                f"The test worker failed while running {file}: {error}",
+            )
+        )
+
+    run_pool(files, create_worker, handle, on_failure, jobs)
+    return durations
@@ -0,0 +1,182 @@
+import json
+import os
+import statistics
+import xml.etree.ElementTree as ElementTree
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional
+
+# The outcomes of a test, where every outcome but these fails the run
+PASSING_OUTCOMES = ("passed", "skipped", "expected failure")
+
+
+@dataclass
+class TestResult:
+    """The outcome of a single test, as reported by a test worker."""
+
+    # The path of the test module, relative to the project root
+    file: str
+    # The test's id, e.g. `test_operators.OperatorTest.test_execute`
+    name: str
+    # One of "passed", "failed", "error", "skipped", "expected failure" or "unexpected success"
+    outcome: str
+    # The number of seconds the test took
+    duration: float
+    # The traceback of a failure or error, or the reason for a skip
+    message: str = ""
+
+    @property
+    def passed(self) -> bool:
+        return self.outcome in PASSING_OUTCOMES
+
+
+def load_durations(path: str) -> dict[str, float]:
+    """
+    Load how long each test module took the last time it ran. A missing file is treated as empty.
+
+    :param path: The path to the durations file.
+    :returns: the seconds each test module took, by its path relative to the project root.
+    """
+
+    if not os.path.exists(path):
+        return {}
+    with open(path) as durations_file:
+        return json.load(durations_file)
+
+
+def save_durations(path: str, durations: dict[str, float]) -> None:
+    """
+    Save how long each test module took, for the next run to schedule the slowest modules first.
+
+    :param path: The path to the durations file.
+    :param durations: The seconds each test module took, by its path relative to the project root.
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as durations_file:
+        json.dump(durations, durations_file, indent=2, sort_keys=True)
+
+
+def estimate_durations(
+    files: Iterable[str], durations: dict[str, float]
+) -> dict[str, float]:
+    """
+    Estimate how long each test module will take, from how long it took last time. Modules that haven't run before are assumed to take the median time.
+
+    :param files: The test modules, relative to the project root.
+    :param durations: The seconds each test module took last time.
+    """
+
+    files = list(files)
+    known = [durations[file] for file in files if file in durations]
+    default = statistics.median(known) if known else 1.0
+    return {file: durations.get(file, default) for file in files}
+
+
+def order_files(files: Iterable[str], durations: dict[str, float]) -> list[str]:
+    """
+    Order test modules longest first, so that when they are handed out to whichever worker is free, no worker is left running a long module after the rest have finished.
+
+    :param files: The test modules, relative to the project root.
+    :param durations: The seconds each test module took last time.
+    """
+
+    estimates = estimate_durations(files, durations)
+    return sorted(estimates, key=lambda file: (-estimates[file], file))
+
+
+def shard_files(
+    files: Iterable[str], durations: dict[str, float], index: int, count: int
+) -> list[str]:
+    """
+    Split test modules into shards of roughly equal total duration, e.g. to run on several CI machines, and get one of them.
+    Each module, longest first, is added to the shard with the least total duration so far.
+
+    :param files: The test modules, relative to the project root.
+    :param durations: The seconds each test module took last time.
+    :param index: The index of the shard to get, from 0.
+    :param count: The number of shards.
+    """
+
+    files = list(files)
+    estimates = estimate_durations(files, durations)
+    shards: list[list[str]] = [[] for _ in range(count)]
+    totals = [0.0] * count
+    for file in order_files(files, durations):
+        shortest = totals.index(min(totals))
+        shards[shortest].append(file)
+        totals[shortest] += estimates[file]
+    return shards[index]
+
+
+def save_json(path: str, results: list[TestResult], seconds: float) -> None:
+    """
+    Save the results of a test run as JSON.
+
+    :param path: The path to save to.
+    :param results: The result of every test.
+    :param seconds: The wall-clock duration of the run.
+    """
+
+    summary: dict[str, float] = {"tests": len(results), "seconds": seconds}
+    for result in results:
+        summary[result.outcome] = summary.get(result.outcome, 0) + 1
+    with open(path, "w") as json_file:
+        json.dump(
+            {"summary": summary, "tests": [asdict(result) for result in results]},
+            json_file,
+            indent=2,
+        )
+
+
+def save_junit(path: str, results: list[TestResult], seconds: float) -> None:
+    """
+    Save the results of a test run as JUnit XML, with a test suite per test module.
+
+    :param path: The path to save to.
+    :param results: The result of every test.
+    :param seconds: The wall-clock duration of the run.
+    """
+
+    suites: dict[str, list[TestResult]] = {}
+    for result in results:
+        suites.setdefault(result.file, []).append(result)
+
+    root = ElementTree.Element(
+        "testsuites",
+        tests=str(len(results)),
+        failures=str(sum(result.outcome == "failed" for result in results)),
+        errors=str(sum(result.outcome == "error" for result in results)),
+        time=f"{seconds:.3f}",
+    )
+    for file, suite_results in sorted(suites.items()):
+        suite = ElementTree.SubElement(
+            root,
+            "testsuite",
+            name=file,
+            tests=str(len(suite_results)),
+            failures=str(sum(result.outcome == "failed" for result in suite_results)),
+            errors=str(sum(result.outcome == "error" for result in suite_results)),
+            skipped=str(sum(result.outcome == "skipped" for result in suite_results)),
+            time=f"{sum(result.duration for result in suite_results):.3f}",
+        )
+        for result in suite_results:
+            classname, _, name = result.name.rpartition(".")
+            case = ElementTree.SubElement(
+                suite,
+                "testcase",
+                classname=classname or file,
+                name=name,
+                time=f"{result.duration:.3f}",
+            )
+            tag: Optional[str] = {
+                "failed": "failure",
+                "unexpected success": "failure",
+                "error": "error",
+                "skipped": "skipped",
+            }.get(result.outcome)
+            if tag:
+                element = ElementTree.SubElement(
+                    case, tag, message=result.message.strip().split("\n")[-1][:200]
+                )
+                element.text = result.message
+    ElementTree.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
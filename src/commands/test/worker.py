@@ -0,0 +1,180 @@
+import importlib.util
+import json
+import os
+import sys
+import time
+import traceback
+import unittest
+
+# The script assumes that is in running inside a Blender environment, started in the background by `badkit test`
+import bpy
+
+# Blender runs this script outside of its package, so the dev session module is loaded by path
+spec = importlib.util.spec_from_file_location(
+    "badkit_session",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "launch",
+        "session.py",
+    ),
+)
+assert spec is not None and spec.loader is not None
+session = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(session)
+
+
+class StreamingResult(unittest.TestResult):
+    """A test result that reports each test to the test runner as soon as it finishes, with how long it took."""
+
+    def __init__(self, send, file: str) -> None:
+        super().__init__()
+        # Captured output is added to the messages of failures and errors
+        self.buffer = True
+        self.send = send
+        self.file = file
+        self.started = 0.0
+
+    def startTest(self, test: unittest.TestCase) -> None:
+        super().startTest(test)
+        self.started = time.perf_counter()
+
+    def report(self, test: unittest.TestCase, outcome: str, message: str = "") -> None:
+        self.send(
+            {
+                "event": "test",
+                "file": self.file,
+                "name": test.id(),
+                "outcome": outcome,
+                "duration": time.perf_counter() - self.started,
+                "message": message,
+            }
+        )
+
+    def addSuccess(self, test: unittest.TestCase) -> None:
+        super().addSuccess(test)
+        self.report(test, "passed")
+
+    def addFailure(self, test: unittest.TestCase, err) -> None:
+        super().addFailure(test, err)
+        self.report(test, "failed", self.failures[-1][1])
+
+    def addError(self, test: unittest.TestCase, err) -> None:
+        super().addError(test, err)
+        self.report(test, "error", self.errors[-1][1])
+
+    def addSkip(self, test: unittest.TestCase, reason: str) -> None:
+        super().addSkip(test, reason)
+        self.report(test, "skipped", reason)
+
+    def addExpectedFailure(self, test: unittest.TestCase, err) -> None:
+        super().addExpectedFailure(test, err)
+        self.report(test, "expected failure")
+
+    def addUnexpectedSuccess(self, test: unittest.TestCase) -> None:
+        super().addUnexpectedSuccess(test)
+        self.report(test, "unexpected success")
+
+
+class FunctionTest(unittest.FunctionTestCase):
+    """A test of a plain `test_*` function, whose id is qualified by its module like the ids of `unittest.TestCase` tests are."""
+
+    def __init__(self, function) -> None:
+        super().__init__(function)
+        self.function = function
+
+    def id(self) -> str:
+        return f"{self.function.__module__}.{self.function.__qualname__}"
+
+
+def load_tests(path: str, name: str) -> unittest.TestSuite:
+    """
+    Load the tests of a test module: its `unittest.TestCase` classes, and its functions named `test_*`.
+
+    :param path: The path to the test module.
+    :param name: The name to import the module under.
+    """
+
+    # So that test modules can import helpers next to them
+    test_dir = os.path.dirname(path)
+    if test_dir not in sys.path:
+        sys.path.insert(0, test_dir)
+    module_spec = importlib.util.spec_from_file_location(name, path)
+    assert module_spec is not None and module_spec.loader is not None
+    module = importlib.util.module_from_spec(module_spec)
+    sys.modules[name] = module
+    module_spec.loader.exec_module(module)
+
+    suite = unittest.defaultTestLoader.loadTestsFromModule(module)
+    for attr, value in vars(module).items():
+        if (
+            attr.startswith("test")
+            and callable(value)
+            and not isinstance(value, type)
+            and getattr(value, "__module__", None) == name
+        ):
+            suite.addTest(FunctionTest(value))
+    return suite
+
+
+def run_file(send, root: str, file: str, reset: bool) -> None:
+    """
+    Run the tests of a test module, reporting each test as it finishes and then the whole module.
+    If the module fails to import, a single error is reported for it.
+
+    :param send: Sends an event to the test runner.
+    :param root: The project root, which test module paths are relative to.
+    :param file: The path of the test module, relative to the project root.
+    :param reset: Load an empty scene first, so the module doesn't see what the previous one left behind.
+    """
+
+    start = time.perf_counter()
+    if reset:
+        bpy.ops.wm.read_homefile(use_empty=True)
+    name = os.path.splitext(file)[0].replace("/", ".").replace(os.path.sep, ".")
+    try:
+        suite = load_tests(os.path.join(root, file), name)
+    except Exception:
+        send(
+            {
+                "event": "test",
+                "file": file,
+                "name": name,
+                "outcome": "error",
+                "duration": time.perf_counter() - start,
+                "message": traceback.format_exc(),
+            }
+        )
+    else:
+        suite.run(StreamingResult(send, file))
+    finally:
+        sys.modules.pop(name, None)
+    send({"event": "file", "file": file, "duration": time.perf_counter() - start})
+
+
+if __name__ == "__main__":
+    # Blender passes the arguments after "--" to the script untouched
+    args = sys.argv[sys.argv.index("--") + 1 :]
+    requests_fd = int(args[args.index("--requests-fd") + 1])
+    results_fd = int(args[args.index("--results-fd") + 1])
+    root = args[args.index("--root") + 1]
+    bundle = args[-1]
+
+    results = os.fdopen(results_fd, "w", buffering=1)
+
+    def send(event: dict[str, object]) -> None:
+        results.write(json.dumps(event) + "\n")
+
+    try:
+        session.link_addons([bundle])
+    except Exception:
+        send({"event": "error", "message": traceback.format_exc()})
+        sys.exit(1)
+    send({"event": "ready"})
+
+    # Test modules are run one at a time as the runner hands them out, until it closes the pipe
+    ran = False
+    with os.fdopen(requests_fd) as requests:
+        for line in requests:
+            run_file(send, root, json.loads(line)["file"], reset=ran)
+            ran = True
+    results.close()
@@ -3,7 +3,7 @@ import click
 import datetime
 
 # TODO: implement
-log: Callable[[str, Any], None] = lambda message, **kwargs: click.secho(
+log: Callable[..., None] = lambda message, **kwargs: click.secho(
     f'[{datetime.datetime.now().strftime(("%Y-%m-%d %H:%M:%S"))}] BADKit: ' + message,
     **kwargs,
 )
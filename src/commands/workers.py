@@ -0,0 +1,190 @@
+import json
+import os
+import queue
+import select
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+# The number of seconds a worker may take to start Blender and enable the addon
+STARTUP_TIMEOUT = 120.0
+
+Item = TypeVar("Item")
+
+
+class WorkerError(RuntimeError):
+    """Raised when a worker crashes, hangs or fails to start."""
+
+
+class Worker:
+    """
+    A long-lived background Blender process running a worker script, which handles requests sent to it one at a time and streams back events over a pipe.
+    Requests and events are JSON lines, sent over pipes passed to the script as `--requests-fd` and `--results-fd`, so they never mix with Blender's own output.
+    """
+
+    def __init__(
+        self, blender: str, script: str, args: Iterable[str], log_path: str
+    ) -> None:
+        """
+        Construct a Worker object, starting its Blender process.
+
+        :param blender: The Blender executable, or a stand-in for it.
+        :param script: The worker script Blender runs.
+        :param args: The arguments to pass to the script.
+        :param log_path: The file Blender's own output is written to.
+        """
+
+        requests_read, self.requests = os.pipe()
+        self.results, results_write = os.pipe()
+        with open(log_path, "ab") as log_file:
+            self.process = subprocess.Popen(
+                [
+                    blender,
+                    "--background",
+                    "--factory-startup",
+                    "--python",
+                    script,
+                    "--",
+                    "--requests-fd",
+                    str(requests_read),
+                    "--results-fd",
+                    str(results_write),
+                    *args,
+                ],
+                pass_fds=(requests_read, results_write),
+                stdin=subprocess.DEVNULL,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
+        os.close(requests_read)
+        os.close(results_write)
+        self.log_path = log_path
+        self.buffer = b""
+
+    def read_event(self, timeout: Optional[float] = None) -> dict[str, Any]:
+        """
+        Wait for the next event the worker sends.
+
+        :param timeout: The maximum number of seconds to wait for, or `None` to wait indefinitely.
+        :raises WorkerError: if the worker exits or doesn't send anything in time.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while b"\n" not in self.buffer:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise WorkerError(f"Timed out after {timeout:.0f}s")
+            ready, _, _ = select.select([self.results], [], [], remaining)
+            if not ready:
+                continue
+            data = os.read(self.results, 64 * 1024)
+            if not data:
+                self.process.wait()
+                raise WorkerError(
+                    f"Blender exited with status {self.process.returncode}, see {self.log_path}"
+                )
+            self.buffer += data
+        line, self.buffer = self.buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def start(self) -> None:
+        """
+        Wait for the worker script to be ready for requests.
+
+        :raises WorkerError: if the worker fails to start.
+        """
+
+        event = self.read_event(STARTUP_TIMEOUT)
+        if event["event"] != "ready":
+            raise WorkerError(
+                f"Failed to start the worker:\n{event.get('message', '')}"
+            )
+
+    def send(self, request: dict[str, object]) -> None:
+        """
+        Send a request to the worker.
+
+        :param request: The request.
+        """
+
+        os.write(self.requests, (json.dumps(request) + "\n").encode())
+
+    def close(self) -> None:
+        """Let the worker exit once it has finished, killing it if it has crashed or hung."""
+
+        try:
+            os.close(self.requests)
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        os.close(self.results)
+
+    def kill(self) -> None:
+        """Kill the worker."""
+
+        self.process.kill()
+        self.close()
+
+
+def run_pool(
+    items: Iterable[Item],
+    create_worker: Callable[[int], Worker],
+    handle: Callable[[Worker, Item], None],
+    on_failure: Callable[[Item, Exception], None],
+    jobs: int,
+    retries: int = 0,
+) -> None:
+    """
+    Handle items on a pool of warm workers. Each worker is started once and handles whichever item is next whenever it is free.
+    A worker that crashes or hangs is replaced, and the item it was handling is retried on a fresh worker. So is a worker whose item fails with any other error, as its state is unknown.
+
+    :param items: The items, in the order to hand them out.
+    :param create_worker: Starts a worker, given the index of the pool thread it is for.
+    :param handle: Handles an item on a worker, from the pool thread managing that worker. Raises `WorkerError` if the worker fails; any other error fails the item the same way.
+    :param on_failure: Called with an item and the error once it has failed on `retries + 1` workers.
+    :param jobs: The number of workers.
+    :param retries: The number of times to retry an item whose worker failed.
+    """
+
+    pending: queue.Queue = queue.Queue()
+    for item in items:
+        pending.put((item, 0))
+
+    def serve(index: int) -> None:
+        worker: Optional[Worker] = None
+        try:
+            while True:
+                try:
+                    item, attempt = pending.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    if worker is None:
+                        worker = create_worker(index)
+                        worker.start()
+                    handle(worker, item)
+                except Exception as e:
+                    failed, worker = worker, None
+                    if failed is not None:
+                        failed.kill()
+                    if attempt < retries:
+                        pending.put((item, attempt + 1))
+                    else:
+                        on_failure(item, e)
+        finally:
+            if worker is not None:
+                worker.close()
+
+    threads = [
+        threading.Thread(target=serve, args=(index,))
+        for index in range(min(jobs, pending.qsize()))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
@@ -1,19 +1,147 @@
-from typing import Callable
+import json
+import os
+import platform
+import time
+from typing import Any, Callable, Optional, Sequence
 import bpy
 from bpy.types import Context
 
 # Cycles types are generated by the python API at runtime, so aren't accessible for static typing https://developer.blender.org/T68050#848508
 from cycles.properties import CyclesPreferences, CyclesRenderSettings
 
+# The file the render devices of each machine and Blender version are cached in, in the BADKit cache directory
+DEVICES = "render-devices.json"
+# The settings that configuring rendering may change, by the name of the object holding them. Preferences are restored before devices are
+CONFIG_FIELDS = {
+    "render": ("engine", "threads_mode", "threads"),
+    "cycles": (
+        "device",
+        "feature_set",
+        "samples",
+        "use_denoising",
+        "tile_size",
+        "use_adaptive_sampling",
+        "adaptive_threshold",
+    ),
+    "preferences": ("compute_device_type",),
+}
+# The tile sizes auto-tuning tries for GPU and for CPU rendering
+GPU_TILE_SIZES = (256, 512, 1024, 2048)
+CPU_TILE_SIZES = (16, 32, 64)
+# The smallest side of the region calibration renders crop the frame to, in pixels. The region is at least as large as the largest tile size tried
+CALIBRATION_SIZE = 512
+# The render settings calibration renders crop the frame with, restored afterwards
+BORDER_FIELDS = (
+    "use_border",
+    "use_crop_to_border",
+    "border_min_x",
+    "border_max_x",
+    "border_min_y",
+    "border_max_y",
+)
+# The noise threshold auto-tuning enables adaptive sampling with when none is given, which is Cycles' own default
+DEFAULT_NOISE_THRESHOLD = 0.01
+
+
+def get_cache_dir() -> str:
+    """Get the directory BADKit caches files shared by every project in, taken from `BADKIT_CACHE` if it's set."""
+
+    return os.environ.get("BADKIT_CACHE") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "badkit"
+    )
+
+
+def get_config_owners(context: Context) -> dict[str, Any]:
+    """
+    Get the objects holding the settings that configuring rendering may change, by the names used in `CONFIG_FIELDS`. Cycles' settings are only included when the Cycles addon is enabled.
+
+    :param context: The execution context.
+    """
+
+    owners: dict[str, Any] = {"render": context.scene.render}
+    cycles_addon = context.preferences.addons.get("cycles")
+    if cycles_addon is not None:
+        owners["cycles"] = context.scene.cycles
+        owners["preferences"] = cycles_addon.preferences
+    return owners
+
+
+def probe_devices(
+    context: Context = bpy.context, refresh: bool = False
+) -> list[dict[str, str]]:
+    """
+    Get the devices Cycles can render with. Enumerating devices initializes every GPU driver, which can take seconds, so they are only probed once per machine and Blender version and cached.
+
+    :param context: The execution context.
+    :param refresh: Probe the devices even if they are cached, e.g. after a new GPU or driver is installed.
+    :returns: the `id`, `name` and `type` of each device, where the type is `"CPU"` or the GPU API the device is used with.
+    """
+
+    cache_path = os.path.join(get_cache_dir(), DEVICES)
+    key = f"{platform.node()}-{platform.machine()}-{bpy.app.version_string}"
+    try:
+        with open(cache_path) as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        cache = {}
+    if key in cache and not refresh:
+        return cache[key]
+
+    cycles_prefs: CyclesPreferences = context.preferences.addons["cycles"].preferences
+    cycles_prefs.get_devices()
+    cache[key] = [
+        {"id": device.id, "name": device.name, "type": device.type}
+        for device in cycles_prefs.devices
+    ]
+
+    # Written to a temporary file first so that concurrent Blender instances never read half of it
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as cache_file:
+        json.dump(cache, cache_file, indent=2, sort_keys=True)
+    os.replace(temp_path, cache_path)
+    return cache[key]
+
+
+def enumerate_devices(
+    context: Context = bpy.context, ids: Optional[set[str]] = None
+) -> None:
+    """
+    Make sure devices are listed in the Cycles preferences. Devices are only listed once they've been enumerated this session, so they are only enumerated when some are missing.
+
+    :param context: The execution context.
+    :param ids: The ids of the devices that must be listed. Defaults to every probed device.
+    """
+
+    if ids is None:
+        ids = {device["id"] for device in probe_devices(context)}
+    cycles_prefs: CyclesPreferences = context.preferences.addons["cycles"].preferences
+    if not ids <= {device.id for device in cycles_prefs.devices}:
+        cycles_prefs.get_devices()
+
 
 def get_config_resetter(context: Context = bpy.context) -> Callable[[Context], None]:
     """
     Get a function that will reset the render engine to whatever settings it is currently using. This can be useful to call before configuring the render engine, so it can be reset for the user after usage.
+    Only the settings that have changed since are restored, so resetting doesn't touch devices or settings that were left alone. Devices that weren't listed yet are turned off.
+    Devices are only snapshotted when the Cycles addon is enabled, and only enumerated when Cycles is the active render engine.
 
     :param context: The current execution Context.
     """
 
-    reset = lambda ctx: None
+    owners = get_config_owners(context)
+    settings = {
+        (owner_name, field): getattr(owner, field)
+        for owner_name, owner in owners.items()
+        for field in CONFIG_FIELDS[owner_name]
+        if hasattr(owner, field)
+    }
+    devices: dict[str, bool] = {}
+    if "preferences" in owners:
+        # Enumerated first, as configuring Cycles may enumerate devices that would otherwise be missing from the snapshot
+        if context.scene.render.engine == "CYCLES":
+            enumerate_devices(context)
+        devices = {device.id: device.use for device in owners["preferences"].devices}
 
     def reset_cb(ctx: Context) -> None:
         """
@@ -21,22 +149,15 @@ def get_config_resetter(context: Context = bpy.context) -> Callable[[Context], N
 
         :param context: The current execution Context.
         """
-        reset(ctx)
-
-    if context.scene.render.engine == "CYCLES":
-        cycles_settings: CyclesRenderSettings = context.scene.cycles
-        cycles_prefs: CyclesPreferences = context.preferences.addons[
-            "cycles"
-        ].preferences
-
-        reset = lambda ctx: configure_cycles(
-            context=ctx,
-            mode=cycles_settings.device,
-            feature_set=cycles_settings.feature_set,
-            device_type=cycles_prefs.compute_device_type,
-            samples=cycles_settings.samples,
-            denoise=cycles_settings.use_denoising,
-        )
+
+        owners = get_config_owners(ctx)
+        for (owner_name, field), value in settings.items():
+            if owner_name in owners and getattr(owners[owner_name], field) != value:
+                setattr(owners[owner_name], field, value)
+        if "preferences" in owners:
+            for device in owners["preferences"].devices:
+                if device.use != devices.get(device.id, False):
+                    device.use = devices.get(device.id, False)
 
     return reset_cb
 
@@ -48,6 +169,9 @@ def configure_cycles(
     device_type="CUDA",
     samples: int = 4096,
     denoise: bool = True,
+    tile_size: Optional[int] = None,
+    noise_threshold: Optional[float] = None,
+    auto_tune: bool = False,
 ) -> None:
     """
     Activate and configure the Cycles rendering engine for rendering.
@@ -56,8 +180,11 @@ def configure_cycles(
     :param mode: The prefered rendering mode. Must be `"GPU"`, `"CPU"` or `"HYBRID"`.
     :param feature_set: The Cycles feature set to use.
     :param device_type: The GPU API to use for rendering. Should be `"CUDA"` or `"OPTIX"`. This will be internally applied as `"CUDA"` if running in `"HYBRID"` mode
-    :param samples: The number of samples per frame.
-    :param samples: Toggle denoising.
+    :param samples: The number of samples per frame. With adaptive sampling, this is the most samples a pixel can take.
+    :param denoise: Toggle denoising.
+    :param tile_size: The size of the tiles to render. Defaults to 256 for GPU rendering and 16 otherwise.
+    :param noise_threshold: Enable adaptive sampling, stopping sampling pixels once their noise is below this level, e.g. 0.01.
+    :param auto_tune: Pick the tile size and thread count with short calibration renders, and enable adaptive sampling with `noise_threshold`, or Cycles' default of 0.01 if it isn't given. See `auto_tune_cycles`.
     """
 
     # Activate Cycles rendering engine
@@ -73,10 +200,15 @@ def configure_cycles(
         cycles_settings.device = "CPU"
 
     cycles_settings.feature_set = feature_set
-    if mode == "GPU":
+    if tile_size:
+        cycles_settings.tile_size = tile_size
+    elif mode == "GPU":
         cycles_settings.tile_size = 256
     else:
         cycles_settings.tile_size = 16
+    if noise_threshold is not None:
+        cycles_settings.use_adaptive_sampling = True
+        cycles_settings.adaptive_threshold = noise_threshold
 
     cycles_prefs: CyclesPreferences = context.preferences.addons["cycles"].preferences
     if mode == "CPU" or mode == "HYBRID":
@@ -88,21 +220,118 @@ def configure_cycles(
     # Enable only desired rendering devices #
     #########################################
 
-    # (1) Disable all rendering devices
-    for device in cycles_prefs.devices:
-        device.use = mode == "HYBRID"
+    # (1) Find the desired devices by their probed type, rather than toggling each one and asking has_active_device() whether it's a GPU
     if mode == "HYBRID":
-        return
-
-    # (2) has_active_device() will return True if there is a GPU enabled, so we toggle all devices and test if has_active_device() reports them as a GPU or not.
-    devs = []
+        types = {"CPU", "CUDA"}
+    elif mode == "GPU":
+        types = {device_type}
+    else:
+        types = {"CPU"}
+    ids = {device["id"] for device in probe_devices(context) if device["type"] in types}
+    # (2) Devices are only listed in the preferences once they've been enumerated this session
+    enumerate_devices(context, ids)
+    # (3) Enable all desired devices, and disable the rest
     for device in cycles_prefs.devices:
-        device.use = True
-        if (mode == "GPU" and cycles_prefs.has_active_device()) or (
-            mode == "CPU" and not cycles_prefs.has_active_device()
-        ):
-            devs.append(device)
-        device.use = False
-    # (3) Enable all desired devices
-    for dev in devs:
-        dev.use = True
+        if device.use != (device.id in ids):
+            device.use = device.id in ids
+
+    if auto_tune:
+        auto_tune_cycles(context, noise_threshold or DEFAULT_NOISE_THRESHOLD)
+
+
+def auto_tune_cycles(
+    context: Context = bpy.context,
+    noise_threshold: float = DEFAULT_NOISE_THRESHOLD,
+    tile_sizes: Optional[Sequence[int]] = None,
+    calibration_size: int = CALIBRATION_SIZE,
+    calibration_samples: int = 16,
+) -> dict[str, object]:
+    """
+    Pick the fastest tile size and thread count to render the scene with by timing a short calibration render of each combination, and apply them along with adaptive sampling.
+    Calibration renders are cropped to a region in the middle of the frame, at full resolution so that tiles cover as much of the image as they will in the final render, and at a low sample count.
+    The first render only warms up Cycles, building the scene's BVH and loading its kernels, and isn't timed. The noise threshold isn't tuned: it is applied as given.
+
+    :param context: The execution context, with Cycles configured for the devices to tune for.
+    :param noise_threshold: The noise level to stop sampling pixels at, used as the adaptive sampling threshold. Lower is cleaner but slower.
+    :param tile_sizes: The tile sizes to try. Defaults to `GPU_TILE_SIZES` when rendering on a GPU and `CPU_TILE_SIZES` otherwise. Sizes that would render the whole region as a single tile are all equivalent, so only the smallest of them is tried.
+    :param calibration_size: The smallest side of the region to render calibration renders of, in pixels. It's grown to the largest tile size tried, and shrunk to the frame.
+    :param calibration_samples: The number of samples to render calibration renders with.
+    :returns: the settings applied: the `tile_size` and `threads` picked, and the `adaptive_threshold` given.
+    :raises ValueError: if `tile_sizes` is empty.
+    """
+
+    render = context.scene.render
+    cycles_settings: CyclesRenderSettings = context.scene.cycles
+    if tile_sizes is None:
+        tile_sizes = (
+            GPU_TILE_SIZES if cycles_settings.device == "GPU" else CPU_TILE_SIZES
+        )
+    if not tile_sizes:
+        raise ValueError("At least one tile size must be given to auto-tune with")
+    cores = os.cpu_count() or 1
+    # GPU renders hardly use the CPU, so only CPU renders are tuned for threads
+    thread_counts = [0]
+    if cycles_settings.device == "CPU":
+        thread_counts = sorted({cores, max(1, cores // 2)})
+
+    scale = render.resolution_percentage / 100
+    width = max(1, round(render.resolution_x * scale))
+    height = max(1, round(render.resolution_y * scale))
+    side = max(calibration_size, *tile_sizes)
+    region_width, region_height = min(side, width), min(side, height)
+    single_tile = [
+        size for size in tile_sizes if size >= max(region_width, region_height)
+    ]
+    candidates = [size for size in tile_sizes if size not in single_tile]
+    if single_tile:
+        candidates.append(min(single_tile))
+
+    reset = get_config_resetter(context)
+    border = {field: getattr(render, field) for field in BORDER_FIELDS}
+    timings: dict[tuple[int, int], float] = {}
+    try:
+        render.use_border = True
+        render.use_crop_to_border = True
+        render.border_min_x = 0.5 - region_width / width / 2
+        render.border_max_x = 0.5 + region_width / width / 2
+        render.border_min_y = 0.5 - region_height / height / 2
+        render.border_max_y = 0.5 + region_height / height / 2
+        cycles_settings.samples = calibration_samples
+        bpy.ops.render.render()
+        for tile_size in candidates:
+            for threads in thread_counts:
+                cycles_settings.tile_size = tile_size
+                configure_threads(context, threads)
+                start = time.perf_counter()
+                bpy.ops.render.render()
+                timings[tile_size, threads] = time.perf_counter() - start
+    finally:
+        for field, value in border.items():
+            setattr(render, field, value)
+        reset(context)
+
+    tile_size, threads = min(timings, key=lambda combination: timings[combination])
+    cycles_settings.tile_size = tile_size
+    configure_threads(context, threads)
+    cycles_settings.use_adaptive_sampling = True
+    cycles_settings.adaptive_threshold = noise_threshold
+    return {
+        "tile_size": tile_size,
+        "threads": threads,
+        "adaptive_threshold": noise_threshold,
+    }
+
+
+def configure_threads(context: Context = bpy.context, threads: int = 0) -> None:
+    """
+    Set the number of threads to render with. When several Blender instances render at once, giving each a share of the cores stops them from oversubscribing the CPU.
+
+    :param context: The execution context to configure rendering for.
+    :param threads: The number of threads, or 0 to use one per core.
+    """
+
+    if threads:
+        context.scene.render.threads_mode = "FIXED"
+        context.scene.render.threads = threads
+    else:
+        context.scene.render.threads_mode = "AUTO"
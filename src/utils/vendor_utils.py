@@ -0,0 +1,107 @@
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import json
+import os
+import sys
+import types
+import zipimport
+from typing import Optional, Sequence
+
+# The index of a bundle's vendored modules, in its vendor directory
+INDEX = "index.json"
+# The archive of a bundle's pure Python vendored modules, in its vendor directory
+ARCHIVE = "vendor.zip"
+
+
+class VendorFinder(importlib.abc.MetaPathFinder):
+    """
+    An import finder for an addon's vendored packages, which looks up each top level module in a prebuilt index instead of searching `sys.path`.
+    Modules the index marks as archived are imported from the vendor archive with `zipimport`. Submodules are found through their package's `__path__` as usual.
+    """
+
+    def __init__(self, vendor_dir: str, index: dict[str, dict[str, object]]) -> None:
+        """
+        Construct a VendorFinder object.
+
+        :param vendor_dir: The vendor directory of the addon.
+        :param index: The location of each top level vendored module, by module name.
+        """
+
+        self.vendor_dir = vendor_dir
+        self.index = index
+        self.archive: Optional[zipimport.zipimporter] = None
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[types.ModuleType] = None,
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        entry = self.index.get(fullname) if path is None else None
+        if entry is None:
+            return None
+
+        location = os.path.join(self.vendor_dir, *str(entry["path"]).split("/"))
+        if entry.get("archived"):
+            if self.archive is None:
+                self.archive = zipimport.zipimporter(
+                    os.path.join(self.vendor_dir, ARCHIVE)
+                )
+            if hasattr(self.archive, "find_spec"):
+                return self.archive.find_spec(fullname)
+            # zipimporter only gained find_spec in Python 3.10
+            spec = importlib.util.spec_from_loader(
+                fullname, self.archive, is_package=bool(entry["package"])
+            )
+            if spec and entry["package"]:
+                spec.submodule_search_locations = [
+                    os.path.join(self.archive.archive, fullname)
+                ]
+            return spec
+
+        if entry["package"] and not location.endswith(".py"):
+            # A namespace package, which has no __init__.py
+            spec = importlib.machinery.ModuleSpec(fullname, None, is_package=True)
+            spec.submodule_search_locations = [location]
+            return spec
+        return importlib.util.spec_from_file_location(
+            fullname,
+            location,
+            submodule_search_locations=(
+                [os.path.dirname(location)] if entry["package"] else None
+            ),
+        )
+
+
+def install(vendor_dir: str) -> Optional[VendorFinder]:
+    """
+    Make the vendored modules of an addon importable, by adding a finder for them ahead of the finder searching `sys.path`.
+    Any finder already installed for the same directory, e.g. by an earlier enable of the addon, is replaced.
+
+    :param vendor_dir: The vendor directory of the addon.
+    :returns: the installed finder, or `None` if the addon has no vendored modules.
+    """
+
+    index_path = os.path.join(vendor_dir, INDEX)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path) as index_file:
+        finder = VendorFinder(vendor_dir, json.load(index_file))
+
+    for existing in list(sys.meta_path):
+        if (
+            type(existing).__name__ == VendorFinder.__name__
+            and getattr(existing, "vendor_dir", None) == vendor_dir
+        ):
+            sys.meta_path.remove(existing)
+    position = next(
+        (
+            i
+            for i, existing in enumerate(sys.meta_path)
+            if existing is importlib.machinery.PathFinder
+        ),
+        len(sys.meta_path),
+    )
+    sys.meta_path.insert(position, finder)
+    return finder
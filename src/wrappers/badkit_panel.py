@@ -14,11 +14,12 @@ class BADKitPanel(bpyt.Panel, registerable.Registerable):
     bl_region_type = "UI"
     operator_idname: str
     props: Type[BADKitPropertyGroup]
+    prop_names: tuple[str, ...] = ()
 
     def draw(self, context: bpyt.Context):
         props = getattr(context.scene, self.props.bl_idname)
         col = self.layout.column()
-        for propname in self.props.get_props():
+        for propname in self.prop_names:
             col.prop(props, propname)
 
         self.layout.operator(self.operator_idname)
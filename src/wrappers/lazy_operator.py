@@ -0,0 +1,44 @@
+import importlib
+import inspect
+
+from bpy.types import Context, Event
+
+from .badkit_operator import BADKitOperator
+
+
+class LazyOperator(BADKitOperator):
+    """
+    A stand-in for a `BADKitOperator`, registered with the same metadata as the real operator so it can appear in menus and be searched for without importing it.
+    The real operator's module is only imported the first time the operator is run, at which point the stand-in takes on the real operator's methods and attributes.
+    Generated by BADKit for addons built with `--lazy`, and not intended to be subclassed directly.
+    """
+
+    lazy_module: str
+    lazy_class: str
+    lazy_loaded = False
+
+    @classmethod
+    def load(cls) -> None:
+        """Import the real operator and copy its methods and attributes onto this class."""
+
+        if cls.lazy_loaded:
+            return
+        real = getattr(importlib.import_module(cls.lazy_module), cls.lazy_class)
+        for klass in reversed(real.__mro__):
+            if klass in BADKitOperator.__mro__:
+                continue
+            for name, value in vars(klass).items():
+                if not name.startswith("__") and not name.startswith("bl_"):
+                    setattr(cls, name, value)
+        # The real operator may rely on the default implementations of BADKitOperator
+        for name in ("invoke", "execute"):
+            setattr(cls, name, inspect.getattr_static(real, name))
+        cls.lazy_loaded = True
+
+    def invoke(self, context: Context, event: Event) -> set[str]:
+        self.load()
+        return type(self).invoke(self, context, event)
+
+    def execute(self, context: Context) -> set[str]:
+        self.load()
+        return type(self).execute(self, context)